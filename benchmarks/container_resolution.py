@@ -0,0 +1,89 @@
+"""
+Cost of resolving the services of a request from the containers.
+
+Every request resolves the services it uses. This builds the person, team and
+OAuth service graphs of core.containers with each scope and measures the
+resolution of all three services plus the request-scope reset done by
+RequestScopeMiddleware, for the containers as configured in settings and
+for the same graph built with each scope.
+
+Usage:
+    python -m benchmarks.container_resolution [--requests 100000]
+"""
+
+import argparse
+
+from benchmarks.utils import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100000, help="Simulated requests per scope.")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from dependency_injector import providers
+
+    from core.cache import VersionedCache
+    from core.containers import ServiceContainer
+    from core.scopes import Scope, reset_request_scope, scoped
+    from oauth.http import AsyncOAuthHttpClient, OAuthHttpClient
+    from oauth.provider import OAuth2ProviderFactory
+    from oauth.repositories import GoogleAuthRepository
+    from oauth.services import GoogleAuthService
+    from persons.repositories import CachedPersonRepository, PersonRepository
+    from persons.services import PersonService
+    from teams.repositories import CachedTeamRepository, TeamRepository
+    from teams.services import TeamService
+
+    http_options = dict(connect_timeout=1, read_timeout=1, retries=0, backoff_factor=0, pool_maxsize=1)
+    cache = providers.Singleton(VersionedCache, namespace="benchmark")
+    http_client = providers.Singleton(OAuthHttpClient, **http_options)
+    async_http_client = providers.Singleton(AsyncOAuthHttpClient, **http_options)
+
+    def build_services(scope):
+        return (
+            scoped(
+                scope,
+                PersonService,
+                person_repository=scoped(
+                    scope, CachedPersonRepository, person_repository=scoped(scope, PersonRepository), cache=cache
+                ),
+            ),
+            scoped(
+                scope,
+                TeamService,
+                team_repository=scoped(
+                    scope, CachedTeamRepository, team_repository=scoped(scope, TeamRepository), cache=cache
+                ),
+            ),
+            scoped(
+                scope,
+                GoogleAuthService,
+                oauth_repository=scoped(scope, GoogleAuthRepository),
+                login_cache=cache,
+                oauth_provider_factory=scoped(
+                    scope, OAuth2ProviderFactory, http_client=http_client, async_http_client=async_http_client
+                ),
+            ),
+        )
+
+    def request(services):
+        for service in services:
+            service()
+        reset_request_scope()
+
+    # Measured first, before the request-scoped providers below are registered for resets.
+    services = (ServiceContainer.person_service, ServiceContainer.team_service, ServiceContainer.oauth_service)
+    seconds = measure(lambda: request(services), args.requests)
+    report("ServiceContainer (settings.CONTAINER_SCOPES)", args.requests, seconds, unit="requests")
+
+    for scope in Scope:
+        services = build_services(scope)
+        seconds = measure(lambda: request(services), args.requests)
+        report(f"scope={scope.value}", args.requests, seconds, unit="requests")
+
+
+if __name__ == "__main__":
+    main()
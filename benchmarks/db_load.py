@@ -0,0 +1,113 @@
+"""
+Load test of the database connection settings.
+
+Serves the project with a threaded WSGI server, as a worker process would,
+and sends requests to the persons listing from several client threads with
+keep-alive HTTP connections. For each value of --conn-max-age it reports the
+latency percentiles and how many database connections were opened.
+
+Runs against the configured database (a test database is created), so
+PostgreSQL needs POSTGRES_* set; a SQLite settings module works as a
+stand-in. The pool backend is enabled with DB_POOL_MAX_SIZE, so compare it
+by running the script again with that variable set.
+
+Usage:
+    python -m benchmarks.db_load [--requests 2000] [--clients 8] [--conn-max-age 0 60]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks.utils import setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario.")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads.")
+    parser.add_argument(
+        "--conn-max-age", type=int, nargs="+", default=[0, 60], help="CONN_MAX_AGE values to compare."
+    )
+    args = parser.parse_args()
+
+    setup_django()
+
+    import requests
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connections
+
+    from persons.models import Person
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    connection = connections["default"]
+    database = connection.Database
+    opened = []
+    original_connect = database.connect
+
+    def counting_connect(*connect_args, **connect_kwargs):
+        opened.append(1)
+        return original_connect(*connect_args, **connect_kwargs)
+
+    with test_database():
+        Person.objects.bulk_create(
+            Person(first_name=f"Person {index}", last_name="Load", email=f"load{index}@gmail.com")
+            for index in range(100)
+        )
+        connections.close_all()
+
+        server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler, allow_reuse_address=False)
+        server.set_app(get_wsgi_application())
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/api/person/?limit=20"
+
+        print(f"engine={connection.settings_dict['ENGINE']} clients={args.clients} requests={args.requests}")
+
+        database.connect = counting_connect
+
+        try:
+            for conn_max_age in args.conn_max_age:
+                connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+                opened.clear()
+                latencies = []
+
+                def client(count):
+                    with requests.Session() as session:
+                        for _ in range(count):
+                            started_at = time.perf_counter()
+                            session.get(url).raise_for_status()
+                            latencies.append(time.perf_counter() - started_at)
+
+                started_at = time.perf_counter()
+                clients = [
+                    threading.Thread(target=client, args=(args.requests // args.clients,))
+                    for _ in range(args.clients)
+                ]
+                for thread in clients:
+                    thread.start()
+                for thread in clients:
+                    thread.join()
+                elapsed = time.perf_counter() - started_at
+
+                percentiles = statistics.quantiles(latencies, n=100)
+                print(
+                    f"CONN_MAX_AGE={conn_max_age:<4} "
+                    f"{len(latencies) / elapsed:>8.1f} req/s "
+                    f"p50={percentiles[49] * 1000:>6.2f} ms "
+                    f"p99={percentiles[98] * 1000:>6.2f} ms "
+                    f"connections opened={len(opened)}"
+                )
+        finally:
+            database.connect = original_connect
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Memory and construction time of the DTOs of a large export.
+
+Builds --count MemberDTO objects from rows shaped like the output of
+values_list: with the previous layout (a frozen dataclass with a __dict__),
+with the slotted MemberDTO from keyword arguments, with dtos_from_rows, and
+by way of Person model objects as the model-based read path does. Memory is
+the size of the built objects as traced by tracemalloc. No database is
+needed, only the Django settings.
+
+Usage:
+    python -m benchmarks.dto_construction [--count 1000000]
+"""
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+
+from benchmarks.utils import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1000000, help="DTOs to build.")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from core.dto import dtos_from_rows
+    from persons.models import Person
+    from teams.dto import MemberDTO
+
+    DictMemberDTO = dataclasses.make_dataclass(
+        "DictMemberDTO", [(field.name, field.type) for field in dataclasses.fields(MemberDTO)], frozen=True
+    )
+
+    rows = [(index, f"First {index}", f"Last {index}", f"member{index}@gmail.com") for index in range(args.count)]
+
+    def from_keywords(dto_class):
+        return [
+            dto_class(id=id, first_name=first_name, last_name=last_name, email=email)
+            for id, first_name, last_name, email in rows
+        ]
+
+    def from_models():
+        members = (
+            Person(id=id, first_name=first_name, last_name=last_name, email=email)
+            for id, first_name, last_name, email in rows
+        )
+        return [
+            MemberDTO(id=member.pk, first_name=member.first_name, last_name=member.last_name, email=member.email)
+            for member in members
+        ]
+
+    scenarios = [
+        ("frozen dataclass with __dict__", lambda: from_keywords(DictMemberDTO)),
+        ("slotted, keyword arguments", lambda: from_keywords(MemberDTO)),
+        ("slotted, dtos_from_rows", lambda: dtos_from_rows(MemberDTO, rows)),
+        ("slotted, through Person objects", from_models),
+    ]
+
+    print(f"count={args.count}")
+
+    for name, build in scenarios:
+        # Without the cyclic collector, which would walk the growing list again and again.
+        gc.collect()
+        gc.disable()
+        started_at = time.perf_counter()
+        dtos = build()
+        elapsed = time.perf_counter() - started_at
+        gc.enable()
+        del dtos
+
+        # A second build, traced, for the memory held by the DTOs.
+        gc.collect()
+        tracemalloc.start()
+        dtos = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del dtos
+
+        print(f"{name:<36} {elapsed:>8.3f} s {elapsed / args.count * 1e9:>8.0f} ns/DTO {size / 2**20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
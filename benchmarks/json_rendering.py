@@ -0,0 +1,92 @@
+"""
+Cost of encoding the /api/person/ responses and decoding a bulk-create body.
+
+Fills a test database with persons in teams of --team-size members, takes
+the data of one /api/person/ page for the default team embedding and for
+expand=team.members, and renders it with JSONRenderer and FastJSONRenderer.
+Then parses a /api/person/bulk/ body of the same size with JSONParser and
+FastJSONParser. FastJSONRenderer falls back to JSONRenderer without orjson,
+so install it first.
+
+Usage:
+    python -m benchmarks.json_rendering [--limit 1000] [--team-size 20] [--repeat 20]
+"""
+
+import argparse
+import io
+import json
+
+from benchmarks.utils import measure, report, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=1000, help="Persons on the page.")
+    parser.add_argument("--team-size", type=int, default=20, help="Members of every team.")
+    parser.add_argument("--repeat", type=int, default=20, help="Encodings per scenario.")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+
+    from core import renderers
+    from core.parsers import FastJSONParser
+    from core.renderers import FastJSONRenderer
+    from persons.models import Person
+    from teams.models import Team
+
+    print(f"orjson={'installed' if renderers.orjson else 'missing'} limit={args.limit} team_size={args.team_size}")
+
+    with test_database():
+        teams = Team.objects.bulk_create(
+            Team(name=f"Team {index}", member_count=args.team_size) for index in range(args.limit // args.team_size)
+        )
+        Person.objects.bulk_create(
+            Person(
+                first_name=f"Person {index}",
+                last_name="Benchmark",
+                email=f"benchmark{index}@gmail.com",
+                team=teams[index // args.team_size],
+            )
+            for index in range(len(teams) * args.team_size)
+        )
+
+        setup_test_environment()
+        client = APIClient()
+
+        for expand in [None, "team.members"]:
+            query = {"limit": args.limit, **({"expand": expand} if expand else {})}
+            data = client.get(reverse("api-person-list"), query).data
+            size = len(JSONRenderer().render(data))
+
+            for renderer in [JSONRenderer(), FastJSONRenderer()]:
+                report(
+                    f"{type(renderer).__name__} expand={expand or '-'} ({size // 1024} KiB)",
+                    args.repeat,
+                    measure(lambda: renderer.render(data), args.repeat),
+                    unit="pages",
+                )
+
+    body = json.dumps(
+        [
+            {"first_name": f"Person {index}", "last_name": "Benchmark", "email": f"benchmark{index}@gmail.com"}
+            for index in range(args.limit)
+        ]
+    ).encode()
+
+    for json_parser in [JSONParser(), FastJSONParser()]:
+        report(
+            f"{type(json_parser).__name__} bulk body ({len(body) // 1024} KiB)",
+            args.repeat,
+            measure(lambda: json_parser.parse(io.BytesIO(body)), args.repeat),
+            unit="bodies",
+        )
+
+
+if __name__ == "__main__":
+    main()
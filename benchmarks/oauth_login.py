@@ -0,0 +1,73 @@
+"""
+Logins per second of the OAuth user lookup.
+
+Compares the previous behaviour, which hashed and saved a new random
+password on every login, with the current repository, for returning
+users and for first logins. The provider round trip is not included;
+each login is the repository call plus issuing the JWT pair.
+
+Usage:
+    python -m benchmarks.oauth_login [--logins 200]
+"""
+
+import argparse
+import itertools
+
+from benchmarks.utils import measure, report, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200, help="Logins per scenario.")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from annoying.functions import get_object_or_None
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.utils.crypto import get_random_string
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from oauth.dto import OAuthResponseDTO
+    from oauth.repositories import GoogleAuthRepository
+
+    repository = GoogleAuthRepository()
+    counter = itertools.count()
+
+    def previous_login(user_dto):
+        user = get_object_or_None(get_user_model(), email=user_dto.email)
+
+        if user is None:
+            user = get_user_model().objects.create_user(
+                username=user_dto.email.split("@")[0],
+                email=user_dto.email,
+                first_name=user_dto.first_name,
+                last_name=user_dto.last_name,
+            )
+
+        user.password = make_password(get_random_string(length=12))
+        user.save()
+
+        return RefreshToken.for_user(user)
+
+    def current_login(user_dto):
+        return RefreshToken.for_user(repository.get_or_create_oauth_user(user_dto))
+
+    def new_user_dto():
+        return OAuthResponseDTO(email=f"user{next(counter)}@gmail.com", first_name="John", last_name="Doe")
+
+    with test_database():
+        returning_user_dto = new_user_dto()
+        current_login(returning_user_dto)
+
+        for name, login in (("previous", previous_login), ("current", current_login)):
+            seconds = measure(lambda: login(returning_user_dto), args.logins)
+            report(f"{name}: returning user", args.logins, seconds, unit="logins")
+
+            seconds = measure(lambda: login(new_user_dto()), args.logins)
+            report(f"{name}: first login", args.logins, seconds, unit="logins")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Cost of the list read path: model objects against values_list rows.
+
+Fills a test database with --count persons in teams of --team-size members
+and reads all of them as DTOs twice: through model objects converted by the
+repositories, as the listings did before, and through the values_list rows
+the listings read now. Persons are read with their team embedded by id,
+name and member count, and teams with their members.
+
+Usage:
+    python -m benchmarks.read_path [--count 100000] [--team-size 20] [--repeat 3]
+"""
+
+import argparse
+
+from benchmarks.utils import measure, report, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100000, help="Persons in the database.")
+    parser.add_argument("--team-size", type=int, default=20, help="Members of every team.")
+    parser.add_argument("--repeat", type=int, default=3, help="Reads per scenario.")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from persons.models import Person
+    from persons.repositories import PersonRepository
+    from teams.models import Team
+    from teams.repositories import TeamRepository
+
+    with test_database():
+        teams = Team.objects.bulk_create(
+            Team(name=f"Team {index}", member_count=args.team_size) for index in range(args.count // args.team_size)
+        )
+        Person.objects.bulk_create(
+            (
+                Person(
+                    first_name=f"Person {index}",
+                    last_name="Benchmark",
+                    email=f"benchmark{index}@gmail.com",
+                    team=teams[index // args.team_size],
+                )
+                for index in range(len(teams) * args.team_size)
+            ),
+            batch_size=5000,
+        )
+
+        print(f"persons={Person.objects.count()} teams={len(teams)}")
+
+        person_columns = (*PersonRepository.PERSON_COLUMNS, "team_id", "team__name", "team__member_count")
+
+        scenarios = [
+            (
+                "persons, model objects",
+                lambda: [
+                    PersonRepository._person_to_dto(person)
+                    for person in Person.objects.select_related("team").only(*person_columns).order_by("id")
+                ],
+            ),
+            (
+                "persons, values_list rows",
+                lambda: PersonRepository._rows_to_dto(list(PersonRepository._get_persons_rows().order_by("id"))),
+            ),
+            (
+                "teams with members, model objects",
+                lambda: [TeamRepository._team_to_dto(team) for team in Team.objects.prefetch_related("members")],
+            ),
+            (
+                "teams with members, values_list rows",
+                lambda: TeamRepository._rows_to_dto(list(Team.objects.values_list(*TeamRepository.TEAM_COLUMNS))),
+            ),
+        ]
+
+        for name, read in scenarios:
+            report(name, args.repeat * args.count, measure(read, args.repeat), unit="rows")
+
+
+if __name__ == "__main__":
+    main()
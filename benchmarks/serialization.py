@@ -0,0 +1,63 @@
+"""
+Cost of turning person DTOs into response data.
+
+Builds a listing of persons in teams of --team-size members and serializes it
+with PersonSerializer and with the compiled serializer the views use, for the
+default embedding of the team and for each expand option. No database is
+needed, only the Django settings.
+
+Usage:
+    python -m benchmarks.serialization [--persons 100000] [--team-size 20]
+"""
+
+import argparse
+
+from benchmarks.utils import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--persons", type=int, default=100000, help="Persons in the listing.")
+    parser.add_argument("--team-size", type=int, default=20, help="Members of every team.")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from persons.dto import PersonDTO
+    from persons.serializers import PersonSerializer, get_person_dto_serializer
+    from teams.dto import MemberDTO, TeamDTO
+
+    persons = []
+
+    for team_id in range(args.persons // args.team_size):
+        members = tuple(
+            MemberDTO(id=team_id * args.team_size + index, first_name="First", last_name="Last", email="a@gmail.com")
+            for index in range(args.team_size)
+        )
+        team = TeamDTO(id=team_id, name=f"Team {team_id}", member_count=len(members), members=members)
+        persons.extend(
+            PersonDTO(id=member.id, first_name="First", last_name="Last", email="a@gmail.com", team=team)
+            for member in members
+        )
+
+    print(f"persons={len(persons)} team_size={args.team_size}")
+
+    for expand in [(), ("team",), ("team.members",)]:
+        serialize = get_person_dto_serializer(None, expand)
+
+        report(
+            f"PersonSerializer expand={','.join(expand) or '-'}",
+            len(persons),
+            measure(lambda: PersonSerializer(persons, many=True, expand=expand).data, 1),
+            unit="persons",
+        )
+        report(
+            f"compiled expand={','.join(expand) or '-'}",
+            len(persons),
+            measure(lambda: [serialize(person) for person in persons], 1),
+            unit="persons",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Every script is run as a module from the project root, for example
+``python -m benchmarks.oauth_login``, with the same environment as
+``manage.py``. It works on a throwaway test database, so running a
+benchmark never touches the data of the configured database.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    """Configure Django with the settings used by ``manage.py``."""
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Create the test databases for the duration of the block.
+
+    Yields:
+        None - The default connection points to the test database inside the block.
+    """
+
+    from django.test.utils import setup_databases, teardown_databases
+
+    old_config = setup_databases(verbosity=0, interactive=False)
+
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+def measure(function, repeat: int) -> float:
+    """
+    Call a function several times and return the elapsed wall-clock time.
+
+    Args:
+        function (Callable): The function to call, without arguments.
+        repeat (int): How many times to call it.
+
+    Returns:
+        float - Elapsed seconds.
+    """
+
+    started_at = time.perf_counter()
+
+    for _ in range(repeat):
+        function()
+
+    return time.perf_counter() - started_at
+
+
+def report(name: str, operations: int, seconds: float, unit: str = "ops"):
+    """Print one result line with the throughput and the mean time per operation."""
+
+    print(f"{name:<48} {operations / seconds:>12.1f} {unit}/s {seconds / operations * 1e6:>12.1f} us/op")
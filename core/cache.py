@@ -0,0 +1,183 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from django.core.cache import caches
+from django.db import transaction
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class VersionedCache:
+    """
+    Read-through cache whose entries are invalidated together by bumping a version.
+
+    Every entry is stored under the current version of the namespace, using the
+    version argument of Django's cache framework. Bumping the version makes all
+    previously cached entries unreachable at once, without knowing their keys.
+
+    Concurrent misses of the same key are coalesced: the first caller takes a
+    short-lived lock and computes the value, the others wait for it to appear
+    in the cache instead of hitting the database at the same time.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        alias: str = "default",
+        timeout: int = 60,
+        lock_timeout: int = 10,
+        wait_timeout: float = 2,
+        poll_interval: float = 0.05,
+    ):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_or_set(self, key: str, compute: Callable[[], T]) -> T:
+        """
+        Return the cached value of the key, computing and caching it on a miss.
+
+        Args:
+            key (str): The key of the entry inside the namespace.
+            compute (Callable): Returns the value on a miss. Exceptions are propagated and nothing is cached.
+
+        Returns:
+            The cached or computed value.
+        """
+
+        cache_key = self._make_key(key)
+        lock_key = self._make_key(f"{key}:lock")
+        version = self.get_version()
+
+        value = self.cache.get(cache_key, _MISSING, version=version)
+
+        if value is not _MISSING:
+            return value
+
+        if self.cache.add(lock_key, True, timeout=self.lock_timeout, version=version):
+            try:
+                value = compute()
+                self.cache.set(cache_key, value, timeout=self.timeout, version=version)
+                return value
+            finally:
+                self.cache.delete(lock_key, version=version)
+
+        deadline = time.monotonic() + self.wait_timeout
+
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+
+            value = self.cache.get(cache_key, _MISSING, version=version)
+
+            if value is not _MISSING:
+                return value
+
+            # The lock holder failed without caching anything, so there is nothing to wait for.
+            if self.cache.get(lock_key, version=version) is None:
+                break
+
+        return compute()
+
+    async def aget_or_set(self, key: str, compute: Callable[[], Awaitable[T]]) -> T:
+        """
+        Asynchronous version of get_or_set, for coroutines that must not block the event loop.
+
+        Args:
+            key (str): The key of the entry inside the namespace.
+            compute (Callable): Returns an awaitable of the value on a miss. Exceptions are propagated
+                and nothing is cached.
+
+        Returns:
+            The cached or computed value.
+        """
+
+        cache_key = self._make_key(key)
+        lock_key = self._make_key(f"{key}:lock")
+        version = await self.aget_version()
+
+        value = await self.cache.aget(cache_key, _MISSING, version=version)
+
+        if value is not _MISSING:
+            return value
+
+        if await self.cache.aadd(lock_key, True, timeout=self.lock_timeout, version=version):
+            try:
+                value = await compute()
+                await self.cache.aset(cache_key, value, timeout=self.timeout, version=version)
+                return value
+            finally:
+                await self.cache.adelete(lock_key, version=version)
+
+        deadline = time.monotonic() + self.wait_timeout
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+
+            value = await self.cache.aget(cache_key, _MISSING, version=version)
+
+            if value is not _MISSING:
+                return value
+
+            if await self.cache.aget(lock_key, version=version) is None:
+                break
+
+        return await compute()
+
+    def get_version(self) -> int:
+        """Return the current version of the namespace."""
+
+        version_key = self._make_key("version")
+        version = self.cache.get(version_key)
+
+        if version is None:
+            # Start from the clock so that a lost version key never reuses an old version.
+            self.cache.add(version_key, time.time_ns(), timeout=None)
+            version = self.cache.get(version_key, time.time_ns())
+
+        return version
+
+    async def aget_version(self) -> int:
+        """Asynchronous version of get_version."""
+
+        version_key = self._make_key("version")
+        version = await self.cache.aget(version_key)
+
+        if version is None:
+            await self.cache.aadd(version_key, time.time_ns(), timeout=None)
+            version = await self.cache.aget(version_key, time.time_ns())
+
+        return version
+
+    def invalidate(self) -> None:
+        """
+        Make every entry of the namespace stale.
+
+        The version is bumped immediately and, inside a transaction, once more
+        after it commits, so values read from the database before the commit
+        are not served afterwards.
+        """
+
+        self._bump_version()
+
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(self._bump_version)
+
+    def _bump_version(self) -> None:
+        try:
+            self.cache.incr(self._make_key("version"))
+        except ValueError:
+            self.cache.add(self._make_key("version"), time.time_ns(), timeout=None)
+
+    def _make_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
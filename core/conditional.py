@@ -0,0 +1,62 @@
+import hashlib
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .dto import ResourceVersionDTO
+
+
+def make_resource_version(*parts) -> ResourceVersionDTO:
+    """
+    Build the validator of a resource from the values that describe its state.
+
+    Args:
+        parts: Values that change whenever the representation of the resource changes,
+            such as row counts and modification times returned by an aggregate query.
+
+    Returns:
+        ResourceVersionDTO - A strong ETag of the resource.
+    """
+
+    etag = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+    return ResourceVersionDTO(etag=etag)
+
+
+def get_not_modified_response(request, version: ResourceVersionDTO) -> HttpResponseBase | None:
+    """
+    Evaluate If-None-Match against the version of a resource.
+
+    Args:
+        request: The incoming request.
+        version (ResourceVersionDTO): The current validator of the requested resource.
+
+    Returns:
+        HttpResponseBase | None - A 304 response with the ETag set, or None if
+        the full response has to be built.
+    """
+
+    response = get_conditional_response(request, etag=quote_etag(version.etag))
+
+    if response is not None:
+        set_version_headers(response, version)
+
+    return response
+
+
+def set_version_headers(response: HttpResponseBase, version: ResourceVersionDTO) -> HttpResponseBase:
+    """
+    Set the ETag header of a response.
+
+    Args:
+        response (HttpResponseBase): The response to update.
+        version (ResourceVersionDTO): The validator of the returned resource.
+
+    Returns:
+        HttpResponseBase - The same response.
+    """
+
+    response.headers["ETag"] = quote_etag(version.etag)
+
+    return response
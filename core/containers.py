@@ -1,11 +1,15 @@
 from dependency_injector import containers, providers
+from django.conf import settings
 
-from persons.repositories import PersonRepository
+from core.cache import VersionedCache
+from core.scopes import scoped
+from persons.repositories import CachedPersonRepository, PersonRepository
 from persons.services import PersonService
-from teams.repositories import TeamRepository
+from teams.repositories import CachedTeamRepository, TeamRepository
 from teams.services import TeamService
 from oauth.repositories import GoogleAuthRepository
 from oauth.services import GoogleAuthService
+from oauth.http import AsyncOAuthHttpClient, OAuthHttpClient
 from oauth.provider import OAuth2ProviderFactory
 
 
@@ -13,23 +17,89 @@ class RepositoryContainer(containers.DeclarativeContainer):
     """
     A container responsible for providing instances of various repository classes.
     Repositories are data access components used by services to retrieve data.
+
+    Repositories are stateless, so by default one instance per process is shared
+    by all requests; settings.CONTAINER_SCOPES can change their scope.
     """
 
-    person_repository = providers.Factory(PersonRepository)
-    team_repository = providers.Factory(TeamRepository)
-    oauth_repository = providers.Factory(GoogleAuthRepository)
+    repository_cache = providers.Singleton(
+        VersionedCache,
+        namespace="repositories",
+        alias=settings.REPOSITORY_CACHE["ALIAS"],
+        timeout=settings.REPOSITORY_CACHE["TIMEOUT"],
+        lock_timeout=settings.REPOSITORY_CACHE["LOCK_TIMEOUT"],
+        wait_timeout=settings.REPOSITORY_CACHE["WAIT_TIMEOUT"],
+    )
+
+    # See settings.REPOSITORY_CACHE for when the repositories read through the cache.
+    if settings.REPOSITORY_CACHE["ENABLED"]:
+        person_repository = scoped(
+            settings.CONTAINER_SCOPES["REPOSITORIES"],
+            CachedPersonRepository,
+            person_repository=scoped(settings.CONTAINER_SCOPES["REPOSITORIES"], PersonRepository),
+            cache=repository_cache,
+        )
+        team_repository = scoped(
+            settings.CONTAINER_SCOPES["REPOSITORIES"],
+            CachedTeamRepository,
+            team_repository=scoped(settings.CONTAINER_SCOPES["REPOSITORIES"], TeamRepository),
+            cache=repository_cache,
+        )
+    else:
+        person_repository = scoped(settings.CONTAINER_SCOPES["REPOSITORIES"], PersonRepository)
+        team_repository = scoped(settings.CONTAINER_SCOPES["REPOSITORIES"], TeamRepository)
+    oauth_repository = scoped(settings.CONTAINER_SCOPES["REPOSITORIES"], GoogleAuthRepository)
 
 
 class ServiceContainer(containers.DeclarativeContainer):
     """
     A container responsible for providing instances of various service classes.
     Services are responsible for interaction with the data storage layer and business logic of the application.
+
+    Services are stateless, so by default one instance per process is shared
+    by all requests; settings.CONTAINER_SCOPES can change their scope.
     """
 
-    person_service = providers.Factory(PersonService, person_repository=RepositoryContainer.person_repository)
-    team_service = providers.Factory(TeamService, team_repository=RepositoryContainer.team_repository)
-    oauth_service = providers.Factory(
+    person_service = scoped(
+        settings.CONTAINER_SCOPES["SERVICES"], PersonService, person_repository=RepositoryContainer.person_repository
+    )
+    team_service = scoped(
+        settings.CONTAINER_SCOPES["SERVICES"], TeamService, team_repository=RepositoryContainer.team_repository
+    )
+    oauth_http_client = providers.Singleton(
+        OAuthHttpClient,
+        connect_timeout=settings.OAUTH_HTTP["CONNECT_TIMEOUT"],
+        read_timeout=settings.OAUTH_HTTP["READ_TIMEOUT"],
+        retries=settings.OAUTH_HTTP["RETRIES"],
+        backoff_factor=settings.OAUTH_HTTP["BACKOFF_FACTOR"],
+        pool_maxsize=settings.OAUTH_HTTP["POOL_MAXSIZE"],
+    )
+    oauth_async_http_client = providers.Singleton(
+        AsyncOAuthHttpClient,
+        connect_timeout=settings.OAUTH_HTTP["CONNECT_TIMEOUT"],
+        read_timeout=settings.OAUTH_HTTP["READ_TIMEOUT"],
+        retries=settings.OAUTH_HTTP["RETRIES"],
+        backoff_factor=settings.OAUTH_HTTP["BACKOFF_FACTOR"],
+        pool_maxsize=settings.OAUTH_HTTP["ASYNC_POOL_MAXSIZE"],
+    )
+    oauth_login_cache = providers.Singleton(
+        VersionedCache,
+        namespace="oauth",
+        alias=settings.OAUTH_LOGIN_CACHE["ALIAS"],
+        timeout=settings.OAUTH_LOGIN_CACHE["TIMEOUT"],
+        lock_timeout=settings.OAUTH_LOGIN_CACHE["LOCK_TIMEOUT"],
+        wait_timeout=settings.OAUTH_LOGIN_CACHE["WAIT_TIMEOUT"],
+    )
+    oauth_provider_factory = scoped(
+        settings.CONTAINER_SCOPES["SERVICES"],
+        OAuth2ProviderFactory,
+        http_client=oauth_http_client,
+        async_http_client=oauth_async_http_client,
+    )
+    oauth_service = scoped(
+        settings.CONTAINER_SCOPES["SERVICES"],
         GoogleAuthService,
         oauth_repository=RepositoryContainer.oauth_repository,
-        oauth_provider_factory=providers.Factory(OAuth2ProviderFactory),
+        login_cache=oauth_login_cache,
+        oauth_provider_factory=oauth_provider_factory,
     )
@@ -0,0 +1,78 @@
+"""
+PostgreSQL backend that keeps connections open in an in-process pool.
+
+Closing a connection, which Django does at the end of every request with
+CONN_MAX_AGE = 0, returns it to the pool instead of closing the socket, and
+the next request of any thread of the process checks it out again. Settings
+of the pool are read from the POOL key of the database settings:
+
+    "POOL": {"MAX_SIZE": 10, "TIMEOUT": 10}
+"""
+
+from functools import partial
+
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgreSQLDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+
+from core.db.pool import ConnectionPool, get_pool
+
+
+class DatabaseWrapper(PostgreSQLDatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        # The test runner switches the database name, so pools are keyed by all the parameters.
+        self.pool = get_pool(
+            tuple(sorted(conn_params.items(), key=lambda item: item[0])),
+            lambda: ConnectionPool(
+                max_size=self.settings_dict["POOL"]["MAX_SIZE"],
+                timeout=self.settings_dict["POOL"]["TIMEOUT"],
+                check=partial(check_connection, health_check=self.settings_dict["CONN_HEALTH_CHECKS"]),
+                reset=reset_connection,
+            ),
+        )
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get("isolation_level", IsolationLevel.READ_COMMITTED)
+        )
+
+        return self.pool.getconn(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
+
+
+def check_connection(connection, health_check: bool) -> bool:
+    """Return whether an idle connection can be checked out, pinging the server if health_check is set."""
+
+    if connection.closed:
+        return False
+
+    if not health_check:
+        return True
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Exception:
+        return False
+
+    return reset_connection(connection)
+
+
+def reset_connection(connection) -> bool:
+    """Roll back an open transaction of a released connection; return False if it must be closed."""
+
+    if connection.closed:
+        return False
+
+    status = connection.info.transaction_status
+
+    if status == TRANSACTION_STATUS_UNKNOWN:
+        return False
+
+    if status != TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+    return True
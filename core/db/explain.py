@@ -0,0 +1,45 @@
+import re
+
+from django.db import connections, transaction
+from django.db.models import QuerySet
+
+_SEQUENTIAL_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    # A table scan, not a scan of an index: "SCAN persons_person" or "SCAN TABLE persons_person".
+    "sqlite": re.compile(r"\bSCAN (?:TABLE )?(\w+)(?!.*\bUSING\b)"),
+}
+
+
+def get_sequential_scans(queryset: QuerySet) -> list[str]:
+    """
+    Return the tables that the plan of the queryset reads with a sequential scan.
+
+    PostgreSQL scans small tables, such as those of a test database, even
+    when an index exists, so sequential scans are disabled for the EXPLAIN.
+    The planner then uses an index whenever one can serve the query, and a
+    remaining "Seq Scan" means there is none.
+
+    Args:
+        queryset (QuerySet): The query to explain.
+
+    Returns:
+        list[str] - The names of the sequentially scanned tables, empty if every table is read by an index.
+
+    Raises:
+        NotImplementedError: If the plan of the database vendor can not be inspected.
+    """
+
+    connection = connections[queryset.db]
+    pattern = _SEQUENTIAL_SCAN_PATTERNS.get(connection.vendor)
+
+    if pattern is None:
+        raise NotImplementedError(f"Query plans of {connection.vendor} are not supported")
+
+    with transaction.atomic(using=queryset.db):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = queryset.explain()
+
+    return [match.group(1) for line in plan.splitlines() if (match := pattern.search(line))]
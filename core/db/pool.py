@@ -0,0 +1,133 @@
+import os
+import threading
+from collections import deque
+from collections.abc import Callable
+
+from django.db import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    """Raised when no connection of the pool is released in time."""
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of open database connections.
+
+    At most max_size connections are checked out or idle at a time; a caller
+    that finds the pool exhausted waits up to timeout seconds for a release.
+    Idle connections are reused last-in first-out, so under a light load the
+    same few connections stay warm and the others can time out on the server.
+
+    The pool does not know the database driver: it checks, resets and closes
+    connections through the callables it is given, and getconn receives the
+    callable that opens a new one.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        timeout: float,
+        check: Callable = lambda connection: True,
+        reset: Callable = lambda connection: True,
+        close: Callable = lambda connection: connection.close(),
+    ) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self._check = check
+        self._reset = reset
+        self._close = close
+        self._idle = deque()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def getconn(self, connect: Callable):
+        """
+        Check out a connection, opening one if none is idle.
+
+        Args:
+            connect (Callable): Opens a new connection.
+
+        Returns:
+            An open connection of the driver.
+
+        Raises:
+            PoolTimeout: If all the connections stay checked out for timeout seconds.
+        """
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No database connection was released in {self.timeout} seconds")
+
+        try:
+            while True:
+                try:
+                    connection = self._idle.pop()
+                except IndexError:
+                    return connect()
+
+                if self._check(connection):
+                    return connection
+
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection) -> None:
+        """
+        Return a checked out connection, closing it if it can't be reset.
+
+        Args:
+            connection: A connection returned by getconn.
+        """
+
+        try:
+            if self._reset(connection):
+                self._idle.append(connection)
+            else:
+                self._discard(connection)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close the idle connections."""
+
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def _discard(self, connection) -> None:
+        try:
+            self._close(connection)
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, factory: Callable[[], ConnectionPool]) -> ConnectionPool:
+    """
+    Return the pool of the current process for the key, creating it on first use.
+
+    Pools are not shared with forked worker processes, whose connections
+    must not be used by the parent.
+
+    Args:
+        key: Identifies the database, for example the connection parameters.
+        factory (Callable): Creates the pool.
+
+    Returns:
+        ConnectionPool - The pool of the key.
+    """
+
+    key = (os.getpid(), key)
+
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = factory()
+
+        return _pools[key]
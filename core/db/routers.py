@@ -0,0 +1,88 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_pinned_to_primary = ContextVar("pinned_to_primary", default=False)
+_written = ContextVar("written", default=False)
+_replica = ContextVar("replica", default=None)
+
+
+class PrimaryReplicaRouter:
+    """
+    Send writes to the primary database and reads to the replicas of settings.REPLICA_DATABASES.
+
+    Each request reads from one replica, picked at random, so all the queries
+    of a response see the same replication state. Reads go to the primary
+    inside a transaction, and for the rest of a request once it wrote, so a
+    request always sees its own writes. ReadYourWritesMiddleware keeps a
+    client on the primary for a while after a write.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not settings.REPLICA_DATABASES or _pinned_to_primary.get():
+            return DEFAULT_DB_ALIAS
+
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        replica = _replica.get()
+
+        if replica not in settings.REPLICA_DATABASES:
+            replica = random.choice(settings.REPLICA_DATABASES)
+            _replica.set(replica)
+
+        return replica
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        _written.set(True)
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+
+def pin_to_primary() -> None:
+    """Send the reads of the current request or context to the primary database."""
+
+    _pinned_to_primary.set(True)
+
+
+def can_cache_reads() -> bool:
+    """
+    Return whether reads can go through a cache shared by all requests.
+
+    With a single database, invalidating the cache on every write keeps it
+    consistent. With replicas it is bypassed: a replica can lag behind the
+    invalidation that followed a write and would fill the cache again with the
+    old data, and a request pinned to the primary has to see writes that a
+    cache filled from a replica would not hold.
+
+    Returns:
+        bool - True when no replicas are configured.
+    """
+
+    return not settings.REPLICA_DATABASES
+
+
+def has_written() -> bool:
+    """Return whether the current request or context wrote to the primary database."""
+
+    return _written.get()
+
+
+def reset_routing(pinned_to_primary: bool = False) -> None:
+    """
+    Start the routing state of a new request.
+
+    Args:
+        pinned_to_primary (bool): Whether the reads of the request go to the primary database.
+    """
+
+    _pinned_to_primary.set(pinned_to_primary)
+    _written.set(False)
+    _replica.set(None)
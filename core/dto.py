@@ -0,0 +1,62 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, fields
+from itertools import starmap
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class PageRequestDTO:
+    limit: int
+    after: tuple | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PageDTO(Generic[T]):
+    items: list[T]
+    next_after: tuple | None
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceVersionDTO:
+    etag: str
+
+
+@dataclass(frozen=True, slots=True)
+class FieldsDTO:
+    fields: tuple[str, ...] | None = None
+    expand: tuple[str, ...] = ()
+
+
+def get_field_names(dto_class: type) -> tuple[str, ...]:
+    """
+    Return the field names of a DTO class in declaration order.
+
+    Args:
+        dto_class (type): The dataclass of the DTOs.
+
+    Returns:
+        tuple[str, ...] - The names, in the order dtos_from_rows expects the values of a row.
+    """
+
+    return tuple(field.name for field in fields(dto_class))
+
+
+def dtos_from_rows(dto_class: type[T], rows: Iterable[tuple]) -> list[T]:
+    """
+    Build DTOs from database rows without instantiating model objects.
+
+    Each row holds the values of the DTO fields in declaration order, as
+    returned by values_list(*get_field_names(dto_class)) when the model
+    fields have the names of the DTO fields.
+
+    Args:
+        dto_class (type[T]): The dataclass of the DTOs.
+        rows (Iterable[tuple]): The rows, such as a values_list queryset.
+
+    Returns:
+        list[T] - One DTO per row.
+    """
+
+    return list(starmap(dto_class, rows))
@@ -0,0 +1,65 @@
+import dataclasses
+from typing import Any, Callable, Iterable
+
+DTOSerializer = Callable[[Any], dict]
+
+
+def compile_dto_serializer(
+    dto_class: type,
+    fields: Iterable[str] | None = None,
+    nested: dict[str, DTOSerializer] | None = None,
+    many: dict[str, DTOSerializer] | None = None,
+) -> DTOSerializer:
+    """
+    Build a function that turns a DTO into the dict of a response.
+
+    The function is generated once from the fields of the dataclass and reads
+    every field with a single attribute access, so a DTO is serialized without
+    the per-field calls of a DRF serializer. The DRF serializers still describe
+    the responses in the API schema, and the compiled functions have to return
+    the same data.
+
+    Args:
+        dto_class (type): The dataclass of the serialized DTOs.
+        fields (Iterable[str] | None): The fields to return, all fields if None. Keys follow the dataclass order.
+        nested (dict[str, DTOSerializer] | None): Serializers of the fields that hold a DTO or None.
+        many (dict[str, DTOSerializer] | None): Serializers of the items of the fields that hold a sequence of DTOs.
+
+    Returns:
+        DTOSerializer - The function that serializes one DTO.
+
+    Raises:
+        ValueError: If a field is not a field of the dataclass.
+    """
+
+    nested = nested or {}
+    many = many or {}
+    names = [field.name for field in dataclasses.fields(dto_class)]
+
+    if fields is not None:
+        fields = set(fields)
+        unknown_fields = fields - set(names)
+
+        if unknown_fields:
+            raise ValueError(f"{dto_class.__name__} has no fields {', '.join(sorted(unknown_fields))}")
+
+        names = [name for name in names if name in fields]
+
+    namespace = {}
+    items = []
+
+    for name in names:
+        if name in nested:
+            namespace[f"nested_{name}"] = nested[name]
+            items.append(f"{name!r}: None if (value := dto.{name}) is None else nested_{name}(value)")
+        elif name in many:
+            namespace[f"many_{name}"] = many[name]
+            items.append(f"{name!r}: [many_{name}(item) for item in dto.{name}]")
+        else:
+            items.append(f"{name!r}: dto.{name}")
+
+    function_name = f"serialize_{dto_class.__name__}"
+    source = f"def {function_name}(dto):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<{function_name}>", "exec"), namespace)
+
+    return namespace[function_name]
@@ -1,3 +1,8 @@
 class InstanceDoesNotExistError(Exception):
     def __init__(self, message="Instance does not exists", *args, **kwargs):
         super().__init__(message, *args)
+
+
+class InstanceAlreadyExistsError(Exception):
+    def __init__(self, message="Instance already exists", *args, **kwargs):
+        super().__init__(message, *args)
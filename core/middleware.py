@@ -0,0 +1,99 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from .db.routers import has_written, reset_routing
+from .scopes import reset_request_scope
+
+
+class RequestScopeMiddleware:
+    """
+    Drop the request-scoped objects of the containers around every request.
+
+    The scope is reset before the view, so a request never sees objects of a
+    previous request handled in the same thread, and after it, so they are
+    released early. A streaming response is still being produced after the
+    middleware returns, so its objects are only released by the next request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        reset_request_scope()
+        response = self.get_response(request)
+
+        if not response.streaming:
+            reset_request_scope()
+
+        return response
+
+    async def __acall__(self, request):
+        reset_request_scope()
+        response = await self.get_response(request)
+
+        if not response.streaming:
+            reset_request_scope()
+
+        return response
+
+
+class ReadYourWritesMiddleware:
+    """
+    Keep the reads of a client on the primary database for a while after it wrote.
+
+    An unsafe request reads from the primary for its whole duration. A request
+    that wrote sets a cookie for settings.READ_YOUR_WRITES_SECONDS, the
+    replication lag the replicas are allowed, and the requests that carry it
+    read from the primary too, so a client never misses its own writes.
+    """
+
+    COOKIE_NAME = "read_primary"
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        reset_routing(self._is_pinned_to_primary(request))
+        response = self.get_response(request)
+
+        return self._process_response(response)
+
+    async def __acall__(self, request):
+        reset_routing(self._is_pinned_to_primary(request))
+        response = await self.get_response(request)
+
+        return self._process_response(response)
+
+    def _is_pinned_to_primary(self, request) -> bool:
+        return request.method not in SAFE_METHODS or self.COOKIE_NAME in request.COOKIES
+
+    def _process_response(self, response):
+        if has_written():
+            response.set_cookie(
+                self.COOKIE_NAME,
+                "1",
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+
+        return response
@@ -0,0 +1,26 @@
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+def iter_ndjson(rows: Iterable[dict], batch_size: int = 500) -> Iterator[str]:
+    """
+    Encode rows as newline-delimited JSON.
+
+    Lines are joined into batches so that a streaming response or a file
+    receives a few large writes instead of one write per row.
+
+    Args:
+        rows (Iterable[dict]): The rows to encode.
+        batch_size (int): The number of lines in each yielded chunk.
+
+    Returns:
+        Iterator[str] - Chunks of NDJSON text, each ending with a newline.
+    """
+
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    rows = iter(rows)
+
+    while batch := list(islice(rows, batch_size)):
+        yield "".join(encoder.encode(row) + "\n" for row in batch)
@@ -0,0 +1,124 @@
+import base64
+import binascii
+import json
+import math
+from collections.abc import Callable
+from operator import attrgetter
+from typing import Any
+
+from django.db.models import QuerySet
+
+from .dto import PageRequestDTO
+
+
+# Ids are 64-bit integers in the database, a larger value can not be compared with them.
+MAX_CURSOR_ID = 2**63 - 1
+
+
+class InvalidCursorError(ValueError):
+    def __init__(self, message="Invalid cursor", *args, **kwargs):
+        super().__init__(message, *args)
+
+
+def encode_cursor(position: tuple | None) -> str | None:
+    """
+    Encode the position of the last item of a page into an opaque cursor.
+
+    Args:
+        position (tuple | None): Values of the ordering columns of the last item.
+
+    Returns:
+        str | None - The cursor for the next page, or None if there is no next page.
+    """
+
+    if position is None:
+        return None
+
+    payload = json.dumps(list(position), separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: tuple[type, ...] = (int,)) -> tuple:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): The opaque cursor received from the client.
+        types (tuple): The types of the ordering columns of the listing: int for an id,
+            which has to fit in 64 bits, and float for a score, which has to be finite.
+
+    Returns:
+        tuple - Values of the ordering columns of the last item of the previous page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or belongs to another listing.
+    """
+
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError()
+
+    if not isinstance(position, list):
+        raise InvalidCursorError()
+
+    if len(position) != len(types):
+        raise InvalidCursorError("The cursor belongs to another listing.")
+
+    return tuple(_decode_cursor_value(value, value_type) for value, value_type in zip(position, types))
+
+
+def _decode_cursor_value(value: Any, value_type: type) -> int | float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise InvalidCursorError()
+
+    if value_type is int:
+        if not isinstance(value, int) or not -MAX_CURSOR_ID - 1 <= value <= MAX_CURSOR_ID:
+            raise InvalidCursorError()
+
+        return value
+
+    try:
+        value = float(value)
+    except OverflowError:
+        raise InvalidCursorError()
+
+    if not math.isfinite(value):
+        raise InvalidCursorError()
+
+    return value
+
+
+def get_keyset_page(
+    queryset: QuerySet, page: PageRequestDTO, get_position: Callable[[Any], Any] = attrgetter("pk")
+) -> tuple[list, tuple | None]:
+    """
+    Fetch one page of a queryset ordered by primary key.
+
+    The page is selected with "pk > after ORDER BY pk LIMIT limit + 1", which is
+    an index range scan on the primary key regardless of how deep the page is.
+    The extra row is only used to find out whether a next page exists.
+
+    Args:
+        queryset (QuerySet): The filtered queryset to paginate, of model objects or of values_list rows.
+        page (PageRequestDTO): The requested page size and position.
+        get_position (Callable): Returns the primary key of an item, itemgetter(0) for rows that start with it.
+
+    Returns:
+        tuple - The items of the page and the position of the last one,
+        or None as the position if this is the last page.
+    """
+
+    if page.after is not None:
+        queryset = queryset.filter(pk__gt=page.after[0])
+
+    items = list(queryset.order_by("pk")[: page.limit + 1])
+
+    if len(items) <= page.limit:
+        return items, None
+
+    items = items[: page.limit]
+
+    return items, (get_position(items[-1]),)
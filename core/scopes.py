@@ -0,0 +1,77 @@
+from enum import Enum
+
+from dependency_injector import containers, providers
+
+
+class Scope(str, Enum):
+    """
+    Lifetimes of the objects provided by the containers.
+
+    FACTORY - a new object on every resolution.
+    SINGLETON - one object per process, for stateless and thread-safe objects.
+    THREAD - one object per thread, for objects that are not thread-safe.
+    REQUEST - one object per request, reset by RequestScopeMiddleware.
+    """
+
+    FACTORY = "factory"
+    SINGLETON = "singleton"
+    THREAD = "thread"
+    REQUEST = "request"
+
+
+_PROVIDER_CLASSES = {
+    Scope.FACTORY: providers.Factory,
+    Scope.SINGLETON: providers.Singleton,
+    Scope.THREAD: providers.ThreadLocalSingleton,
+    Scope.REQUEST: providers.ContextLocalSingleton,
+}
+
+_request_scoped_providers = []
+
+
+def scoped(scope: Scope | str, provides, *args, **kwargs) -> providers.Provider:
+    """
+    Create a container provider with the lifetime of the scope.
+
+    Args:
+        scope (Scope | str): The scope or its value, for example from settings.
+        provides: The class or callable that creates the object.
+        *args: Positional injections.
+        **kwargs: Keyword injections.
+
+    Returns:
+        providers.Provider - The provider to declare in a container.
+
+    Raises:
+        ValueError: If the scope is unknown.
+    """
+
+    scope = Scope(scope)
+    provider = _PROVIDER_CLASSES[scope](provides, *args, **kwargs)
+
+    if scope is Scope.REQUEST:
+        _request_scoped_providers.append(provider)
+
+    return provider
+
+
+def reset_request_scope() -> None:
+    """Drop the request-scoped objects of the current request."""
+
+    for provider in _request_scoped_providers:
+        provider.reset()
+
+
+def reset_singletons(*container_classes: type[containers.DeclarativeContainer]) -> None:
+    """
+    Drop every scoped object of the containers, so the next resolution builds it again.
+
+    Needed after overriding a provider that singletons were already built with.
+
+    Args:
+        *container_classes: The containers to reset.
+    """
+
+    for container_class in container_classes:
+        for provider in container_class.traverse(types=[providers.BaseSingleton]):
+            provider.reset()
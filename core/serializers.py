@@ -1,5 +1,8 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from .pagination import InvalidCursorError, decode_cursor
+
 
 class ResponseWithErrorSerializer(serializers.Serializer):
     """
@@ -21,3 +24,74 @@ class ValidationErrorResponseSerializer(serializers.Serializer):
     """
 
     field_name = serializers.ListField()
+
+
+class PageQuerySerializer(serializers.Serializer):
+    """
+    Serializer for validating keyset pagination query parameters.
+    Fields:
+    - limit (int): The maximum number of items on the page.
+    - after (str): The cursor returned as "next" by the previous page.
+    """
+
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.PAGINATION_MAX_LIMIT,
+        default=settings.PAGINATION_DEFAULT_LIMIT,
+        help_text="The maximum number of items on the page.",
+    )
+    after = serializers.CharField(required=False, help_text="The 'next' cursor returned by the previous page.")
+
+    def get_cursor_types(self, attrs: dict) -> tuple[type, ...]:
+        """Return the types of the ordering columns of the listing, the id by default."""
+
+        return (int,)
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+
+        if "after" in attrs:
+            try:
+                attrs["after"] = decode_cursor(attrs["after"], self.get_cursor_types(attrs))
+            except InvalidCursorError as exception:
+                raise serializers.ValidationError({"after": [str(exception)]})
+
+        return attrs
+
+
+class SparseFieldsField(serializers.CharField):
+    """
+    Query parameter field with a comma-separated list of field names.
+    The names are validated against the choices and returned as a tuple, in the given order.
+    """
+
+    def __init__(self, choices, **kwargs):
+        self.choices = tuple(choices)
+        kwargs.setdefault("help_text", f"Comma-separated fields to return, from: {', '.join(self.choices)}.")
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        fields = tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+        unknown_fields = [name for name in fields if name not in self.choices]
+
+        if not fields or unknown_fields:
+            raise serializers.ValidationError(
+                f"Unknown fields: {', '.join(unknown_fields)}. Choose from: {', '.join(self.choices)}."
+            )
+
+        return fields
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Serializer mixin that leaves out the fields not listed in the fields keyword argument.
+    Used to render the fields requested with SparseFieldsField.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
@@ -50,6 +50,7 @@ INSTALLED_APPS = [
     # apps
     'persons',
     'teams',
+    'oauth',
 ]
 
 MIDDLEWARE = [
@@ -60,6 +61,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.RequestScopeMiddleware',
+    'core.middleware.ReadYourWritesMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -86,17 +89,78 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# With DB_POOL_MAX_SIZE > 0 connections are kept in an in-process pool
+# (core.db.backends.postgresql_pool) and returned to it at the end of every
+# request; otherwise each thread keeps its connection for DB_CONN_MAX_AGE seconds.
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 0))
+
 DATABASES = {
     'default': {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "core.db.backends.postgresql_pool" if DB_POOL_MAX_SIZE else "django.db.backends.postgresql",
         "NAME": os.environ.get("POSTGRES_DB"),
         "USER": os.environ.get("POSTGRES_USER"),
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": os.environ.get("POSTGRES_HOST"),
         "PORT": os.environ.get("POSTGRES_DB_PORT"),
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 0 if DB_POOL_MAX_SIZE else 60)),
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "true").lower() == "true",
+        "POOL": {
+            "MAX_SIZE": DB_POOL_MAX_SIZE,
+            "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        },
     }
 }
 
+# Read replicas, as a comma-separated list of host[:port]. They share the
+# credentials and the database name of the primary. GET requests read from a
+# replica, writes go to the primary (core.db.routers.PrimaryReplicaRouter).
+REPLICA_DATABASES = []
+
+for index, replica in enumerate(filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(","))):
+    host, _, port = replica.strip().partition(":")
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["core.db.routers.PrimaryReplicaRouter"]
+
+# Seconds a client keeps reading from the primary after a write, so it sees
+# its own writes while the replicas catch up.
+READ_YOUR_WRITES_SECONDS = int(os.environ.get("READ_YOUR_WRITES_SECONDS", 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+# Person and team details are cached, and a write invalidates them by bumping a
+# version in the cache. Only a cache shared by all workers (not LocMemCache)
+# lets the other workers see that version; with a per-process cache they would
+# serve stale details under a fresh ETag. So outside DEBUG the repository cache
+# is off with LocMemCache, unless REPOSITORY_CACHE_ENABLED is set, for example
+# for a deployment with a single process.
+REPOSITORY_CACHE = {
+    "ALIAS": os.environ.get("REPOSITORY_CACHE_ALIAS", "default"),
+    "TIMEOUT": int(os.environ.get("REPOSITORY_CACHE_TIMEOUT", 60)),
+    "LOCK_TIMEOUT": int(os.environ.get("REPOSITORY_CACHE_LOCK_TIMEOUT", 10)),
+    "WAIT_TIMEOUT": float(os.environ.get("REPOSITORY_CACHE_WAIT_TIMEOUT", 2)),
+}
+REPOSITORY_CACHE["ENABLED"] = (
+    os.environ.get("REPOSITORY_CACHE_ENABLED")
+    or str(DEBUG or CACHES[REPOSITORY_CACHE["ALIAS"]]["BACKEND"] != "django.core.cache.backends.locmem.LocMemCache")
+).lower() == "true"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -144,6 +208,53 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
 }
 
+# Encode and decode JSON with orjson, when it is installed, and keep the browsable API to DEBUG.
+if os.environ.get("FAST_JSON", "false").lower() == "true":
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = ("core.renderers.FastJSONRenderer",) + (
+        ("rest_framework.renderers.BrowsableAPIRenderer",) if DEBUG else ()
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
+PAGINATION_DEFAULT_LIMIT = int(os.environ.get("PAGINATION_DEFAULT_LIMIT", 100))
+PAGINATION_MAX_LIMIT = int(os.environ.get("PAGINATION_MAX_LIMIT", 1000))
+
+# Lifetime of the objects built by core.containers: "singleton", "thread", "request" or "factory".
+CONTAINER_SCOPES = {
+    "REPOSITORIES": os.environ.get("CONTAINER_REPOSITORY_SCOPE", "singleton"),
+    "SERVICES": os.environ.get("CONTAINER_SERVICE_SCOPE", "singleton"),
+}
+
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 2000))
+
+PERSON_BULK_CREATE_BATCH_SIZE = int(os.environ.get("PERSON_BULK_CREATE_BATCH_SIZE", 1000))
+PERSON_BULK_CREATE_MAX_ROWS = int(os.environ.get("PERSON_BULK_CREATE_MAX_ROWS", 50000))
+TEAM_MEMBERS_BULK_MAX_IDS = int(os.environ.get("TEAM_MEMBERS_BULK_MAX_IDS", 10000))
+
+OAUTH_HTTP = {
+    "CONNECT_TIMEOUT": float(os.environ.get("OAUTH_HTTP_CONNECT_TIMEOUT", 3.05)),
+    "READ_TIMEOUT": float(os.environ.get("OAUTH_HTTP_READ_TIMEOUT", 10)),
+    "RETRIES": int(os.environ.get("OAUTH_HTTP_RETRIES", 2)),
+    "BACKOFF_FACTOR": float(os.environ.get("OAUTH_HTTP_BACKOFF_FACTOR", 0.3)),
+    "POOL_MAXSIZE": int(os.environ.get("OAUTH_HTTP_POOL_MAXSIZE", 10)),
+    # One async worker runs many logins at once, so its pool is larger.
+    "ASYNC_POOL_MAXSIZE": int(os.environ.get("OAUTH_HTTP_ASYNC_POOL_MAXSIZE", 100)),
+}
+
+# Deduplication of logins with the same authorization code. A cache shared by
+# all workers (not LocMemCache) is needed to coalesce them across processes.
+OAUTH_LOGIN_CACHE = {
+    "ALIAS": os.environ.get("OAUTH_LOGIN_CACHE_ALIAS", "default"),
+    "TIMEOUT": int(os.environ.get("OAUTH_LOGIN_CACHE_TIMEOUT", 10)),
+    # Concurrent logins wait for the provider round trip of the first one, so
+    # the wait covers the OAuth HTTP timeouts.
+    "LOCK_TIMEOUT": int(os.environ.get("OAUTH_LOGIN_CACHE_LOCK_TIMEOUT", 30)),
+    "WAIT_TIMEOUT": float(os.environ.get("OAUTH_LOGIN_CACHE_WAIT_TIMEOUT", 15)),
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Test Task Wht.Agency",
     "VERSION": "1.0.0",
@@ -0,0 +1,392 @@
+import asyncio
+import contextvars
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+
+from .cache import VersionedCache
+from .db.pool import ConnectionPool, PoolTimeout
+from .db.routers import PrimaryReplicaRouter, reset_routing
+from .dto import dtos_from_rows, get_field_names
+from .dto_serializers import compile_dto_serializer
+from .middleware import ReadYourWritesMiddleware, RequestScopeMiddleware
+from .pagination import InvalidCursorError, decode_cursor, encode_cursor
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .scopes import scoped
+
+
+class VersionedCacheTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.cache = VersionedCache(namespace="test", timeout=60, wait_timeout=1, poll_interval=0.01)
+
+    def test_get_or_set_computes_once(self):
+        calls = []
+
+        for _ in range(3):
+            value = self.cache.get_or_set("key", lambda: calls.append(1) or "value")
+
+        self.assertEqual(value, "value")
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidate(self):
+        self.cache.get_or_set("key", lambda: "old")
+
+        self.cache.invalidate()
+
+        self.assertEqual(self.cache.get_or_set("key", lambda: "new"), "new")
+
+    def test_exceptions_are_not_cached(self):
+        def fail():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            self.cache.get_or_set("key", fail)
+
+        self.assertEqual(self.cache.get_or_set("key", lambda: "value"), "value")
+
+    def test_concurrent_misses_are_coalesced(self):
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_compute():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return "value"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(self.cache.get_or_set("key", slow_compute)))
+        leader.start()
+        started.wait(1)
+
+        followers = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_set("key", slow_compute)))
+            for _ in range(3)
+        ]
+        for follower in followers:
+            follower.start()
+
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join()
+
+        self.assertEqual(results, ["value"] * 4)
+        self.assertEqual(len(calls), 1)
+
+    async def test_aget_or_set_coalesces_concurrent_misses(self):
+        calls = []
+
+        async def slow_compute():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return "value"
+
+        results = await asyncio.gather(*(self.cache.aget_or_set("key", slow_compute) for _ in range(4)))
+
+        self.assertEqual(results, ["value"] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            file_cache = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}}
+
+            with override_settings(CACHES=file_cache):
+                self.assertEqual(self.cache.get_or_set("key", lambda: "old"), "old")
+                self.assertEqual(self.cache.get_or_set("key", lambda: "new"), "old")
+
+                self.cache.invalidate()
+
+                self.assertEqual(self.cache.get_or_set("key", lambda: "new"), "new")
+
+
+@dataclass(frozen=True, slots=True)
+class ItemDTO:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class BoxDTO:
+    id: int
+    label: str
+    item: ItemDTO | None
+    items: tuple[ItemDTO, ...]
+
+
+class CursorTestCase(SimpleTestCase):
+
+    def test_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor((10,))), (10,))
+        self.assertEqual(decode_cursor(encode_cursor((0.5, 10)), (float, int)), (0.5, 10))
+        self.assertEqual(decode_cursor(encode_cursor((1, 10)), (float, int)), (1.0, 10))
+
+    def test_invalid_cursors(self):
+        cursors = [
+            ("not-a-cursor", (int,)),
+            (encode_cursor((2**63,)), (int,)),
+            (encode_cursor((1.5,)), (int,)),
+            (encode_cursor((True,)), (int,)),
+            (encode_cursor(("1",)), (int,)),
+            (encode_cursor((10, 20)), (int,)),
+            (encode_cursor((10,)), (float, int)),
+            (encode_cursor((float("nan"), 10)), (float, int)),
+            (encode_cursor((10**400, 10)), (float, int)),
+        ]
+
+        for cursor, types in cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursorError):
+                decode_cursor(cursor, types)
+
+
+class DTOTestCase(SimpleTestCase):
+
+    def test_dtos_from_rows(self):
+        items = dtos_from_rows(ItemDTO, [(1, "first"), (2, "second")])
+
+        self.assertEqual(get_field_names(ItemDTO), ("id", "name"))
+        self.assertEqual(items, [ItemDTO(id=1, name="first"), ItemDTO(id=2, name="second")])
+
+    def test_slotted_dtos_are_immutable(self):
+        item = ItemDTO(id=1, name="item")
+
+        self.assertFalse(hasattr(item, "__dict__"))
+        with self.assertRaises(AttributeError):
+            item.name = "other"
+
+
+class DTOSerializerTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.serialize_item = compile_dto_serializer(ItemDTO)
+        self.item = ItemDTO(id=1, name="item")
+
+    def test_nested_dtos(self):
+        serialize = compile_dto_serializer(
+            BoxDTO, nested={"item": self.serialize_item}, many={"items": self.serialize_item}
+        )
+
+        self.assertEqual(
+            serialize(BoxDTO(id=2, label="box", item=self.item, items=(self.item,))),
+            {"id": 2, "label": "box", "item": {"id": 1, "name": "item"}, "items": [{"id": 1, "name": "item"}]},
+        )
+        self.assertIsNone(serialize(BoxDTO(id=2, label="box", item=None, items=()))["item"])
+
+    def test_fields_keep_dataclass_order(self):
+        serialize = compile_dto_serializer(BoxDTO, fields=("label", "id"))
+
+        self.assertEqual(list(serialize(BoxDTO(id=2, label="box", item=None, items=()))), ["id", "label"])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            compile_dto_serializer(ItemDTO, fields=("id", "label"))
+
+
+class FastJSONTestCase(SimpleTestCase):
+
+    data = {
+        "name": "Команда\u2028",
+        "members": (1, 2),
+        "score": Decimal("1.5"),
+        "created_at": datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        "error": ErrorDetail("Invalid value.", code="invalid"),
+    }
+
+    def test_renders_like_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indent_falls_back_to_json_renderer(self):
+        rendered = FastJSONRenderer().render(self.data, "application/json; indent=2")
+
+        self.assertEqual(rendered, JSONRenderer().render(self.data, "application/json; indent=2"))
+
+    def test_renders_without_orjson(self):
+        with mock.patch("core.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_parse(self):
+        parsed = FastJSONParser().parse(BytesIO('{"name": "Команда", "ids": [1, 2]}'.encode()))
+
+        self.assertEqual(parsed, {"name": "Команда", "ids": [1, 2]})
+
+    def test_parse_error(self):
+        for body in [b'{"name": ', b'{"score": NaN}']:
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                FastJSONParser().parse(BytesIO(body))
+
+    def test_parse_without_orjson(self):
+        with mock.patch("core.parsers.orjson", None):
+            self.assertEqual(FastJSONParser().parse(BytesIO(b'{"id": 1}')), {"id": 1})
+
+
+class ScopesTestCase(SimpleTestCase):
+
+    def test_singleton_scope(self):
+        provider = scoped("singleton", object)
+
+        self.assertIs(provider(), provider())
+
+    def test_factory_scope(self):
+        provider = scoped("factory", object)
+
+        self.assertIsNot(provider(), provider())
+
+    def test_thread_scope(self):
+        provider = scoped("thread", object)
+        instances = []
+
+        thread = threading.Thread(target=lambda: instances.append(provider()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(provider(), provider())
+        self.assertIsNot(instances[0], provider())
+
+    def test_request_scope_is_reset_by_middleware(self):
+        provider = scoped("request", object)
+        instances = []
+
+        def view(request):
+            instances.extend([provider(), provider()])
+            return HttpResponse()
+
+        middleware = RequestScopeMiddleware(view)
+        middleware(RequestFactory().get("/"))
+        middleware(RequestFactory().get("/"))
+
+        self.assertIs(instances[0], instances[1])
+        self.assertIsNot(instances[1], instances[2])
+
+    def test_unknown_scope(self):
+        with self.assertRaises(ValueError):
+            scoped("session", object)
+
+
+@override_settings(REPLICA_DATABASES=["replica_0", "replica_1"], READ_YOUR_WRITES_SECONDS=5)
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        # Routing state lives in context variables, keep it out of the other tests.
+        self.context = contextvars.copy_context()
+        self.context.run(reset_routing)
+
+    def get_read_databases(self, method="GET", cookies=None, write=False):
+        databases = []
+
+        def view(request):
+            databases.append(self.router.db_for_read(None))
+            if write:
+                self.router.db_for_write(None)
+            databases.append(self.router.db_for_read(None))
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method.lower())("/")
+        request.COOKIES.update(cookies or {})
+        response = self.context.run(ReadYourWritesMiddleware(view), request)
+
+        return databases, response
+
+    def test_reads_stick_to_one_replica(self):
+        databases = self.context.run(lambda: [self.router.db_for_read(None) for _ in range(20)])
+
+        self.assertIn(databases[0], ["replica_0", "replica_1"])
+        self.assertEqual(set(databases), {databases[0]})
+
+    def test_write_pins_reads_to_primary(self):
+        databases = self.context.run(
+            lambda: [self.router.db_for_read(None), self.router.db_for_write(None), self.router.db_for_read(None)]
+        )
+
+        self.assertNotEqual(databases[0], "default")
+        self.assertEqual(databases[1:], ["default", "default"])
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_without_replicas(self):
+        self.assertEqual(self.context.run(self.router.db_for_read, None), "default")
+
+    def test_safe_request_reads_from_replica(self):
+        databases, response = self.get_read_databases()
+
+        self.assertNotIn("default", databases)
+        self.assertNotIn(ReadYourWritesMiddleware.COOKIE_NAME, response.cookies)
+
+    def test_unsafe_request_reads_from_primary(self):
+        databases, _ = self.get_read_databases(method="POST")
+
+        self.assertEqual(databases, ["default", "default"])
+
+    def test_write_sets_cookie(self):
+        databases, response = self.get_read_databases(method="POST", write=True)
+
+        self.assertEqual(response.cookies[ReadYourWritesMiddleware.COOKIE_NAME]["max-age"], 5)
+
+    def test_cookie_pins_reads_to_primary(self):
+        databases, _ = self.get_read_databases(cookies={ReadYourWritesMiddleware.COOKIE_NAME: "1"})
+
+        self.assertEqual(databases, ["default", "default"])
+
+    def test_pin_does_not_leak_to_next_request(self):
+        self.get_read_databases(method="POST", write=True)
+        databases, _ = self.get_read_databases()
+
+        self.assertNotIn("default", databases)
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+
+    class Connection:
+        def __init__(self):
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+    def setUp(self):
+        self.pool = ConnectionPool(
+            max_size=2, timeout=0.1, check=lambda connection: not connection.closed
+        )
+
+    def test_released_connection_is_reused(self):
+        connection = self.pool.getconn(self.Connection)
+        self.pool.putconn(connection)
+
+        self.assertIs(self.pool.getconn(self.Connection), connection)
+
+    def test_closed_connection_is_replaced(self):
+        connection = self.pool.getconn(self.Connection)
+        self.pool.putconn(connection)
+        connection.closed = True
+
+        self.assertIsNot(self.pool.getconn(self.Connection), connection)
+
+    def test_exhausted_pool_times_out(self):
+        self.pool.getconn(self.Connection)
+        self.pool.getconn(self.Connection)
+
+        with self.assertRaises(PoolTimeout):
+            self.pool.getconn(self.Connection)
+
+    def test_failed_connect_releases_slot(self):
+        def failing_connect():
+            raise OperationalError("connection refused")
+
+        for _ in range(3):
+            with self.assertRaises(OperationalError):
+                self.pool.getconn(failing_connect)
+
+        self.assertIsNotNone(self.pool.getconn(self.Connection))
@@ -1,19 +1,19 @@
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OAuthDTO:
     code: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OAuthResponseDTO:
     email: str
     first_name: str
     last_name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OAuthLoginResponseDTO:
     access_token: str
     refresh_token: str
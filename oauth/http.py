@@ -0,0 +1,207 @@
+import asyncio
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, TimeoutError as Urllib3TimeoutError
+from urllib3.util.retry import Retry
+
+from .exceptions import OAuth2Exception
+
+
+class OAuthHttpClient:
+    """
+    OAuthHttpClient is a process-wide HTTP client for the requests to OAuth providers.
+
+    It keeps a pool of keep-alive connections per provider host, so a login does
+    not repeat the TCP and TLS handshakes, bounds every request with connection
+    and read timeouts, and retries idempotent GET requests with an exponential
+    backoff. POST requests are never retried, an authorization code can only be
+    exchanged once.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        retries: int,
+        backoff_factor: float,
+        pool_maxsize: int,
+    ) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request, retried on connection errors and transient statuses.
+
+        Args:
+            url (str): The requested URL.
+            **kwargs: Keyword arguments of requests.Session.request, such as headers or params.
+
+        Returns:
+            requests.Response - The response of the provider.
+
+        Raises:
+            OAuth2Exception: If the provider did not respond in time or could not be reached.
+        """
+
+        return self._request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a POST request, without retries.
+
+        Args:
+            url (str): The requested URL.
+            **kwargs: Keyword arguments of requests.Session.request, such as headers or params.
+
+        Returns:
+            requests.Response - The response of the provider.
+
+        Raises:
+            OAuth2Exception: If the provider did not respond in time or could not be reached.
+        """
+
+        return self._request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+
+        self.session.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.RequestException as exception:
+            if self._is_timeout(exception):
+                raise OAuth2Exception("OAuth provider did not respond in time")
+            raise OAuth2Exception("OAuth provider is unavailable")
+
+    @staticmethod
+    def _is_timeout(exception: requests.RequestException) -> bool:
+        # Once the retries are exhausted requests reports a read timeout as a ConnectionError.
+        if isinstance(exception, requests.Timeout):
+            return True
+
+        reason = exception.args[0] if exception.args else None
+
+        return isinstance(reason, MaxRetryError) and isinstance(reason.reason, Urllib3TimeoutError)
+
+
+class AsyncOAuthHttpClient:
+    """
+    AsyncOAuthHttpClient is the async counterpart of OAuthHttpClient, built on httpx.
+
+    It has the same timeouts and retry policy. httpx connections belong to the
+    event loop that opened them, so the client keeps one connection pool per
+    running loop; under ASGI that is a single pool per process. A loop that only
+    lives for one call, as under WSGI, has to close its pool with aclose().
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        retries: int,
+        backoff_factor: float,
+        pool_maxsize: int,
+    ) -> None:
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._clients = weakref.WeakKeyDictionary()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a GET request, retried on transport errors and transient statuses.
+
+        Args:
+            url (str): The requested URL.
+            **kwargs: Keyword arguments of httpx.AsyncClient.request, such as headers or params.
+
+        Returns:
+            httpx.Response - The response of the provider.
+
+        Raises:
+            OAuth2Exception: If the provider did not respond in time or could not be reached.
+        """
+
+        for attempt in range(self.retries + 1):
+            is_last_attempt = attempt == self.retries
+
+            try:
+                response = await self._request("GET", url, **kwargs)
+            except OAuth2Exception:
+                if is_last_attempt:
+                    raise
+            else:
+                if is_last_attempt or response.status_code not in OAuthHttpClient.RETRY_STATUSES:
+                    return response
+
+            await asyncio.sleep(self.backoff_factor * 2**attempt)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a POST request, without retries.
+
+        Args:
+            url (str): The requested URL.
+            **kwargs: Keyword arguments of httpx.AsyncClient.request, such as headers or params.
+
+        Returns:
+            httpx.Response - The response of the provider.
+
+        Raises:
+            OAuth2Exception: If the provider did not respond in time or could not be reached.
+        """
+
+        return await self._request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the connection pool of the running event loop."""
+
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+
+        if client is not None:
+            await client.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                # Retries are left to get(), so a POST is never sent twice.
+                transport=httpx.AsyncHTTPTransport(limits=self.limits, retries=0),
+            )
+            self._clients[loop] = client
+
+        return client
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        try:
+            return await self._get_client().request(method, url, **kwargs)
+        except httpx.TimeoutException:
+            raise OAuth2Exception("OAuth provider did not respond in time")
+        except httpx.HTTPError:
+            raise OAuth2Exception("OAuth provider is unavailable")
@@ -17,6 +17,18 @@ class OAuthRepositoryInterfaces(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    async def aget_or_create_oauth_user(self, user_dto: OAuthResponseDTO):
+        """
+        Asynchronous version of get_or_create_oauth_user.
+
+        Args:
+           user_dto(OAuthResponseDTO): OAuth user info.
+        Returns:
+            User - user object.
+        """
+        pass
+
 
 class ProviderInterface(metaclass=ABCMeta):
     @abstractmethod
@@ -50,3 +62,38 @@ class ProviderInterface(metaclass=ABCMeta):
             str - The redirect URL for the OAuth2 authentication.
         """
         pass
+
+
+class AsyncProviderInterface(metaclass=ABCMeta):
+    @abstractmethod
+    async def get_access_token(self, auth_dto: OAuthDTO) -> str:
+        """
+        Method accepts authorization code from the provider, makes a request to the provider,
+        keeps the access token for get_user_info and returns it
+
+        Args:
+            auth_dto(OAuthDTO): Provider's authorization code.
+        Returns:
+              access_token
+        """
+        pass
+
+    @abstractmethod
+    async def get_user_info(self) -> OAuthResponseDTO:
+        """
+        Method uses the access token from get_access_token, makes a request to the provider and returns user_info
+
+        Returns:
+              OAuthResponseDTO: email, first and last name of the user from the provider
+        """
+        pass
+
+    @abstractmethod
+    def get_redirect_url(self) -> str:
+        """
+        Get the redirect URL for the OAuth2 authentication flow.
+
+        Returns:
+            str - The redirect URL for the OAuth2 authentication.
+        """
+        pass
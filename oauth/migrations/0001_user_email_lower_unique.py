@@ -0,0 +1,58 @@
+from django.core.management.base import CommandError
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Stop the migration if emails of users differ only in case, which the unique index would reject.
+
+    The users are listed instead of merged: each of them can own tokens, groups
+    and permissions, so which account to keep is left to the administrator.
+    Giving the others a distinct email, or none, lets the migration run.
+    """
+
+    users = (
+        apps.get_model("auth", "User")
+        .objects.using(schema_editor.connection.alias)
+        .exclude(email="")
+        .annotate(email_lower=Lower("email"))
+    )
+    duplicate_emails = users.values("email_lower").annotate(count=Count("id")).filter(count__gt=1)
+    rows = (
+        users.filter(email_lower__in=duplicate_emails.values("email_lower"))
+        .order_by("email_lower", "id")
+        .values_list("email_lower", "id")
+    )
+    duplicates = {}
+
+    for email, user_id in rows:
+        duplicates.setdefault(email, []).append(str(user_id))
+
+    if duplicates:
+        raise CommandError(
+            "Emails of these users differ only in case, give each of them a distinct email or none: "
+            + "; ".join(f"{email} (ids {', '.join(user_ids)})" for email, user_ids in duplicates.items())
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Make user emails unique regardless of case.
+
+    The index is created on the table of django.contrib.auth, so it is plain SQL.
+    Users without an email are left out of it.
+    """
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX oauth_user_email_lower_uniq ON auth_user (LOWER(email)) WHERE email <> ''",
+            reverse_sql="DROP INDEX IF EXISTS oauth_user_email_lower_uniq",
+        ),
+    ]
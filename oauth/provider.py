@@ -1,11 +1,11 @@
 import os
 from urllib import parse
-import requests
 from typing import Type
 
 from .dto import OAuthDTO, OAuthResponseDTO
 from .exceptions import OAuth2Exception
-from .interfaces import ProviderInterface
+from .http import AsyncOAuthHttpClient, OAuthHttpClient
+from .interfaces import AsyncProviderInterface, ProviderInterface
 
 
 class BaseOAuth2Provider(ProviderInterface):
@@ -15,25 +15,70 @@ class BaseOAuth2Provider(ProviderInterface):
     CLIENT_ID = None
     CLIENT_SECRET = None
     REDIRECT_URI = os.environ.get("REDIRECT_URI")
+    ACCESS_TOKEN_HEADERS = {"Accept": "application/json", "Content-Type": "application/x-www-form-urlencoded"}
 
-    def __init__(self, auth_dto: OAuthDTO) -> None:
+    def __init__(self, auth_dto: OAuthDTO, http_client: OAuthHttpClient) -> None:
+        self.http_client = http_client
         self.access_token = self.get_access_token(auth_dto)
 
     def get_access_token(self, auth_dto: OAuthDTO) -> str:
-        code = self._get_decode_code(auth_dto)
-
-        headers = {"Accept": "application/json", "Content-Type": "application/x-www-form-urlencoded"}
-        params = {
-            "code": code,
-            "client_id": self.CLIENT_ID,
-            "client_secret": self.CLIENT_SECRET,
-            "redirect_uri": self.REDIRECT_URI,
+        params = self._get_access_token_params(auth_dto)
+
+        response = self.http_client.post(self.GET_ACCESS_TOKEN_URL, params=params, headers=self.ACCESS_TOKEN_HEADERS)
+
+        return self._parse_access_token(response)
+
+    def get_user_info(self) -> OAuthResponseDTO:
+        """
+        Method accepts get_access_token, makes a request to the provider and returns user_info
+
+        Returns:
+              OAuthResponseDTO: email, first and last name of the user from the provider
+        """
+
+        response = self.http_client.get(self.get_user_info_url(), headers=self._get_user_info_headers(self.access_token))
+
+        return self._parse_user_info(response)
+
+    @classmethod
+    def _get_access_token_params(cls, auth_dto: OAuthDTO) -> dict:
+        """
+        Build the query parameters of the authorization code exchange.
+
+        Args:
+            auth_dto (OAuthDTO): An instance of the OAuthDTO object.
+
+        Returns:
+            dict - The query parameters of the access token request.
+
+        Raises:
+            OAuth2Exception: If an error occurs during the decoding operation.
+        """
+
+        return {
+            "code": cls._get_decode_code(auth_dto),
+            "client_id": cls.CLIENT_ID,
+            "client_secret": cls.CLIENT_SECRET,
+            "redirect_uri": cls.REDIRECT_URI,
             "grant_type": "authorization_code",
         }
 
-        response = requests.post(self.GET_ACCESS_TOKEN_URL, params=params, headers=headers)
+    @staticmethod
+    def _parse_access_token(response) -> str:
+        """
+        Get the access token from the response of the authorization code exchange.
+
+        Args:
+            response: The response of requests or httpx.
+
+        Returns:
+            str - The access token.
 
-        if not response.ok:
+        Raises:
+            OAuth2Exception: If the provider rejected the authorization code.
+        """
+
+        if response.status_code >= 400:
             raise OAuth2Exception("Invalid authorization code")
 
         response_data = response.json()
@@ -41,6 +86,10 @@ class BaseOAuth2Provider(ProviderInterface):
 
         return access_token
 
+    @staticmethod
+    def _get_user_info_headers(access_token: str) -> dict:
+        return {"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"}
+
     @staticmethod
     def _get_decode_code(auth_dto: OAuthDTO) -> str:
         """
@@ -61,7 +110,12 @@ class BaseOAuth2Provider(ProviderInterface):
             return code
         raise OAuth2Exception("Error in decoder operation")
 
-    def get_user_info(self):
+    @classmethod
+    def get_user_info_url(cls) -> str:
+        pass
+
+    @staticmethod
+    def _parse_user_info(response) -> OAuthResponseDTO:
         pass
 
     @classmethod
@@ -80,19 +134,23 @@ class GoogleOAuth2Provider(BaseOAuth2Provider):
     GET_ACCESS_TOKEN_URL = "https://www.googleapis.com/oauth2/v3/token"
     GET_USER_EMAIL_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
 
-    def get_user_info(self) -> OAuthResponseDTO:
-        """
-        Method accepts get_access_token, makes a request to google and returns user_info
+    @classmethod
+    def get_user_info_url(cls) -> str:
+        return cls.GET_USER_EMAIL_URL
 
-        Returns:
-              OAuthResponseDTO: email and id(to create password) from Google
+    @staticmethod
+    def _parse_user_info(response) -> OAuthResponseDTO:
         """
+        Get the user info from the response of the Google userinfo endpoint.
 
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {self.access_token}"}
+        Args:
+            response: The response of requests or httpx.
 
-        response = requests.post(self.GET_USER_EMAIL_URL, headers=headers)
+        Returns:
+              OAuthResponseDTO: email, first and last name of the user from Google
+        """
 
-        if not response.ok:
+        if response.status_code >= 400:
             raise OAuth2Exception("Failed to get user info")
 
         response_data = response.json()
@@ -143,19 +201,23 @@ class FacebookOAuth2Provider(BaseOAuth2Provider):
             f"https://www.facebook.com/v18.0/dialog/oauth?client_id={cls.CLIENT_ID}" f"&redirect_uri={cls.REDIRECT_URI}"
         )
 
-    def get_user_info(self):
-        """
-        Method accepts get_access_token, makes a request to google and returns user_info
+    @classmethod
+    def get_user_info_url(cls) -> str:
+        return cls.GET_USER_DATA_URL
 
-        Returns:
-              OAuthResponseDTO: email and id(to create password) from Google
+    @staticmethod
+    def _parse_user_info(response) -> OAuthResponseDTO:
         """
+        Get the user info from the response of the Facebook Graph API.
 
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {self.access_token}"}
+        Args:
+            response: The response of requests or httpx.
 
-        response = requests.get(self.GET_USER_DATA_URL, headers=headers)
+        Returns:
+              OAuthResponseDTO: email, first and last name of the user from Facebook
+        """
 
-        if not response.ok:
+        if response.status_code >= 400:
             raise OAuth2Exception("Facebook API error 2")
 
         response_data = response.json()
@@ -172,7 +234,84 @@ class FacebookOAuth2Provider(BaseOAuth2Provider):
         )
 
 
+class AsyncOAuth2Provider(AsyncProviderInterface):
+    """
+    AsyncOAuth2Provider performs the requests of a provider class with an async
+    HTTP client, reusing the URLs, parameters and response parsing of the class.
+    """
+
+    def __init__(self, provider_class: Type[BaseOAuth2Provider], http_client: AsyncOAuthHttpClient) -> None:
+        self.provider_class = provider_class
+        self.http_client = http_client
+        self.access_token = None
+
+    async def get_access_token(self, auth_dto: OAuthDTO) -> str:
+        params = self.provider_class._get_access_token_params(auth_dto)
+
+        response = await self.http_client.post(
+            self.provider_class.GET_ACCESS_TOKEN_URL, params=params, headers=self.provider_class.ACCESS_TOKEN_HEADERS
+        )
+
+        self.access_token = self.provider_class._parse_access_token(response)
+
+        return self.access_token
+
+    async def get_user_info(self) -> OAuthResponseDTO:
+        response = await self.http_client.get(
+            self.provider_class.get_user_info_url(),
+            headers=self.provider_class._get_user_info_headers(self.access_token),
+        )
+
+        return self.provider_class._parse_user_info(response)
+
+    def get_redirect_url(self) -> str:
+        return self.provider_class.get_redirect_url()
+
+
 class OAuth2ProviderFactory:
+    """
+    OAuth2ProviderFactory resolves provider classes by name and creates providers
+    that send their requests through the shared OAuth HTTP client.
+    """
+
+    def __init__(self, http_client: OAuthHttpClient, async_http_client: AsyncOAuthHttpClient) -> None:
+        self.http_client = http_client
+        self.async_http_client = async_http_client
+
+    def create_provider(self, provider: str, auth_dto: OAuthDTO) -> ProviderInterface:
+        """
+        Create a provider and exchange the authorization code for an access token.
+
+        Args:
+            provider (str): The name of the provider, 'google' or 'facebook'.
+            auth_dto (OAuthDTO): The authorization code from the provider.
+
+        Returns:
+            ProviderInterface - The provider holding the access token.
+
+        Raises:
+            OAuth2Exception: If the provider is unsupported or the code exchange fails.
+        """
+
+        provider_class = self.get_provider(provider)
+
+        return provider_class(auth_dto, self.http_client)
+
+    def create_async_provider(self, provider: str) -> AsyncProviderInterface:
+        """
+        Create a provider that sends its requests through the shared async OAuth HTTP client.
+
+        Args:
+            provider (str): The name of the provider, 'google' or 'facebook'.
+
+        Returns:
+            AsyncProviderInterface - The provider, without an access token yet.
+
+        Raises:
+            OAuth2Exception: If the provider is unsupported.
+        """
+
+        return AsyncOAuth2Provider(self.get_provider(provider), self.async_http_client)
 
     @staticmethod
     def get_provider(provider: str) -> Type[ProviderInterface]:
@@ -1,8 +1,9 @@
-from annoying.functions import get_object_or_None
+import hashlib
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import make_password
-from django.db import transaction
-from django.utils.crypto import get_random_string
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
 
 from .dto import OAuthResponseDTO
 from .interfaces import OAuthRepositoryInterfaces
@@ -15,32 +16,79 @@ class GoogleAuthRepository(OAuthRepositoryInterfaces):
         Get or create a user based on data from OAuth or returns
         the necessary data to authenticate an existing user.
 
+        Emails are unique regardless of case (see the oauth migrations), so the
+        user is looked up by the lowercased email, which uses that index, and a
+        returning user costs one query. A missing user is inserted in a savepoint;
+        if a concurrent login inserted the same email first, the insert fails on
+        the unique index and that user is returned instead. A username taken by
+        another email is retried once with a suffix derived from the email, so no
+        lookups of free usernames are needed.
+
+        A new user is created with an unusable password (create_user calls
+        set_unusable_password for password=None), so no password is hashed and
+        a returning user is only read, not saved.
+
         Args:
            user_dto(OAuthResponseDTO): OAuth user info.
         Returns:
             User - user object.
         """
 
-        user = get_object_or_None(get_user_model(), email=user_dto.email)
+        email = user_dto.email.lower()
+
+        user = self._get_user_by_email(email)
+
+        if user is not None:
+            return user
 
-        if user is None:
-            with transaction.atomic():
-                user = get_user_model().objects.create_user(
-                    username=user_dto.email.split("@")[0],
-                    email=user_dto.email,
-                    is_active=True,
-                    first_name=user_dto.first_name,
-                    last_name=user_dto.last_name,
-                )
+        with transaction.atomic():
+            for username in self._get_usernames(email):
+                try:
+                    with transaction.atomic():
+                        return get_user_model().objects.create_user(
+                            username=username,
+                            email=email,
+                            password=None,
+                            is_active=True,
+                            first_name=user_dto.first_name,
+                            last_name=user_dto.last_name,
+                        )
+                except IntegrityError:
+                    user = self._get_user_by_email(email)
+
+                    if user is not None:
+                        return user
+
+        raise IntegrityError(f"Could not create a unique username for {email}")
+
+    async def aget_or_create_oauth_user(self, user_dto: OAuthResponseDTO):
+        """
+        Asynchronous version of get_or_create_oauth_user.
 
-        user.password = make_password(self.generate_password())
-        user.save()
+        The lookup and the creation run together in the thread of the sync ORM,
+        so the creation keeps its transaction.
 
-        return user
+        Args:
+           user_dto(OAuthResponseDTO): OAuth user info.
+        Returns:
+            User - user object.
+        """
+
+        return await sync_to_async(self.get_or_create_oauth_user)(user_dto)
+
+    @staticmethod
+    def _get_user_by_email(email: str):
+        return (
+            get_user_model()
+            .objects.alias(email_lower=Lower("email"))
+            .filter(email_lower=email)
+            .exclude(email="")
+            .first()
+        )
 
     @staticmethod
-    def generate_password():
-        """Generate random password for oauth user"""
-        password = get_random_string(length=12)
+    def _get_usernames(email: str) -> tuple[str, str]:
+        local_part = email.split("@")[0]
+        suffix = hashlib.sha256(email.encode()).hexdigest()[:8]
 
-        return password
+        return local_part, f"{local_part}-{suffix}"
@@ -1,6 +1,9 @@
+import hashlib
+
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .dto import OAuthDTO, OAuthLoginResponseDTO
+from core.cache import VersionedCache
+from .dto import OAuthDTO, OAuthLoginResponseDTO, OAuthResponseDTO
 from .interfaces import OAuthRepositoryInterfaces
 
 
@@ -8,11 +11,21 @@ class GoogleAuthService:
     """
     The class GoogleAuthService is a service for managing interactions
     related to authentication through the Google service
+
+    An authorization code can be exchanged only once, but clients may submit
+    the same code twice. Logins are therefore cached for a few seconds under
+    the provider and a hash of the code, and concurrent logins with the same
+    code are coalesced by the cache lock: one of them talks to the provider,
+    the others receive its result. The user info is cached under the same key,
+    so a retry after a failure past the provider does not exchange the code again.
     """
 
-    def __init__(self, oauth_provider_factory, oauth_repository: OAuthRepositoryInterfaces):
+    def __init__(
+        self, oauth_provider_factory, oauth_repository: OAuthRepositoryInterfaces, login_cache: VersionedCache
+    ):
         self.oauth_provider_factory = oauth_provider_factory
         self.oauth_repository = oauth_repository
+        self.login_cache = login_cache
 
     def get_or_create_oauth_user(self, oauth_dto: OAuthDTO, provider: str) -> OAuthLoginResponseDTO:
         """
@@ -26,14 +39,29 @@ class GoogleAuthService:
            OAuthLoginResponseDTO: A data transfer object containing user data for login.
         """
 
-        provider_class = self.oauth_provider_factory.get_provider(provider)
-        oauth_provider = provider_class(oauth_dto)
-        user_info = oauth_provider.get_user_info()
-        user = self.oauth_repository.get_or_create_oauth_user(user_info)
+        code_key = self._get_code_key(oauth_dto, provider)
 
-        refresh = RefreshToken.for_user(user)
+        return self.login_cache.get_or_set(f"login:{code_key}", lambda: self._login(oauth_dto, provider, code_key))
 
-        return OAuthLoginResponseDTO(access_token=str(refresh.access_token), refresh_token=str(refresh))
+    async def aget_or_create_oauth_user(self, oauth_dto: OAuthDTO, provider: str) -> OAuthLoginResponseDTO:
+        """
+        Asynchronous version of get_or_create_oauth_user.
+
+        The requests to the provider are awaited instead of blocking a worker,
+        so one event loop can serve many logins at the same time.
+
+        Args:
+           oauth_dto(AuthDTO): Provider's authorization code.
+
+        Returns:
+           OAuthLoginResponseDTO: A data transfer object containing user data for login.
+        """
+
+        code_key = self._get_code_key(oauth_dto, provider)
+
+        return await self.login_cache.aget_or_set(
+            f"login:{code_key}", lambda: self._alogin(oauth_dto, provider, code_key)
+        )
 
     def get_redirect_url(self, provider: str) -> str:
         """
@@ -46,3 +74,41 @@ class GoogleAuthService:
         oauth_provider = self.oauth_provider_factory.get_provider(provider)
 
         return oauth_provider.get_redirect_url()
+
+    def _login(self, oauth_dto: OAuthDTO, provider: str, code_key: str) -> OAuthLoginResponseDTO:
+        user_info = self.login_cache.get_or_set(
+            f"userinfo:{code_key}", lambda: self._get_user_info(oauth_dto, provider)
+        )
+        user = self.oauth_repository.get_or_create_oauth_user(user_info)
+
+        return self._get_tokens(user)
+
+    async def _alogin(self, oauth_dto: OAuthDTO, provider: str, code_key: str) -> OAuthLoginResponseDTO:
+        user_info = await self.login_cache.aget_or_set(
+            f"userinfo:{code_key}", lambda: self._aget_user_info(oauth_dto, provider)
+        )
+        user = await self.oauth_repository.aget_or_create_oauth_user(user_info)
+
+        return self._get_tokens(user)
+
+    def _get_user_info(self, oauth_dto: OAuthDTO, provider: str) -> OAuthResponseDTO:
+        oauth_provider = self.oauth_provider_factory.create_provider(provider, oauth_dto)
+
+        return oauth_provider.get_user_info()
+
+    async def _aget_user_info(self, oauth_dto: OAuthDTO, provider: str) -> OAuthResponseDTO:
+        oauth_provider = self.oauth_provider_factory.create_async_provider(provider)
+        await oauth_provider.get_access_token(oauth_dto)
+
+        return await oauth_provider.get_user_info()
+
+    @staticmethod
+    def _get_tokens(user) -> OAuthLoginResponseDTO:
+        refresh = RefreshToken.for_user(user)
+
+        return OAuthLoginResponseDTO(access_token=str(refresh.access_token), refresh_token=str(refresh))
+
+    @staticmethod
+    def _get_code_key(oauth_dto: OAuthDTO, provider: str) -> str:
+        # The code is a credential, so only its hash is used in cache keys.
+        return f"{provider}:{hashlib.sha256(oauth_dto.code.encode()).hexdigest()}"
@@ -1,2 +1,382 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from core.containers import ServiceContainer
+from core.scopes import reset_singletons
+from .dto import OAuthDTO, OAuthResponseDTO
+from .exceptions import OAuth2Exception
+from .http import AsyncOAuthHttpClient, OAuthHttpClient
+from .provider import GoogleOAuth2Provider
+from .repositories import GoogleAuthRepository
+
+
+class GoogleAuthRepositoryTestCase(TestCase):
+
+    def setUp(self):
+        self.repository = GoogleAuthRepository()
+        self.user_dto = OAuthResponseDTO(email="john@gmail.com", first_name="John", last_name="Doe")
+
+    def test_create_user_with_unusable_password(self):
+        user = self.repository.get_or_create_oauth_user(self.user_dto)
+
+        self.assertEqual(user.username, "john")
+        self.assertFalse(user.has_usable_password())
+
+    def test_returning_user_is_not_updated(self):
+        user = self.repository.get_or_create_oauth_user(self.user_dto)
+
+        with self.assertNumQueries(1):
+            returning_user = self.repository.get_or_create_oauth_user(self.user_dto)
+
+        self.assertEqual(returning_user.id, user.id)
+        self.assertEqual(returning_user.password, user.password)
+
+    def test_email_lookup_is_case_insensitive(self):
+        user = get_user_model().objects.create_user(username="john", email="John@Gmail.com")
+
+        with self.assertNumQueries(1):
+            returning_user = self.repository.get_or_create_oauth_user(self.user_dto)
+
+        self.assertEqual(returning_user.id, user.id)
+
+    def test_email_is_unique_regardless_of_case(self):
+        get_user_model().objects.create_user(username="john", email="john@gmail.com")
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            get_user_model().objects.create_user(username="other", email="JOHN@gmail.com")
+
+    def test_migration_reports_emails_that_differ_in_case(self):
+        migration = import_module("oauth.migrations.0001_user_email_lower_unique")
+
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX oauth_user_email_lower_uniq")
+
+        first_user = get_user_model().objects.create_user(username="john", email="john@gmail.com")
+        second_user = get_user_model().objects.create_user(username="other", email="JOHN@gmail.com")
+        get_user_model().objects.create_user(username="jane", email="jane@gmail.com")
+
+        # The SQLite schema editor can not be opened inside the transaction of the test, only its connection is used.
+        schema_editor = mock.Mock(connection=connection)
+
+        with self.assertRaisesMessage(CommandError, f"john@gmail.com (ids {first_user.id}, {second_user.id})"):
+            migration.check_duplicate_emails(apps, schema_editor)
+
+    def test_username_collision(self):
+        get_user_model().objects.create_user(username="john", email="john@yahoo.com")
+
+        user = self.repository.get_or_create_oauth_user(self.user_dto)
+
+        self.assertEqual(user.email, "john@gmail.com")
+        self.assertRegex(user.username, r"^john-[0-9a-f]{8}$")
+
+    def test_concurrently_created_user_is_returned(self):
+        user = get_user_model().objects.create_user(username="john", email="john@gmail.com")
+
+        # The first lookup misses as if the other login committed right after it.
+        with mock.patch.object(
+            GoogleAuthRepository,
+            "_get_user_by_email",
+            side_effect=[None, GoogleAuthRepository._get_user_by_email("john@gmail.com")],
+        ):
+            returning_user = self.repository.get_or_create_oauth_user(self.user_dto)
+
+        self.assertEqual(returning_user.id, user.id)
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """Answers with the next queued response of the requested path and records the client address."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self._respond()
+
+    def _respond(self):
+        self.server.requests.append((self.command, self.path.split("?")[0], self.client_address))
+        status_code, data, delay = self.server.responses[self.path.split("?")[0]].pop(0)
+        time.sleep(delay)
+        body = json.dumps(data).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent logins connect at once, a full listen backlog would delay them past the connect timeout.
+    request_queue_size = 64
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubProviderHandler)
+        self.responses = {}
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class StubProviderTestCase(TestCase):
+    """Runs a stub provider server and points GoogleOAuth2Provider at it."""
+
+    def setUp(self):
+        cache.clear()
+        # Services are singletons, rebuild them with the overridden HTTP clients.
+        reset_singletons(ServiceContainer)
+        self.addCleanup(reset_singletons, ServiceContainer)
+        self.server = StubProviderServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        patcher = mock.patch.multiple(
+            GoogleOAuth2Provider,
+            GET_ACCESS_TOKEN_URL=f"{self.server.url}/token",
+            GET_USER_EMAIL_URL=f"{self.server.url}/userinfo",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _queue_login(self):
+        self.server.responses.setdefault("/token", []).append((200, {"access_token": "token"}, 0))
+        self.server.responses.setdefault("/userinfo", []).append(
+            (200, {"email": "john@gmail.com", "given_name": "John", "family_name": "Doe"}, 0)
+        )
+
+
+class OAuthHttpClientTestCase(StubProviderTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.http_client = OAuthHttpClient(
+            connect_timeout=1, read_timeout=0.2, retries=2, backoff_factor=0, pool_maxsize=2
+        )
+        self.addCleanup(self.http_client.close)
+
+        ServiceContainer.oauth_http_client.override(self.http_client)
+        self.addCleanup(ServiceContainer.oauth_http_client.reset_override)
+
+    def test_login_reuses_connection(self):
+        self._queue_login()
+        self._queue_login()
+        oauth_service = ServiceContainer.oauth_service()
+
+        oauth_service.get_or_create_oauth_user(OAuthDTO(code="first"), "google")
+        oauth_service.get_or_create_oauth_user(OAuthDTO(code="second"), "google")
+
+        self.assertEqual([path for _, path, _ in self.server.requests], ["/token", "/userinfo"] * 2)
+        self.assertEqual(len({address for _, _, address in self.server.requests}), 1)
+
+    def test_timeout_raises_oauth_exception(self):
+        self.server.responses["/userinfo"] = [(200, {}, 1)] * 3
+
+        with self.assertRaisesMessage(OAuth2Exception, "OAuth provider did not respond in time"):
+            self.http_client.get(f"{self.server.url}/userinfo")
+
+    def test_get_is_retried(self):
+        self._queue_login()
+        self.server.responses["/userinfo"].insert(0, (503, {}, 0))
+
+        provider = GoogleOAuth2Provider(OAuthDTO(code="code"), self.http_client)
+
+        self.assertEqual(provider.get_user_info().email, "john@gmail.com")
+        self.assertEqual([path for _, path, _ in self.server.requests], ["/token", "/userinfo", "/userinfo"])
+
+    def test_post_is_not_retried(self):
+        self.server.responses["/token"] = [(503, {}, 0), (200, {"access_token": "token"}, 0)]
+
+        with self.assertRaisesMessage(OAuth2Exception, "Invalid authorization code"):
+            GoogleOAuth2Provider(OAuthDTO(code="code"), self.http_client)
+
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_unavailable_provider(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+        with self.assertRaises(OAuth2Exception):
+            self.http_client.get(f"{self.server.url}/userinfo")
+
+
+class GoogleAuthServiceTestCase(StubProviderTestCase):
+
+    def setUp(self):
+        super().setUp()
+        http_client = OAuthHttpClient(connect_timeout=1, read_timeout=1, retries=0, backoff_factor=0, pool_maxsize=10)
+        self.addCleanup(http_client.close)
+
+        ServiceContainer.oauth_http_client.override(http_client)
+        self.addCleanup(ServiceContainer.oauth_http_client.reset_override)
+
+    def test_double_submitted_code_is_exchanged_once(self):
+        self._queue_login()
+        oauth_service = ServiceContainer.oauth_service()
+
+        first_login = oauth_service.get_or_create_oauth_user(OAuthDTO(code="code"), "google")
+        second_login = oauth_service.get_or_create_oauth_user(OAuthDTO(code="code"), "google")
+
+        self.assertEqual(first_login, second_login)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_concurrent_logins_share_one_exchange(self):
+        self.server.responses["/token"] = [(200, {"access_token": "token"}, 0.3)]
+        self._queue_login()
+        oauth_service = ServiceContainer.oauth_service()
+        user = get_user_model().objects.create_user(username="john", email="john@gmail.com")
+
+        # The worker threads have their own database connections, which don't see the test transaction.
+        with mock.patch.object(GoogleAuthRepository, "get_or_create_oauth_user", return_value=user):
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                logins = list(
+                    executor.map(
+                        lambda _: oauth_service.get_or_create_oauth_user(OAuthDTO(code="code"), "google"), range(5)
+                    )
+                )
+
+        self.assertEqual(len(set(logins)), 1)
+        self.assertEqual([path for _, path, _ in self.server.requests], ["/token", "/userinfo"])
+
+    def test_user_info_is_cached_after_failure(self):
+        self._queue_login()
+        oauth_service = ServiceContainer.oauth_service()
+
+        with mock.patch.object(GoogleAuthRepository, "get_or_create_oauth_user", side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                oauth_service.get_or_create_oauth_user(OAuthDTO(code="code"), "google")
+
+        oauth_service.get_or_create_oauth_user(OAuthDTO(code="code"), "google")
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertTrue(get_user_model().objects.filter(email="john@gmail.com").exists())
+
+
+class AsyncOAuthTestCase(StubProviderTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.http_client = AsyncOAuthHttpClient(
+            connect_timeout=1, read_timeout=0.5, retries=2, backoff_factor=0, pool_maxsize=20
+        )
+
+        ServiceContainer.oauth_async_http_client.override(self.http_client)
+        self.addCleanup(ServiceContainer.oauth_async_http_client.reset_override)
+
+    async def test_login(self):
+        self._queue_login()
+
+        response = await self.async_client.post(
+            reverse("oauth2-async", args=["google"]), {"code": "code"}, content_type="application/json"
+        )
+        await self.http_client.aclose()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access_token", response.json())
+        self.assertTrue(await get_user_model().objects.filter(email="john@gmail.com").aexists())
+
+    def test_login_under_wsgi_closes_connection_pool(self):
+        self._queue_login()
+
+        response = self.client.post(
+            reverse("oauth2-async", args=["google"]), {"code": "code"}, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.http_client._clients), 0)
+
+    async def test_concurrent_logins(self):
+        for _ in range(10):
+            self.server.responses.setdefault("/token", []).append((200, {"access_token": "token"}, 0.2))
+            self.server.responses.setdefault("/userinfo", []).append(
+                (200, {"email": "john@gmail.com", "given_name": "John", "family_name": "Doe"}, 0.2)
+            )
+        oauth_service = ServiceContainer.oauth_service()
+
+        started_at = time.perf_counter()
+        tokens = await asyncio.gather(
+            *(oauth_service.aget_or_create_oauth_user(OAuthDTO(code=f"code{index}"), "google") for index in range(10))
+        )
+        elapsed = time.perf_counter() - started_at
+        await self.http_client.aclose()
+
+        self.assertEqual(len(tokens), 10)
+        # Sequential logins would take at least 10 * 0.4 seconds.
+        self.assertLess(elapsed, 2)
+
+    async def test_concurrent_logins_share_one_exchange(self):
+        self.server.responses["/token"] = [(200, {"access_token": "token"}, 0.3)]
+        self._queue_login()
+        oauth_service = ServiceContainer.oauth_service()
+
+        logins = await asyncio.gather(
+            *(oauth_service.aget_or_create_oauth_user(OAuthDTO(code="code"), "google") for _ in range(5))
+        )
+        await self.http_client.aclose()
+
+        self.assertEqual(len(set(logins)), 1)
+        self.assertEqual(len(self.server.requests), 2)
+
+    async def test_get_is_retried(self):
+        self.server.responses["/userinfo"] = [(503, {}, 0), (200, {}, 0)]
+
+        response = await self.http_client.get(f"{self.server.url}/userinfo")
+        await self.http_client.aclose()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 2)
+
+    async def test_post_is_not_retried(self):
+        self.server.responses["/token"] = [(503, {}, 0), (200, {"access_token": "token"}, 0)]
+
+        with mock.patch("httpx.AsyncHTTPTransport", wraps=httpx.AsyncHTTPTransport) as transport:
+            response = await self.http_client.post(f"{self.server.url}/token")
+        await self.http_client.aclose()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), 1)
+        # Nor are connection errors retried by the transport.
+        self.assertEqual(transport.call_args.kwargs["retries"], 0)
+
+    async def test_timeout_raises_oauth_exception(self):
+        self.server.responses["/userinfo"] = [(200, {}, 1)] * 3
+
+        with self.assertRaisesMessage(OAuth2Exception, "OAuth provider did not respond in time"):
+            await self.http_client.get(f"{self.server.url}/userinfo")
+        await self.http_client.aclose()
+
+    async def test_invalid_code(self):
+        self.server.responses["/token"] = [(400, {}, 0)]
+
+        response = await self.async_client.post(
+            reverse("oauth2-async", args=["google"]), {"code": "code"}, content_type="application/json"
+        )
+        await self.http_client.aclose()
+
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.json(), {"error": "Invalid authorization code"})
@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import OAuthView
+from .views import AsyncOAuthView, OAuthView
 
 urlpatterns = [
     path("<str:provider>/", OAuthView.as_view(), name="oauth2"),
+    path("<str:provider>/async/", AsyncOAuthView.as_view(), name="oauth2-async"),
 ]
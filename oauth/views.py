@@ -1,3 +1,8 @@
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse
+from django.views import View
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import status
@@ -92,3 +97,56 @@ class OAuthView(APIView):
         tokens_serializer = OAuth2ResponseSerializer(user)
 
         return Response(tokens_serializer.data)
+
+
+class AsyncOAuthView(View):
+    """
+    The class defines an async API endpoint for authenticating a user through a Google or Facebook service.
+
+    It accepts the same request and returns the same response as OAuthView.post, but
+    awaits the requests to the provider, so under ASGI a worker is not blocked while
+    a login waits for the provider. It is a plain Django view because DRF views are
+    synchronous. Under WSGI Django runs it on a new event loop for every request,
+    so the connection pool of that loop is closed at the end of the request.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+
+        return view
+
+    async def post(self, request, provider: str):
+        """
+        POST method processes "code" from provider, gets user data,
+        get or create the user and gives authorization tokens
+        """
+
+        try:
+            return await self._login(request, provider)
+        finally:
+            if not isinstance(request, ASGIRequest):
+                await ServiceContainer.oauth_async_http_client().aclose()
+
+    async def _login(self, request, provider: str) -> JsonResponse:
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON"}, status=status.HTTP_400_BAD_REQUEST)
+
+        oauth_serializer = OAuth2Serializer(data=data)
+        if not oauth_serializer.is_valid():
+            return JsonResponse(oauth_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        auth_dto = OAuthDTO(**oauth_serializer.validated_data)
+
+        oauth_service = ServiceContainer.oauth_service()
+        try:
+            user = await oauth_service.aget_or_create_oauth_user(auth_dto, provider)
+        except OAuth2Exception as exception:
+            return JsonResponse({"error": exception.message}, status=status.HTTP_504_GATEWAY_TIMEOUT)
+
+        tokens_serializer = OAuth2ResponseSerializer(user)
+
+        return JsonResponse(tokens_serializer.data)
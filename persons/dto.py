@@ -1,19 +1,19 @@
 from dataclasses import dataclass
 
-from teams.dto import TeamDTO
+from teams.dto import TeamDTO, TeamSummaryDTO
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NewPersonDTO:
     first_name: str
     last_name: str
     email: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PersonDTO:
     id: int
     first_name: str
     last_name: str
     email: str
-    team: TeamDTO
+    team: TeamDTO | TeamSummaryDTO | None
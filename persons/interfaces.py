@@ -1,5 +1,7 @@
 from abc import ABCMeta, abstractmethod
+from collections.abc import Iterator
 
+from core.dto import FieldsDTO, PageDTO, PageRequestDTO, ResourceVersionDTO
 from .dto import NewPersonDTO, PersonDTO
 
 
@@ -28,16 +30,50 @@ class PersonRepositoryInterface(metaclass=ABCMeta):
         Returns:
             PersonDTO - A data transfer object containing the person information.
 
+        Raises:
+            InstanceAlreadyExistsError: If a person with this email already exists.
+        """
+        pass
+
+    @abstractmethod
+    def create_persons(self, new_persons_dto: list[NewPersonDTO], batch_size: int) -> list[PersonDTO]:
+        """
+        Create several persons in one transaction.
+
+        Args:
+            new_persons_dto (list[NewPersonDTO]): The data model objects representing the persons.
+            batch_size (int): The maximum number of persons inserted by one query.
+
+        Returns:
+            list(PersonDTO) - Data transfer objects containing the created persons, in the given order.
+
+        Raises:
+            InstanceAlreadyExistsError: If a person with one of the emails already exists.
         """
         pass
 
     @abstractmethod
-    def get_person_by_id(self, person_id: int) -> PersonDTO:
+    def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """
+        Find which of the given emails already belong to a person, ignoring case.
+
+        Args:
+            emails (list[str]): The emails to look up.
+
+        Returns:
+            set(str) - The lowercased emails that already belong to a person.
+        """
+        pass
+
+    @abstractmethod
+    def get_person_by_id(self, person_id: int, fields_dto: FieldsDTO = FieldsDTO()) -> PersonDTO:
         """
         Retrieve information about a person using its unique identifier.
 
         Args:
             person_id (int): The unique identifier of the person.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+                By default the team is returned without its members.
 
         Returns:
             PersonDTO - A data transfer object containing the person information.
@@ -47,6 +83,22 @@ class PersonRepositoryInterface(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def get_person_version(self, person_id: int) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of a person using its unique identifier.
+
+        Args:
+            person_id (int): The unique identifier of the person.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the person.
+
+        Raises:
+            InstanceDoesNotExistError: If no person with this id is found.
+        """
+        pass
+
     @abstractmethod
     def update_person(self, person_id: int, person_dto: NewPersonDTO) -> PersonDTO:
         """
@@ -61,6 +113,7 @@ class PersonRepositoryInterface(metaclass=ABCMeta):
 
         Raises:
             InstanceDoesNotExistError: If no person with this id is found.
+            InstanceAlreadyExistsError: If another person with this email already exists.
         """
         pass
 
@@ -93,6 +146,73 @@ class PersonRepositoryInterface(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def get_persons_page(
+        self, page: PageRequestDTO, is_without_team: bool = False, fields_dto: FieldsDTO = FieldsDTO()
+    ) -> PageDTO[PersonDTO]:
+        """
+        Retrieve one page of persons ordered by id, optionally filtered by the absence of a team.
+
+        Args:
+            page (PageRequestDTO): The page size and the position after which the page starts.
+            is_without_team (bool): Whether to return only persons without a team.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+                By default the team is returned without its members.
+
+        Returns:
+            PageDTO[PersonDTO] - The persons of the page and the position of the next page.
+
+        Raises:
+            InstanceDoesNotExistError: If no persons is found on the first page.
+        """
+        pass
+
+    @abstractmethod
+    def search_persons_page(
+        self,
+        query: str,
+        page: PageRequestDTO,
+        is_without_team: bool = False,
+        fields_dto: FieldsDTO = FieldsDTO(),
+    ) -> PageDTO[PersonDTO]:
+        """
+        Search persons by first name, last name and email, best matches first.
+
+        Args:
+            query (str): The searched words, each matched as the start of a word of the person.
+            page (PageRequestDTO): The page size and the score and id of the last match of the previous page.
+            is_without_team (bool): Whether to return only persons without a team.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+
+        Returns:
+            PageDTO[PersonDTO] - The matching persons of the page, empty if nothing matches,
+            and the position of the next page.
+        """
+        pass
+
+    @abstractmethod
+    def get_persons_version(self) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of the persons listing.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the persons listing.
+        """
+        pass
+
+    @abstractmethod
+    def iter_persons(self, chunk_size: int) -> Iterator[dict]:
+        """
+        Iterate over all persons ordered by id without loading them into memory at once.
+
+        Args:
+            chunk_size (int): The number of rows fetched from the database at a time.
+
+        Returns:
+            Iterator[dict] - Rows with the id, first_name, last_name, email and team_id of each person.
+        """
+        pass
+
     @abstractmethod
     def leave_team(self, person_id: id) -> PersonDTO:
         """
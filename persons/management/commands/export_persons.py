@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.containers import ServiceContainer
+from core.ndjson import iter_ndjson
+
+
+class Command(BaseCommand):
+    help = "Export all persons as NDJSON, one person per line."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", help="File to write to. Defaults to stdout.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help="The number of rows fetched from the database at a time.",
+        )
+
+    def handle(self, *args, **options):
+        person_service = ServiceContainer.person_service()
+
+        persons = person_service.export_persons(options["chunk_size"])
+
+        if options["output"] is None:
+            for chunk in iter_ndjson(persons):
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8") as output:
+            output.writelines(iter_ndjson(persons))
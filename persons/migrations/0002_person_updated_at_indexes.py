@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:43
+
+from django.core.management.base import CommandError
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+import django.db.models.functions.text
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Stop the migration if persons share an email regardless of case, which the unique constraint would reject.
+
+    The persons are listed instead of merged, which of them to keep is left to the administrator.
+    """
+
+    persons = (
+        apps.get_model("persons", "Person")
+        .objects.using(schema_editor.connection.alias)
+        .annotate(email_lower=Lower("email"))
+    )
+    duplicate_emails = persons.values("email_lower").annotate(count=Count("id")).filter(count__gt=1)
+    rows = (
+        persons.filter(email_lower__in=duplicate_emails.values("email_lower"))
+        .order_by("email_lower", "id")
+        .values_list("email_lower", "id")
+    )
+    duplicates = {}
+
+    for email, person_id in rows:
+        duplicates.setdefault(email, []).append(str(person_id))
+
+    if duplicates:
+        raise CommandError(
+            "These persons share an email regardless of case, give each of them a distinct email: "
+            + "; ".join(f"{email} (ids {', '.join(person_ids)})" for email, person_ids in duplicates.items())
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='person',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(condition=models.Q(('team', None)), fields=['id'], name='person_without_team_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='person',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='person_email_lower_unique'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# The search index of PersonRepository.search_persons_page, over first name, last name and email.
+# PostgreSQL: a GIN index on the same tsvector expression the search query matches against.
+# SQLite: an FTS5 table with the content of persons_person, kept in sync by triggers. Django rebuilds
+# a SQLite table to alter it, which drops its triggers, so a later migration that alters
+# persons_person on SQLite has to create them again; test_search_index_triggers fails until it does.
+SEARCH_INDEX_SQL = {
+    "postgresql": (
+        [
+            "CREATE INDEX person_search_idx ON persons_person "
+            "USING gin (to_tsvector('simple', first_name || ' ' || last_name || ' ' || email))",
+        ],
+        [
+            "DROP INDEX IF EXISTS person_search_idx",
+        ],
+    ),
+    "sqlite": (
+        [
+            "CREATE VIRTUAL TABLE persons_person_fts USING fts5("
+            "first_name, last_name, email, content='persons_person', content_rowid='id', prefix='2 3')",
+            "CREATE TRIGGER persons_person_fts_insert AFTER INSERT ON persons_person BEGIN "
+            "INSERT INTO persons_person_fts(rowid, first_name, last_name, email) "
+            "VALUES (new.id, new.first_name, new.last_name, new.email); "
+            "END",
+            "CREATE TRIGGER persons_person_fts_delete AFTER DELETE ON persons_person BEGIN "
+            "INSERT INTO persons_person_fts(persons_person_fts, rowid, first_name, last_name, email) "
+            "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); "
+            "END",
+            "CREATE TRIGGER persons_person_fts_update AFTER UPDATE OF first_name, last_name, email "
+            "ON persons_person BEGIN "
+            "INSERT INTO persons_person_fts(persons_person_fts, rowid, first_name, last_name, email) "
+            "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); "
+            "INSERT INTO persons_person_fts(rowid, first_name, last_name, email) "
+            "VALUES (new.id, new.first_name, new.last_name, new.email); "
+            "END",
+            "INSERT INTO persons_person_fts(persons_person_fts) VALUES ('rebuild')",
+        ],
+        [
+            "DROP TRIGGER IF EXISTS persons_person_fts_update",
+            "DROP TRIGGER IF EXISTS persons_person_fts_delete",
+            "DROP TRIGGER IF EXISTS persons_person_fts_insert",
+            "DROP TABLE IF EXISTS persons_person_fts",
+        ],
+    ),
+}
+
+
+def create_search_index(apps, schema_editor):
+    statements, _ = SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    _, statements = SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0002_person_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# PostgreSQL's parser reads a whole email as one token, which no search word matches, so the search
+# index of 0003 is rebuilt over the email with "@" and "." replaced by spaces. SQLite's FTS5 tokenizer
+# already splits emails into words.
+SEARCH_INDEX_SQL = {
+    "postgresql": (
+        [
+            "DROP INDEX IF EXISTS person_search_idx",
+            "CREATE INDEX person_search_idx ON persons_person USING gin (to_tsvector('simple', "
+            "first_name || ' ' || last_name || ' ' || translate(email, '@.', '  ')))",
+        ],
+        [
+            "DROP INDEX IF EXISTS person_search_idx",
+            "CREATE INDEX person_search_idx ON persons_person "
+            "USING gin (to_tsvector('simple', first_name || ' ' || last_name || ' ' || email))",
+        ],
+    ),
+}
+
+
+def rebuild_search_index(apps, schema_editor):
+    statements, _ = SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def restore_search_index(apps, schema_editor):
+    _, statements = SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0003_person_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_search_index, restore_search_index),
+    ]
@@ -1,8 +1,61 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 from teams.models import Team
 
 
+class PersonQuerySet(models.QuerySet):
+
+    def move_to_team(self, team: Team | None) -> list[int]:
+        """
+        Move the persons to a team, or out of their teams, and keep Team.member_count in sync.
+
+        The persons are locked for the update, so concurrent moves of the same
+        person are applied one after another, each to the team the other one
+        left it in. The counts are changed with F() expressions, in the order
+        of team ids.
+
+        Args:
+            team (Team | None): The new team of the persons, None to remove them from their teams.
+
+        Returns:
+            list[int] - The ids of the persons of the queryset, ordered by id.
+        """
+
+        team_id = team.pk if team is not None else None
+
+        with transaction.atomic(using=self.db):
+            persons = list(self.select_for_update().order_by("id").values_list("id", "team_id"))
+            moved_ids = [person_id for person_id, old_team_id in persons if old_team_id != team_id]
+
+            if moved_ids:
+                self.model.objects.filter(id__in=moved_ids).update(team=team, updated_at=timezone.now())
+
+                member_counts = Counter({team_id: len(moved_ids)})
+                member_counts.subtract(old_team_id for _, old_team_id in persons if old_team_id != team_id)
+                change_member_counts(member_counts)
+
+        return [person_id for person_id, _ in persons]
+
+
+def change_member_counts(member_counts: dict[int | None, int]) -> None:
+    """
+    Add to the member_count of teams.
+
+    Args:
+        member_counts (dict[int | None, int]): The change of the count by team id.
+            The None key stands for persons without a team and is skipped.
+    """
+
+    for team_id, change in sorted((item for item in member_counts.items() if item[0] is not None)):
+        if change:
+            Team.objects.filter(id=team_id).update(member_count=F("member_count") + change)
+
+
 class Person(models.Model):
     """Model for Person object"""
 
@@ -10,3 +63,16 @@ class Person(models.Model):
     last_name = models.CharField(max_length=50)
     email = models.EmailField()
     team = models.ForeignKey(Team, on_delete=models.SET_NULL, related_name="members", null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PersonQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Listing of persons without a team, paginated by id.
+            models.Index(fields=["id"], condition=models.Q(team=None), name="person_without_team_idx"),
+        ]
+        constraints = [
+            # Also serves lookups by Lower("email").
+            models.UniqueConstraint(Lower("email"), name="person_email_lower_unique"),
+        ]
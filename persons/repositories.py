@@ -1,15 +1,57 @@
-from annoying.functions import get_object_or_None
-from django.db.models import QuerySet, Q
+import re
+from collections.abc import Iterator
+from operator import itemgetter
 
-from core.exceptions import InstanceDoesNotExistError
+from annoying.functions import get_object_or_None
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Count, Max, Q, QuerySet
+from django.db.models.functions import Lower
+
+from core.cache import VersionedCache
+from core.conditional import make_resource_version
+from core.db.routers import can_cache_reads
+from core.dto import FieldsDTO, PageDTO, PageRequestDTO, ResourceVersionDTO
+from core.exceptions import InstanceAlreadyExistsError, InstanceDoesNotExistError
+from core.pagination import get_keyset_page
+from teams.dto import TeamDTO, TeamSummaryDTO
+from teams.models import Team
+from teams.repositories import TeamRepository
 from .dto import NewPersonDTO, PersonDTO
-from .models import Person
+from .models import Person, change_member_counts
 from .interfaces import PersonRepositoryInterface
 
 
 class PersonRepository(PersonRepositoryInterface):
     """The PersonRepository class handles the retrieval of person data from the data storage."""
 
+    # Columns of the rows that PersonDTO and the teams embedded in it are built from.
+    PERSON_COLUMNS = ("id", "first_name", "last_name", "email")
+    TEAM_COLUMNS = ("team_id", "team__name", "team__member_count")
+
+    # Ranked searches over the index of migration 0003_person_search, by database vendor. Each returns
+    # the id and score of the matching persons, best first, filtered by the conditions.
+    # The expression of the person_search_idx index on PostgreSQL. Its parser reads a whole email as
+    # one token, so "@" and "." are replaced by spaces to index the words of the email.
+    SEARCH_VECTOR = "to_tsvector('simple', first_name || ' ' || last_name || ' ' || translate(email, '@.', '  '))"
+
+    SEARCH_SQL = {
+        "postgresql": (
+            "SELECT id, score FROM ("
+            f"SELECT id, team_id, ts_rank({SEARCH_VECTOR}, query)::float8 AS score "
+            "FROM persons_person, to_tsquery('simple', %s) AS query "
+            f"WHERE {SEARCH_VECTOR} @@ query"
+            ") AS matches WHERE {conditions} ORDER BY score DESC, id LIMIT %s"
+        ),
+        "sqlite": (
+            "SELECT id, score FROM ("
+            "SELECT persons_person.id AS id, persons_person.team_id AS team_id, "
+            "-bm25(persons_person_fts) AS score "
+            "FROM persons_person_fts JOIN persons_person ON persons_person.id = persons_person_fts.rowid "
+            "WHERE persons_person_fts MATCH %s"
+            ") AS matches WHERE {conditions} ORDER BY score DESC, id LIMIT %s"
+        ),
+    }
+
     def create_person(self, new_person_dto: NewPersonDTO) -> PersonDTO:
         """
         Create a new person
@@ -20,22 +62,82 @@ class PersonRepository(PersonRepositoryInterface):
         Returns:
             PersonDTO - A data transfer object containing the person information.
 
+        Raises:
+            InstanceAlreadyExistsError: If a person with this email already exists.
         """
 
-        person = Person.objects.create(
+        person = Person(
             first_name=new_person_dto.first_name,
             last_name=new_person_dto.last_name,
             email=new_person_dto.email,
         )
 
+        self._save_person(person)
+
         return self._person_to_dto(person)
 
-    def get_person_by_id(self, person_id: int) -> PersonDTO:
+    def create_persons(self, new_persons_dto: list[NewPersonDTO], batch_size: int) -> list[PersonDTO]:
+        """
+        Create several persons in one transaction.
+
+        Persons are inserted with bulk_create, batch_size rows per query.
+        If any batch fails, none of the persons are created.
+
+        Args:
+            new_persons_dto (list[NewPersonDTO]): The data model objects representing the persons.
+            batch_size (int): The maximum number of persons inserted by one query.
+
+        Returns:
+            list(PersonDTO) - Data transfer objects containing the created persons, in the given order.
+
+        Raises:
+            InstanceAlreadyExistsError: If a person with one of the emails already exists.
+        """
+
+        persons = [
+            Person(
+                first_name=new_person_dto.first_name,
+                last_name=new_person_dto.last_name,
+                email=new_person_dto.email,
+            )
+            for new_person_dto in new_persons_dto
+        ]
+
+        try:
+            with transaction.atomic():
+                persons = Person.objects.bulk_create(persons, batch_size=batch_size)
+        except IntegrityError:
+            raise InstanceAlreadyExistsError("Person with one of the emails already exists")
+
+        return [self._person_to_dto(person) for person in persons]
+
+    def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """
+        Find which of the given emails already belong to a person, ignoring case.
+
+        One query, served by the unique index on the lowercased email.
+
+        Args:
+            emails (list[str]): The emails to look up.
+
+        Returns:
+            set(str) - The lowercased emails that already belong to a person.
+        """
+
+        return set(
+            Person.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in={email.lower() for email in emails})
+            .values_list("email_lower", flat=True)
+        )
+
+    def get_person_by_id(self, person_id: int, fields_dto: FieldsDTO = FieldsDTO()) -> PersonDTO:
         """
         Retrieve information about a person using its unique identifier.
 
         Args:
             person_id (int): The unique identifier of the person.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+                By default the team is returned without its members.
 
         Returns:
             PersonDTO - A data transfer object containing the person information.
@@ -44,9 +146,41 @@ class PersonRepository(PersonRepositoryInterface):
             InstanceDoesNotExistError: If no person with this id is found.
         """
 
-        person = self._get_person(person_id)
+        rows = list(self._get_persons_rows(fields_dto=fields_dto).filter(id=person_id))
 
-        return self._person_to_dto(person)
+        if not rows:
+            raise InstanceDoesNotExistError(f"Person with id {person_id} not found")
+
+        return self._rows_to_dto(rows, fields_dto)[0]
+
+    def get_person_version(self, person_id: int) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of a person using its unique identifier.
+
+        Args:
+            person_id (int): The unique identifier of the person.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the person.
+
+        Raises:
+            InstanceDoesNotExistError: If no person with this id is found.
+        """
+
+        person = (
+            Person.objects.filter(id=person_id)
+            .annotate(
+                team_members_count=Count("team__members"),
+                team_members_last_modified=Max("team__members__updated_at"),
+            )
+            .values("updated_at", "team_id", "team__updated_at", "team_members_count", "team_members_last_modified")
+            .first()
+        )
+
+        if person is None:
+            raise InstanceDoesNotExistError(f"Person with id {person_id} not found")
+
+        return make_resource_version("person", *person.values())
 
     def update_person(self, person_id: int, person_dto: NewPersonDTO) -> PersonDTO:
         """
@@ -61,6 +195,7 @@ class PersonRepository(PersonRepositoryInterface):
 
         Raises:
             InstanceDoesNotExistError: If no person with this id is found.
+            InstanceAlreadyExistsError: If another person with this email already exists.
         """
 
         person = self._get_person(person_id)
@@ -69,7 +204,8 @@ class PersonRepository(PersonRepositoryInterface):
         person.last_name = person_dto.last_name
         person.email = person_dto.email
 
-        person.save()
+        # The team is changed by move_to_team, which keeps the member counts, so it is not written back.
+        self._save_person(person, update_fields=["first_name", "last_name", "email", "updated_at"])
 
         return self._person_to_dto(person)
 
@@ -87,9 +223,12 @@ class PersonRepository(PersonRepositoryInterface):
             InstanceDoesNotExistError: If no person with this id is found.
         """
 
-        person = self._get_person(person_id)
+        with transaction.atomic():
+            person = self._get_person(person_id, for_update=True)
+
+            person.delete()
 
-        person.delete()
+            change_member_counts({person.team_id: -1})
 
     def get_persons(self, is_without_team: bool = False) -> list[PersonDTO]:
         """
@@ -102,17 +241,191 @@ class PersonRepository(PersonRepositoryInterface):
             InstanceDoesNotExistError: If no persons is found.
         """
 
-        filter_conditions = Q()
+        fields_dto = FieldsDTO(expand=("team", "team.members"))
 
-        if is_without_team is True:
-            filter_conditions &= Q(team=None)
+        rows = list(self._get_persons_rows(is_without_team, fields_dto).order_by("id"))
 
-        persons = Person.objects.filter(filter_conditions)
+        if not rows:
+            raise InstanceDoesNotExistError("Persons not found")
+
+        return self._rows_to_dto(rows, fields_dto)
+
+    def get_persons_page(
+        self, page: PageRequestDTO, is_without_team: bool = False, fields_dto: FieldsDTO = FieldsDTO()
+    ) -> PageDTO[PersonDTO]:
+        """
+        Retrieve one page of persons ordered by id, optionally filtered by the absence of a team.
 
-        if not persons.exists():
+        Persons are read as rows, without model objects. Only the requested
+        relations are loaded: teams are joined in when the team field is
+        returned, and their members are read with a second query when the
+        team.members relation is expanded.
+
+        Args:
+            page (PageRequestDTO): The page size and the position after which the page starts.
+            is_without_team (bool): Whether to return only persons without a team.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+                By default the team is returned without its members.
+
+        Returns:
+            PageDTO[PersonDTO] - The persons of the page and the position of the next page.
+
+        Raises:
+            InstanceDoesNotExistError: If no persons is found on the first page.
+        """
+
+        rows, next_after = get_keyset_page(
+            self._get_persons_rows(is_without_team, fields_dto), page, get_position=itemgetter(0)
+        )
+
+        if not rows and page.after is None:
             raise InstanceDoesNotExistError("Persons not found")
 
-        return self._persons_to_dto(persons)
+        return PageDTO(items=self._rows_to_dto(rows, fields_dto), next_after=next_after)
+
+    def search_persons_page(
+        self,
+        query: str,
+        page: PageRequestDTO,
+        is_without_team: bool = False,
+        fields_dto: FieldsDTO = FieldsDTO(),
+    ) -> PageDTO[PersonDTO]:
+        """
+        Search persons by first name, last name and email, best matches first.
+
+        Every word of the query has to start a word of the person, so "jo do"
+        finds John Doe and "gmail" the persons with a Gmail address. Matches are
+        ranked with ts_rank on PostgreSQL and bm25 on SQLite, and paginated by
+        the score and id of the last match, so a page is read from the search
+        index without counting or skipping rows. Other database vendors have no
+        search index: there every word has to be contained in the first name,
+        last name or email, and all matches have the score 0, ordered by id.
+
+        Args:
+            query (str): The searched words.
+            page (PageRequestDTO): The page size and the score and id of the last match of the previous page.
+            is_without_team (bool): Whether to return only persons without a team.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+
+        Returns:
+            PageDTO[PersonDTO] - The matching persons of the page, empty if nothing matches,
+            and the position of the next page.
+        """
+
+        words = re.findall(r"\w+", query)
+
+        if not words:
+            return PageDTO(items=[], next_after=None)
+
+        connection = connections[Person.objects.db]
+        sql = self.SEARCH_SQL.get(connection.vendor)
+
+        if sql is None:
+            return self._search_persons_page_by_substring(words, page, is_without_team, fields_dto)
+
+        if connection.vendor == "postgresql":
+            match = " & ".join(f"{word}:*" for word in words)
+        else:
+            match = " ".join(f'"{word}"*' for word in words)
+
+        conditions = ["1 = 1"]
+        params = [match]
+
+        if page.after is not None:
+            conditions.append("(score < %s OR (score = %s AND id > %s))")
+            params.extend([page.after[0], page.after[0], page.after[1]])
+
+        if is_without_team is True:
+            conditions.append("team_id IS NULL")
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql.format(conditions=" AND ".join(conditions)), [*params, page.limit + 1])
+            matches = cursor.fetchall()
+
+        next_after = tuple(matches[page.limit - 1][::-1]) if len(matches) > page.limit else None
+        ids = [id for id, _ in matches[: page.limit]]
+
+        rows = {row[0]: row for row in self._get_persons_rows(is_without_team, fields_dto).filter(id__in=ids)}
+
+        return PageDTO(
+            items=self._rows_to_dto([rows[id] for id in ids if id in rows], fields_dto),
+            next_after=next_after,
+        )
+
+    def _search_persons_page_by_substring(
+        self, words: list[str], page: PageRequestDTO, is_without_team: bool, fields_dto: FieldsDTO
+    ) -> PageDTO[PersonDTO]:
+        """
+        Search persons with case-insensitive substring matches, for the database vendors without a search index.
+
+        Args:
+            words (list[str]): The searched words, each contained in the first name, last name or email.
+            page (PageRequestDTO): The page size and the score and id of the last match of the previous page.
+            is_without_team (bool): Whether to return only persons without a team.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+
+        Returns:
+            PageDTO[PersonDTO] - The matching persons of the page, ordered by id, and the position of the next page.
+        """
+
+        persons = self._get_persons_rows(is_without_team, fields_dto)
+
+        for word in words:
+            persons = persons.filter(
+                Q(first_name__icontains=word) | Q(last_name__icontains=word) | Q(email__icontains=word)
+            )
+
+        after = (page.after[1],) if page.after is not None else None
+        rows, next_after = get_keyset_page(
+            persons, PageRequestDTO(limit=page.limit, after=after), get_position=itemgetter(0)
+        )
+
+        return PageDTO(
+            items=self._rows_to_dto(rows, fields_dto),
+            next_after=(0.0, *next_after) if next_after is not None else None,
+        )
+
+    def get_persons_version(self) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of the persons listing.
+
+        Persons are listed with their teams and team members, so the version is
+        built from the row counts and latest modification times of both tables,
+        two aggregate queries that do not load any rows. It has no Last-Modified
+        time: the latest modification time stays the same when a row is deleted.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the persons listing.
+        """
+
+        persons = Person.objects.aggregate(count=Count("id"), last_modified=Max("updated_at"))
+        teams = Team.objects.aggregate(count=Count("id"), last_modified=Max("updated_at"))
+
+        return make_resource_version(
+            "persons",
+            persons["count"],
+            persons["last_modified"],
+            teams["count"],
+            teams["last_modified"],
+        )
+
+    def iter_persons(self, chunk_size: int) -> Iterator[dict]:
+        """
+        Iterate over all persons ordered by id without loading them into memory at once.
+
+        Rows are read with a server-side cursor where the database supports it,
+        chunk_size rows at a time, and no model objects are instantiated.
+
+        Args:
+            chunk_size (int): The number of rows fetched from the database at a time.
+
+        Returns:
+            Iterator[dict] - Rows with the id, first_name, last_name, email and team_id of each person.
+        """
+
+        persons = Person.objects.order_by("id").values("id", "first_name", "last_name", "email", "team_id")
+
+        return persons.iterator(chunk_size=chunk_size)
 
     def leave_team(self, person_id: id) -> PersonDTO:
         """
@@ -130,8 +443,9 @@ class PersonRepository(PersonRepositoryInterface):
 
         person = self._get_person(person_id)
 
+        Person.objects.filter(id=person.id).move_to_team(None)
+
         person.team = None
-        person.save()
 
         return self._person_to_dto(person)
 
@@ -144,39 +458,146 @@ class PersonRepository(PersonRepositoryInterface):
             person (Person): An instance of the Person model class.
 
         Returns:
-            PersonDTO - A data transfer object containing the person information.
+            PersonDTO - A data transfer object containing the person information, with its team without members.
         """
 
+        team_dto = None
+
+        if person.team_id is not None:
+            team = person.team
+            team_dto = TeamSummaryDTO(id=team.pk, name=team.name, member_count=team.member_count)
+
         return PersonDTO(
             id=person.pk,
             first_name=person.first_name,
             last_name=person.last_name,
             email=person.email,
-            team=person.team
+            team=team_dto,
         )
 
     @classmethod
-    def _persons_to_dto(cls, persons: QuerySet[Person]) -> list[PersonDTO]:
+    def _rows_to_dto(cls, rows: list[tuple], fields_dto: FieldsDTO = FieldsDTO()) -> list[PersonDTO]:
         """
-        Converts a QuerySet of Person objects to a list of PersonDTO objects.
+        Convert rows of _get_persons_rows into PersonDTO objects without instantiating model objects.
+
+        Each team is converted once and the same team DTO is shared by all
+        persons of that team.
 
         Args:
-            persons (QuerySet[Person]): A QuerySet of Person objects to be converted.
+            rows (list[tuple]): Rows with the PERSON_COLUMNS, followed by the TEAM_COLUMNS if the team is returned.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+                Teams are converted to TeamDTO with team.members expanded, and to TeamSummaryDTO otherwise.
 
         Returns:
             list[PersonDTO]: A list of PersonDTO objects containing the converted data.
         """
 
-        persons_dto = [cls._person_to_dto(person) for person in persons]
+        if not cls._includes_team(fields_dto):
+            return [PersonDTO(*row, team=None) for row in rows]
+
+        teams_dto = {row[4]: TeamSummaryDTO(*row[4:]) for row in rows if row[4] is not None}
+
+        if "team.members" in fields_dto.expand:
+            teams_dto = cls._add_members(teams_dto)
+
+        return [PersonDTO(*row[:4], team=teams_dto.get(row[4])) for row in rows]
+
+    @staticmethod
+    def _add_members(teams_dto: dict[int, TeamSummaryDTO]) -> dict[int, TeamDTO]:
+        """
+        Add the members to teams, read with one query and without instantiating model objects.
+
+        Args:
+            teams_dto (dict[int, TeamSummaryDTO]): The teams by id.
+
+        Returns:
+            dict[int, TeamDTO] - The same teams by id, with their members ordered by id.
+        """
+
+        if not teams_dto:
+            return {}
+
+        members = TeamRepository.get_members_by_team(teams_dto)
+
+        return {
+            team_id: TeamDTO(
+                id=team_id,
+                name=team_dto.name,
+                member_count=team_dto.member_count,
+                members=members.get(team_id, ()),
+            )
+            for team_id, team_dto in teams_dto.items()
+        }
+
+    @staticmethod
+    def _includes_team(fields_dto: FieldsDTO) -> bool:
+        """
+        Check whether the team of the persons is requested.
+
+        Args:
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+
+        Returns:
+            bool - True if the team field is returned.
+        """
+
+        return fields_dto.fields is None or "team" in fields_dto.fields
 
-        return persons_dto
+    @classmethod
+    def _get_persons_rows(cls, is_without_team: bool = False, fields_dto: FieldsDTO = FieldsDTO()) -> QuerySet:
+        """
+        Build the queryset of person rows with the columns requested by fields_dto.
 
-    def _get_person(self, person_id: int) -> Person:
+        Rows hold the PERSON_COLUMNS of a person, followed by the TEAM_COLUMNS
+        of its team when the team field is returned. The team is then joined in
+        with a LEFT OUTER JOIN and its columns are None for a person without a team.
+
+        Args:
+            is_without_team (bool): Whether to return only persons without a team.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+
+        Returns:
+            QuerySet - The filtered values_list queryset of persons.
+        """
+
+        filter_conditions = Q()
+
+        if is_without_team is True:
+            filter_conditions &= Q(team=None)
+
+        persons = Person.objects.filter(filter_conditions)
+
+        if not cls._includes_team(fields_dto):
+            return persons.values_list(*cls.PERSON_COLUMNS)
+
+        return persons.values_list(*cls.PERSON_COLUMNS, *cls.TEAM_COLUMNS)
+
+    @staticmethod
+    def _save_person(person: Person, update_fields: list[str] | None = None) -> None:
+        """
+        Save a person, in a savepoint so a rejected email does not break the surrounding transaction.
+
+        Args:
+            person (Person): The person model object to save.
+            update_fields (list[str] | None): The columns to write, all of them if None.
+
+        Raises:
+            InstanceAlreadyExistsError: If another person with this email already exists.
+        """
+
+        try:
+            with transaction.atomic():
+                person.save(update_fields=update_fields)
+        except IntegrityError:
+            raise InstanceAlreadyExistsError(f"Person with email {person.email} already exists")
+
+    def _get_person(self, person_id: int, for_update: bool = False) -> Person:
         """
         Retrieve information about a person using its unique identifier.
 
         Args:
             person_id (int): The unique identifier of the person.
+            for_update (bool): Whether to lock the person until the end of the transaction.
 
         Returns:
             Person - A person model object containing the person information.
@@ -185,9 +606,126 @@ class PersonRepository(PersonRepositoryInterface):
             InstanceDoesNotExistError: If no person with this id is found.
         """
 
-        person = get_object_or_None(Person, id=person_id)
+        persons = Person.objects.select_for_update() if for_update else Person.objects
+
+        person = get_object_or_None(persons, id=person_id)
 
         if not person:
             raise InstanceDoesNotExistError(f"Person with id {person_id} not found")
 
         return person
+
+
+class CachedPersonRepository(PersonRepositoryInterface):
+    """
+    The CachedPersonRepository class serves person details from the cache.
+
+    It wraps another person repository: get_person_by_id is read through the
+    cache, every method that changes persons or their teams invalidates it,
+    and the remaining methods are delegated unchanged.
+    """
+
+    def __init__(self, person_repository: PersonRepositoryInterface, cache: VersionedCache):
+        self.person_repository = person_repository
+        self.cache = cache
+
+    def create_person(self, new_person_dto: NewPersonDTO) -> PersonDTO:
+        """Create a new person in the wrapped repository."""
+
+        return self.person_repository.create_person(new_person_dto)
+
+    def create_persons(self, new_persons_dto: list[NewPersonDTO], batch_size: int) -> list[PersonDTO]:
+        """Create several persons in the wrapped repository."""
+
+        return self.person_repository.create_persons(new_persons_dto, batch_size)
+
+    def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """Find the emails that already belong to a person in the wrapped repository."""
+
+        return self.person_repository.get_existing_emails(emails)
+
+    def get_person_by_id(self, person_id: int, fields_dto: FieldsDTO = FieldsDTO()) -> PersonDTO:
+        """
+        Retrieve information about a person using its unique identifier, reading through the cache.
+
+        Each combination of fields and expanded relations is cached separately.
+        The cache is bypassed when the reads go to replicas.
+
+        Args:
+            person_id (int): The unique identifier of the person.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+
+        Returns:
+            PersonDTO - A data transfer object containing the person information.
+
+        Raises:
+            InstanceDoesNotExistError: If no person with this id is found.
+        """
+
+        if not can_cache_reads():
+            return self.person_repository.get_person_by_id(person_id, fields_dto)
+
+        fields = ",".join(fields_dto.fields) if fields_dto.fields is not None else "*"
+        key = f"person:{person_id}:{fields}:{','.join(fields_dto.expand)}"
+
+        return self.cache.get_or_set(key, lambda: self.person_repository.get_person_by_id(person_id, fields_dto))
+
+    def get_person_version(self, person_id: int) -> ResourceVersionDTO:
+        """Retrieve the ETag of a person from the wrapped repository."""
+
+        return self.person_repository.get_person_version(person_id)
+
+    def update_person(self, person_id: int, person_dto: NewPersonDTO) -> PersonDTO:
+        """Update person information in the wrapped repository and invalidate the cache."""
+
+        person = self.person_repository.update_person(person_id, person_dto)
+        self.cache.invalidate()
+
+        return person
+
+    def delete_person_by_id(self, person_id: int) -> None:
+        """Delete a person in the wrapped repository and invalidate the cache."""
+
+        self.person_repository.delete_person_by_id(person_id)
+        self.cache.invalidate()
+
+    def get_persons(self, is_without_team: bool = False) -> list[PersonDTO]:
+        """Retrieve a list of persons from the wrapped repository."""
+
+        return self.person_repository.get_persons(is_without_team)
+
+    def get_persons_page(
+        self, page: PageRequestDTO, is_without_team: bool = False, fields_dto: FieldsDTO = FieldsDTO()
+    ) -> PageDTO[PersonDTO]:
+        """Retrieve one page of persons from the wrapped repository."""
+
+        return self.person_repository.get_persons_page(page, is_without_team, fields_dto)
+
+    def search_persons_page(
+        self,
+        query: str,
+        page: PageRequestDTO,
+        is_without_team: bool = False,
+        fields_dto: FieldsDTO = FieldsDTO(),
+    ) -> PageDTO[PersonDTO]:
+        """Search persons in the wrapped repository."""
+
+        return self.person_repository.search_persons_page(query, page, is_without_team, fields_dto)
+
+    def get_persons_version(self) -> ResourceVersionDTO:
+        """Retrieve the ETag of the persons listing from the wrapped repository."""
+
+        return self.person_repository.get_persons_version()
+
+    def iter_persons(self, chunk_size: int) -> Iterator[dict]:
+        """Iterate over all persons of the wrapped repository."""
+
+        return self.person_repository.iter_persons(chunk_size)
+
+    def leave_team(self, person_id: id) -> PersonDTO:
+        """Remove a person from their team in the wrapped repository and invalidate the cache."""
+
+        person = self.person_repository.leave_team(person_id)
+        self.cache.invalidate()
+
+        return person
@@ -1,6 +1,19 @@
+import re
+from functools import lru_cache
+
 from rest_framework import serializers
 
-from teams.serializers import TeamSerializer
+from core.dto_serializers import DTOSerializer, compile_dto_serializer
+from core.serializers import PageQuerySerializer, SparseFieldsField, SparseFieldsSerializerMixin
+from teams.serializers import (
+    TeamReferenceSerializer,
+    TeamSerializer,
+    TeamSummarySerializer,
+    serialize_team,
+    serialize_team_reference,
+    serialize_team_summary,
+)
+from .dto import PersonDTO
 
 
 class PersonCreateSerializer(serializers.Serializer):
@@ -9,9 +22,121 @@ class PersonCreateSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
 
-class PersonSerializer(serializers.Serializer):
+class PersonSerializer(SparseFieldsSerializerMixin, serializers.Serializer):
+    """
+    Serializer for persons. The team is embedded by id and name; with the expand
+    keyword argument "team" adds its member count and "team.members" its members.
+    """
+
     id = serializers.IntegerField(read_only=True)
     first_name = serializers.CharField()
     last_name = serializers.CharField()
     email = serializers.EmailField()
-    team = TeamSerializer(read_only=True)
+    team = TeamReferenceSerializer(read_only=True)
+
+    def __init__(self, *args, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if "team" not in self.fields:
+            return
+
+        if "team.members" in expand:
+            self.fields["team"] = TeamSerializer(read_only=True)
+        elif "team" in expand:
+            self.fields["team"] = TeamSummarySerializer(read_only=True)
+
+
+class PersonFieldsQuerySerializer(serializers.Serializer):
+    fields = SparseFieldsField(choices=("id", "first_name", "last_name", "email", "team"), required=False)
+    expand = SparseFieldsField(
+        choices=("team", "team.members"),
+        required=False,
+        help_text=(
+            "Comma-separated relations to embed in full: team adds the member count of the team, "
+            "team.members also its members. By default the team is embedded by id and name."
+        ),
+    )
+
+    def validate(self, attrs):
+        if attrs.get("expand") and "team" not in attrs.get("fields", ("team",)):
+            raise serializers.ValidationError({"expand": ["Expanded relations need the team field."]})
+
+        return attrs
+
+
+class PersonListQuerySerializer(PageQuerySerializer, PersonFieldsQuerySerializer):
+    q = serializers.CharField(
+        required=False,
+        max_length=100,
+        help_text=(
+            "Search by first name, last name and email. Every word has to start a word of the person, "
+            "the best matches come first."
+        ),
+    )
+
+    def validate_q(self, value):
+        if not re.search(r"\w", value):
+            raise serializers.ValidationError("Search for at least one letter or digit.")
+
+        return value
+
+    def get_cursor_types(self, attrs: dict) -> tuple[type, ...]:
+        # A search page ends at the score and id of its last match, a listing page at its id.
+        return (float, int) if "q" in attrs else (int,)
+
+
+class PersonBulkCreateQuerySerializer(serializers.Serializer):
+    allow_partial = serializers.BooleanField(
+        default=False,
+        help_text="Create the valid rows and report the invalid ones instead of rejecting the whole request.",
+    )
+
+
+class PersonRowErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    errors = serializers.DictField(child=serializers.ListField(child=serializers.CharField()))
+
+
+class PersonBulkCreateResponseSerializer(serializers.Serializer):
+    created = PersonSerializer(many=True)
+    errors = PersonRowErrorSerializer(many=True)
+
+
+class PersonPageSerializer(serializers.Serializer):
+    results = PersonSerializer(many=True)
+    next = serializers.CharField(allow_null=True)
+
+
+class PersonExportSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+    email = serializers.EmailField()
+    team_id = serializers.IntegerField(allow_null=True)
+
+
+# Compiled counterpart of PersonSerializer, used to render the responses.
+serialize_person = compile_dto_serializer(PersonDTO, nested={"team": serialize_team_reference})
+
+
+@lru_cache(maxsize=128)
+def get_person_dto_serializer(fields: tuple[str, ...] | None = None, expand: tuple[str, ...] = ()) -> DTOSerializer:
+    """
+    Return the compiled serializer of PersonSerializer with the fields and expanded relations.
+
+    Args:
+        fields (tuple[str, ...] | None): The fields validated by PersonFieldsQuerySerializer, all fields if None.
+        expand (tuple[str, ...]): The relations validated by PersonFieldsQuerySerializer.
+
+    Returns:
+        DTOSerializer - The function that serializes a PersonDTO.
+    """
+
+    if "team.members" in expand:
+        team_serializer = serialize_team
+    elif "team" in expand:
+        team_serializer = serialize_team_summary
+    else:
+        team_serializer = serialize_team_reference
+
+    return compile_dto_serializer(PersonDTO, fields, nested={"team": team_serializer})
@@ -1,3 +1,6 @@
+from collections.abc import Iterator
+
+from core.dto import FieldsDTO, PageDTO, PageRequestDTO, ResourceVersionDTO
 from .dto import NewPersonDTO, PersonDTO
 from .interfaces import PersonRepositoryInterface
 
@@ -21,16 +24,50 @@ class PersonService:
         Returns:
             PersonDTO - A data transfer object containing the person information.
 
+        Raises:
+            InstanceAlreadyExistsError: If a person with this email already exists.
         """
 
         return self.person_repository.create_person(new_person_dto)
 
-    def get_person(self, person_id: int) -> PersonDTO:
+    def create_persons(self, new_persons_dto: list[NewPersonDTO], batch_size: int) -> list[PersonDTO]:
+        """
+        Create several persons in one transaction.
+
+        Args:
+            new_persons_dto (list[NewPersonDTO]): The data model objects representing the persons.
+            batch_size (int): The maximum number of persons inserted by one query.
+
+        Returns:
+            list(PersonDTO) - Data transfer objects containing the created persons, in the given order.
+
+        Raises:
+            InstanceAlreadyExistsError: If a person with one of the emails already exists.
+        """
+
+        return self.person_repository.create_persons(new_persons_dto, batch_size)
+
+    def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """
+        Find which of the given emails already belong to a person, ignoring case.
+
+        Args:
+            emails (list[str]): The emails to look up.
+
+        Returns:
+            set(str) - The lowercased emails that already belong to a person.
+        """
+
+        return self.person_repository.get_existing_emails(emails)
+
+    def get_person(self, person_id: int, fields_dto: FieldsDTO = FieldsDTO()) -> PersonDTO:
         """
         Retrieve information about a person using its unique identifier.
 
         Args:
             person_id (int): The unique identifier of the person.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+                By default the team is returned without its members.
 
         Returns:
             PersonDTO - A data transfer object containing the person information.
@@ -39,7 +76,23 @@ class PersonService:
             InstanceDoesNotExistError: If no person with this id is found.
         """
 
-        return self.person_repository.get_person_by_id(person_id)
+        return self.person_repository.get_person_by_id(person_id, fields_dto)
+
+    def get_person_version(self, person_id: int) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of a person using its unique identifier.
+
+        Args:
+            person_id (int): The unique identifier of the person.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the person.
+
+        Raises:
+            InstanceDoesNotExistError: If no person with this id is found.
+        """
+
+        return self.person_repository.get_person_version(person_id)
 
     def update_person(self, person_id: int, person_dto: NewPersonDTO) -> PersonDTO:
         """
@@ -54,6 +107,7 @@ class PersonService:
 
         Raises:
             InstanceDoesNotExistError: If no person with this id is found.
+            InstanceAlreadyExistsError: If another person with this email already exists.
         """
 
         return self.person_repository.update_person(person_id, person_dto)
@@ -87,6 +141,73 @@ class PersonService:
 
         return self.person_repository.get_persons(is_without_team)
 
+    def get_persons_page(
+        self, page: PageRequestDTO, is_without_team: bool = False, fields_dto: FieldsDTO = FieldsDTO()
+    ) -> PageDTO[PersonDTO]:
+        """
+        Retrieve one page of persons ordered by id, optionally filtered by the absence of a team.
+
+        Args:
+            page (PageRequestDTO): The page size and the position after which the page starts.
+            is_without_team (bool): Whether to return only persons without a team.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+                By default the team is returned without its members.
+
+        Returns:
+            PageDTO[PersonDTO] - The persons of the page and the position of the next page.
+
+        Raises:
+            InstanceDoesNotExistError: If no persons is found on the first page.
+        """
+
+        return self.person_repository.get_persons_page(page, is_without_team, fields_dto)
+
+    def search_persons_page(
+        self,
+        query: str,
+        page: PageRequestDTO,
+        is_without_team: bool = False,
+        fields_dto: FieldsDTO = FieldsDTO(),
+    ) -> PageDTO[PersonDTO]:
+        """
+        Search persons by first name, last name and email, best matches first.
+
+        Args:
+            query (str): The searched words, each matched as the start of a word of the person.
+            page (PageRequestDTO): The page size and the score and id of the last match of the previous page.
+            is_without_team (bool): Whether to return only persons without a team.
+            fields_dto (FieldsDTO): The fields to return and the relations to expand.
+
+        Returns:
+            PageDTO[PersonDTO] - The matching persons of the page, empty if nothing matches,
+            and the position of the next page.
+        """
+
+        return self.person_repository.search_persons_page(query, page, is_without_team, fields_dto)
+
+    def get_persons_version(self) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of the persons listing.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the persons listing.
+        """
+
+        return self.person_repository.get_persons_version()
+
+    def export_persons(self, chunk_size: int) -> Iterator[dict]:
+        """
+        Iterate over all persons ordered by id without loading them into memory at once.
+
+        Args:
+            chunk_size (int): The number of rows fetched from the database at a time.
+
+        Returns:
+            Iterator[dict] - Rows with the id, first_name, last_name, email and team_id of each person.
+        """
+
+        return self.person_repository.iter_persons(chunk_size)
+
     def leave_team(self, person_id: id) -> PersonDTO:
         """
         Remove a person from their team.
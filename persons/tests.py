@@ -1,11 +1,33 @@
-from django.test import TestCase
+import json
+from importlib import import_module
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
 from annoying.functions import get_object_or_None
+from rest_framework.test import APIClient
 
-from .dto import NewPersonDTO
+from .dto import NewPersonDTO, PersonDTO
 from .repositories import PersonRepository
 from .models import Person
-from core.exceptions import InstanceDoesNotExistError
+from .serializers import PersonSerializer, get_person_dto_serializer
+from core.db.explain import get_sequential_scans
+from core.dto import FieldsDTO, PageRequestDTO
+from core.pagination import encode_cursor
+from core.middleware import ReadYourWritesMiddleware
+from core.exceptions import InstanceAlreadyExistsError, InstanceDoesNotExistError
+from teams.dto import MemberDTO, MemberIdDTO, TeamDTO
 from teams.models import Team
+from teams.repositories import TeamRepository
 
 
 class PersonRepositoryTestCase(TestCase):
@@ -30,6 +52,18 @@ class PersonRepositoryTestCase(TestCase):
 
         self.assertEqual(updated_person.first_name, "Updated")
 
+    def test_update_person_keeps_concurrent_team_change(self):
+        team = Team.objects.create(name="Team name")
+        stale_person = Person.objects.get(id=self.person_id)
+        TeamRepository().add_member(team.id, MemberIdDTO(id=self.person_id))
+        person_dto = NewPersonDTO(first_name="Updated", last_name="Person", email="person@gmail.com")
+
+        with mock.patch.object(PersonRepository, "_get_person", return_value=stale_person):
+            self.repository.update_person(self.person_id, person_dto)
+
+        self.assertEqual(Person.objects.get(id=self.person_id).team_id, team.id)
+        self.assertEqual(Team.objects.get(id=team.id).member_count, 1)
+
     def test_delete_person_by_id(self):
         self.repository.delete_person_by_id(self.person_id)
 
@@ -70,3 +104,526 @@ class PersonRepositoryTestCase(TestCase):
         person = get_object_or_None(Person, id=person.id)
 
         self.assertIsNone(person.team)
+
+    def test_get_persons_query_count_is_constant(self):
+        for index in range(3):
+            team = Team.objects.create(name=f"Team {index}")
+            for member_index in range(3):
+                Person.objects.create(
+                    first_name="Member", last_name=str(member_index), email=f"{index}.{member_index}@gmail.com", team=team
+                )
+
+        with self.assertNumQueries(2):
+            retrieved_persons = self.repository.get_persons()
+
+        self.assertEqual(len(retrieved_persons), 10)
+        self.assertIsNone(retrieved_persons[0].team)
+        self.assertEqual(len(retrieved_persons[1].team.members), 3)
+
+    def test_get_persons_share_team_dto(self):
+        team = Team.objects.create(name="Team name")
+        Person.objects.create(first_name="Second", last_name="Person2", email="person2@gmail.com", team=team)
+        Person.objects.create(first_name="Third", last_name="Person3", email="person3@gmail.com", team=team)
+
+        retrieved_persons = self.repository.get_persons()
+
+        self.assertIs(retrieved_persons[1].team, retrieved_persons[2].team)
+
+    def test_get_persons_without_team_query_count(self):
+        team = Team.objects.create(name="Team name")
+        Person.objects.create(first_name="Second", last_name="Person2", email="person2@gmail.com", team=team)
+
+        with self.assertNumQueries(1):
+            retrieved_persons = self.repository.get_persons(is_without_team=True)
+
+        self.assertEqual(len(retrieved_persons), 1)
+        self.assertIsNone(retrieved_persons[0].team)
+
+    def test_get_persons_page(self):
+        for index in range(4):
+            Person.objects.create(first_name=f"Person {index}", last_name="Page", email=f"page{index}@gmail.com")
+
+        first_page = self.repository.get_persons_page(PageRequestDTO(limit=3))
+
+        self.assertEqual([person.first_name for person in first_page.items], ["First", "Person 0", "Person 1"])
+        self.assertEqual(first_page.next_after, (first_page.items[-1].id,))
+
+        with self.assertNumQueries(1):
+            last_page = self.repository.get_persons_page(PageRequestDTO(limit=3, after=first_page.next_after))
+
+        self.assertEqual([person.first_name for person in last_page.items], ["Person 2", "Person 3"])
+        self.assertIsNone(last_page.next_after)
+
+    def test_get_persons_page_without_team_field(self):
+        with self.assertNumQueries(1) as context:
+            page = self.repository.get_persons_page(PageRequestDTO(limit=10), fields_dto=FieldsDTO(fields=("id",)))
+
+        self.assertEqual(page.items[0].id, self.person_id)
+        self.assertNotIn("JOIN", context.captured_queries[0]["sql"])
+
+    def test_search_persons_page(self):
+        for first_name, last_name in [("John", "Doe"), ("Johnny", "Smith"), ("Jane", "Doe"), ("Doe", "John")]:
+            Person.objects.create(first_name=first_name, last_name=last_name, email=f"{first_name}.{last_name}@a.com")
+
+        first_page = self.repository.search_persons_page("jo do", PageRequestDTO(limit=1))
+        last_page = self.repository.search_persons_page("jo do", PageRequestDTO(limit=1, after=first_page.next_after))
+
+        self.assertEqual(len(first_page.next_after), 2)
+        self.assertEqual(
+            {(person.first_name, person.last_name) for person in first_page.items + last_page.items},
+            {("John", "Doe"), ("Doe", "John")},
+        )
+        self.assertIsNone(last_page.next_after)
+
+    def test_search_by_email_words(self):
+        Person.objects.create(first_name="John", last_name="Doe", email="jdoe@example.org")
+
+        found_by_domain = self.repository.search_persons_page("example", PageRequestDTO(limit=10)).items
+        found_by_local_part = self.repository.search_persons_page("jdo", PageRequestDTO(limit=10)).items
+
+        self.assertEqual([person.email for person in found_by_domain], ["jdoe@example.org"])
+        self.assertEqual([person.email for person in found_by_local_part], ["jdoe@example.org"])
+
+    @skipUnless(connection.vendor == "sqlite", "The search index is kept in sync by triggers on SQLite.")
+    def test_search_index_triggers(self):
+        # A migration that alters persons_person on SQLite rebuilds the table and drops them.
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'persons_person'")
+            triggers = {name for name, in cursor.fetchall()}
+
+        self.assertEqual(
+            triggers, {"persons_person_fts_insert", "persons_person_fts_delete", "persons_person_fts_update"}
+        )
+
+    def test_search_without_search_index(self):
+        for index in range(3):
+            Person.objects.create(first_name=f"Person {index}", last_name="Doe", email=f"search{index}@gmail.com")
+
+        with mock.patch.dict(PersonRepository.SEARCH_SQL, clear=True):
+            first_page = self.repository.search_persons_page("doe SEARCH", PageRequestDTO(limit=2))
+            last_page = self.repository.search_persons_page(
+                "doe SEARCH", PageRequestDTO(limit=2, after=first_page.next_after)
+            )
+
+        self.assertEqual([person.first_name for person in first_page.items], ["Person 0", "Person 1"])
+        self.assertEqual(first_page.next_after, (0.0, first_page.items[-1].id))
+        self.assertEqual([person.first_name for person in last_page.items], ["Person 2"])
+        self.assertIsNone(last_page.next_after)
+
+    def test_search_follows_updates(self):
+        person = Person.objects.get(id=self.person_id)
+        person.first_name = "Renamed"
+        person.save()
+
+        self.assertEqual(self.repository.search_persons_page("first", PageRequestDTO(limit=10)).items, [])
+        self.assertEqual(len(self.repository.search_persons_page("renam", PageRequestDTO(limit=10)).items), 1)
+
+    def test_get_persons_page_not_found(self):
+        Person.objects.all().delete()
+
+        with self.assertRaises(InstanceDoesNotExistError):
+            self.repository.get_persons_page(PageRequestDTO(limit=3))
+
+    def test_migration_reports_duplicate_emails(self):
+        migration = import_module("persons.migrations.0002_person_updated_at_indexes")
+
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX person_email_lower_unique")
+
+        Person.objects.create(first_name="Same", last_name="Email", email="PERSON@gmail.com")
+        duplicate_ids = sorted(Person.objects.filter(email__iexact="person@gmail.com").values_list("id", flat=True))
+
+        # Only the connection of the schema editor is used, the SQLite one can not be opened inside a transaction.
+        schema_editor = mock.Mock(connection=connection)
+
+        with self.assertRaisesMessage(CommandError, f"person@gmail.com (ids {', '.join(map(str, duplicate_ids))})"):
+            migration.check_duplicate_emails(apps, schema_editor)
+
+    def test_create_persons(self):
+        new_persons_dto = [
+            NewPersonDTO(first_name=f"Bulk {index}", last_name="Person", email=f"bulk{index}@gmail.com")
+            for index in range(5)
+        ]
+
+        created_persons = self.repository.create_persons(new_persons_dto, batch_size=2)
+
+        self.assertEqual([person.first_name for person in created_persons], [f"Bulk {index}" for index in range(5)])
+        self.assertTrue(all(person.id is not None for person in created_persons))
+        self.assertEqual(Person.objects.count(), 6)
+
+    def test_iter_persons(self):
+        team = Team.objects.create(name="Team name")
+        Person.objects.create(first_name="Second", last_name="Person2", email="person2@gmail.com", team=team)
+
+        exported_persons = list(self.repository.iter_persons(chunk_size=1))
+
+        self.assertEqual([person["first_name"] for person in exported_persons], ["First", "Second"])
+        self.assertIsNone(exported_persons[0]["team_id"])
+        self.assertEqual(exported_persons[1]["team_id"], team.id)
+
+    def test_email_is_unique_regardless_of_case(self):
+        new_person_dto = NewPersonDTO(first_name="Other", last_name="Person", email="Person@Gmail.com")
+
+        with self.assertRaises(InstanceAlreadyExistsError):
+            self.repository.create_person(new_person_dto)
+
+        other_person = self.repository.create_person(
+            NewPersonDTO(first_name="Other", last_name="Person", email="other@gmail.com")
+        )
+
+        with self.assertRaises(InstanceAlreadyExistsError):
+            self.repository.update_person(other_person.id, new_person_dto)
+
+        with self.assertRaises(InstanceAlreadyExistsError):
+            self.repository.create_persons([new_person_dto], batch_size=10)
+
+        self.assertEqual(Person.objects.count(), 2)
+
+
+class PersonSerializerTestCase(SimpleTestCase):
+
+    def test_compiled_serializer_matches_person_serializer(self):
+        member = MemberDTO(id=1, first_name="John", last_name="Doe", email="john@gmail.com")
+        team = TeamDTO(id=2, name="team", member_count=1, members=(member,))
+        person = PersonDTO(id=1, first_name="John", last_name="Doe", email="john@gmail.com", team=team)
+
+        for fields, expand in [(None, ()), (None, ("team",)), (None, ("team.members",)), (("email", "id"), ())]:
+            with self.subTest(fields=fields, expand=expand):
+                self.assertEqual(
+                    get_person_dto_serializer(fields, expand)(person),
+                    PersonSerializer(person, fields=fields, expand=expand).data,
+                )
+
+
+class PersonListApiTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        for index in range(3):
+            Person.objects.create(first_name=f"Person {index}", last_name="Api", email=f"api{index}@gmail.com")
+
+    def test_follow_next_cursor(self):
+        response = self.client.get(reverse("api-person-list"), {"limit": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(reverse("api-person-list"), {"limit": 2, "after": response.data["next"]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([person["first_name"] for person in response.data["results"]], ["Person 2"])
+        self.assertIsNone(response.data["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("api-person-list"), {"after": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_out_of_range(self):
+        for query in [{"after": encode_cursor((10**30,))}, {"q": "person", "after": encode_cursor((1.0, 10**30))}]:
+            with self.subTest(query=query):
+                response = self.client.get(reverse("api-person-list"), query)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("after", response.data)
+
+    def test_export(self):
+        response = self.client.get(reverse("api-person-export"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual([json.loads(line)["first_name"] for line in lines], ["Person 0", "Person 1", "Person 2"])
+
+    def test_bulk_create_rejects_invalid_rows(self):
+        rows = [
+            {"first_name": "Valid", "last_name": "Row", "email": "valid@gmail.com"},
+            {"first_name": "Invalid", "last_name": "Row", "email": "not-an-email"},
+        ]
+
+        response = self.client.post(reverse("api-person-bulk-create"), rows, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Person.objects.count(), 3)
+
+    def test_bulk_create_allow_partial(self):
+        rows = [
+            {"first_name": "Valid", "last_name": "Row", "email": "valid@gmail.com"},
+            {"first_name": "Invalid", "last_name": "Row", "email": "not-an-email"},
+            {"first_name": "Other", "last_name": "Row", "email": "other@gmail.com"},
+        ]
+
+        response = self.client.post(
+            reverse("api-person-bulk-create") + "?allow_partial=true", rows, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([person["first_name"] for person in response.data["created"]], ["Valid", "Other"])
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertIn("email", response.data["errors"][0]["errors"])
+        self.assertEqual(Person.objects.count(), 5)
+
+    def test_bulk_create_allow_partial_duplicate_emails(self):
+        rows = [
+            {"first_name": "Valid", "last_name": "Row", "email": "valid@gmail.com"},
+            {"first_name": "Taken", "last_name": "Row", "email": "API0@gmail.com"},
+            {"first_name": "Invalid", "last_name": "Row", "email": "not-an-email"},
+            {"first_name": "Repeated", "last_name": "Row", "email": "Valid@gmail.com"},
+        ]
+
+        response = self.client.post(
+            reverse("api-person-bulk-create") + "?allow_partial=true", rows, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([person["first_name"] for person in response.data["created"]], ["Valid"])
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2, 3])
+        self.assertTrue(all("email" in error["errors"] for error in response.data["errors"]))
+        self.assertEqual(Person.objects.count(), 4)
+
+    def test_bulk_create_rejects_duplicate_emails(self):
+        rows = [
+            {"first_name": "Valid", "last_name": "Row", "email": "valid@gmail.com"},
+            {"first_name": "Taken", "last_name": "Row", "email": "API0@gmail.com"},
+        ]
+
+        response = self.client.post(reverse("api-person-bulk-create"), rows, format="json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Person.objects.count(), 3)
+
+    def test_create_duplicate_email(self):
+        response = self.client.post(
+            reverse("api-person-list"),
+            {"first_name": "Person", "last_name": "Api", "email": "API0@gmail.com"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_list_expand_team(self):
+        team = Team.objects.create(name="team", member_count=1)
+        Person.objects.filter(email="api0@gmail.com").update(team=team)
+
+        response = self.client.get(reverse("api-person-list"), {"limit": 1, "fields": "team", "expand": "team"})
+
+        self.assertEqual(response.json()["results"], [{"team": {"id": team.id, "name": "team", "member_count": 1}}])
+
+    def test_search(self):
+        response = self.client.get(reverse("api-person-list"), {"q": "person 1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([person["first_name"] for person in response.data["results"]], ["Person 1"])
+
+    def test_search_without_words(self):
+        response = self.client.get(reverse("api-person-list"), {"q": "*"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_rejects_listing_cursor(self):
+        cursor = self.client.get(reverse("api-person-list"), {"limit": 1}).data["next"]
+
+        response = self.client.get(reverse("api-person-list"), {"q": "person", "after": cursor})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("after", response.data)
+
+    def test_list_not_modified(self):
+        response = self.client.get(reverse("api-person-list"))
+
+        self.assertIn("ETag", response)
+
+        response = self.client.get(reverse("api-person-list"), HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_delete_modifies_list(self):
+        response = self.client.get(reverse("api-person-list"))
+
+        self.assertNotIn("Last-Modified", response)
+
+        Person.objects.filter(email="api0@gmail.com").delete()
+
+        response = self.client.get(reverse("api-person-list"), HTTP_IF_MODIFIED_SINCE=http_date())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+
+
+class PersonDetailApiTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.team = Team.objects.create(name="team", member_count=1)
+        self.person = Person.objects.create(first_name="John", last_name="Doe", email="john@gmail.com", team=self.team)
+
+    def test_not_modified(self):
+        response = self.client.get(reverse("api-person-detail", args=[self.person.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("api-person-detail", args=[self.person.id]), HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_team_change_modifies_person(self):
+        etag = self.client.get(reverse("api-person-detail", args=[self.person.id]))["ETag"]
+
+        Person.objects.create(first_name="Jane", last_name="Doe", email="jane@gmail.com", team=self.team)
+
+        response = self.client.get(reverse("api-person-detail", args=[self.person.id]), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_missing_person(self):
+        response = self.client.get(reverse("api-person-detail", args=[101]), HTTP_IF_NONE_MATCH='"etag"')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_team_is_embedded_by_reference(self):
+        Person.objects.create(first_name="Jane", last_name="Doe", email="jane@gmail.com", team=self.team)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("api-person-detail", args=[self.person.id]))
+
+        self.assertEqual(response.json()["team"], {"id": self.team.id, "name": "team"})
+
+    def test_sparse_fields(self):
+        response = self.client.get(reverse("api-person-detail", args=[self.person.id]), {"fields": "id,first_name"})
+
+        self.assertEqual(response.json(), {"id": self.person.id, "first_name": "John"})
+
+    def test_expand_team_members(self):
+        response = self.client.get(reverse("api-person-detail", args=[self.person.id]), {"expand": "team.members"})
+
+        team = response.json()["team"]
+        self.assertEqual(team["member_count"], 1)
+        self.assertEqual([member["id"] for member in team["members"]], [self.person.id])
+
+    def test_expand_needs_team_field(self):
+        response = self.client.get(
+            reverse("api-person-detail", args=[self.person.id]), {"fields": "id", "expand": "team"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("expand", response.json())
+
+    def test_unknown_expand(self):
+        response = self.client.get(reverse("api-person-detail", args=[self.person.id]), {"expand": "members"})
+
+        self.assertEqual(response.status_code, 400)
+
+
+@skipUnless("replica" in settings.DATABASES, "Needs a separate database with the alias 'replica'.")
+@override_settings(REPLICA_DATABASES=["replica"])
+class PersonReplicaApiTestCase(TransactionTestCase):
+    """Runs against two databases that do not replicate, so a read shows which one it went to."""
+
+    # The test runner reads the databases of skipped classes too.
+    databases = {"default", "replica"} if "replica" in settings.DATABASES else {"default"}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_read_your_writes(self):
+        response = self.client.post(
+            reverse("api-person-list"),
+            {"first_name": "John", "last_name": "Doe", "email": "john@gmail.com"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(ReadYourWritesMiddleware.COOKIE_NAME, response.cookies)
+
+        response = self.client.get(reverse("api-person-detail", args=[response.data["id"]]))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_reads_go_to_replica(self):
+        person = Person.objects.create(first_name="John", last_name="Doe", email="john@gmail.com")
+
+        response = self.client.get(reverse("api-person-detail", args=[person.id]))
+
+        self.assertEqual(response.status_code, 404)
+
+        Person.objects.using("replica").create(id=person.id, first_name="John", last_name="Doe", email="john@gmail.com")
+
+        response = self.client.get(reverse("api-person-detail", args=[person.id]))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_replica_reads_are_not_cached(self):
+        person = Person.objects.create(first_name="John", last_name="Doe", email="john@gmail.com")
+        Person.objects.using("replica").create(id=person.id, first_name="John", last_name="Doe", email="john@gmail.com")
+
+        response = self.client.get(reverse("api-person-detail", args=[person.id]))
+
+        self.assertEqual(response.data["first_name"], "John")
+
+        # The replica catches up with a write made on the primary.
+        Person.objects.using("replica").filter(id=person.id).update(first_name="Jane")
+
+        response = self.client.get(reverse("api-person-detail", args=[person.id]))
+
+        self.assertEqual(response.data["first_name"], "Jane")
+
+    def test_pinned_reads_skip_the_cache(self):
+        response = self.client.post(
+            reverse("api-person-list"),
+            {"first_name": "John", "last_name": "Doe", "email": "john@gmail.com"},
+            format="json",
+        )
+        person_id = response.data["id"]
+
+        self.client.get(reverse("api-person-detail", args=[person_id]))
+        Person.objects.filter(id=person_id).update(first_name="Jane")
+
+        response = self.client.get(reverse("api-person-detail", args=[person_id]))
+
+        self.assertEqual(response.data["first_name"], "Jane")
+
+
+class PersonQueryPlanTestCase(TestCase):
+    """The hot queries on persons are served by indexes."""
+
+    def assertIndexed(self, queryset):
+        self.assertEqual(get_sequential_scans(queryset), [], str(queryset.query))
+
+    def test_persons_without_team_page(self):
+        queryset = PersonRepository._get_persons_rows(is_without_team=True)
+
+        self.assertIndexed(queryset.order_by("pk")[:21])
+        self.assertIndexed(queryset.filter(pk__gt=100).order_by("pk")[:21])
+
+    def test_persons_page(self):
+        self.assertIndexed(PersonRepository._get_persons_rows().filter(pk__gt=100).order_by("pk")[:21])
+
+    def test_person_by_email(self):
+        self.assertIndexed(Person.objects.alias(email_lower=Lower("email")).filter(email_lower="john@gmail.com"))
+
+    def test_team_members(self):
+        self.assertIndexed(Person.objects.filter(team_id__in=[1, 2]).order_by("team_id", "id"))
+
+    @skipUnless(connection.vendor == "postgresql", "The search index is an expression index on PostgreSQL.")
+    def test_search_by_email_words(self):
+        Person.objects.create(first_name="John", last_name="Doe", email="jdoe@example.org")
+        queryset = Person.objects.filter(
+            RawSQL(f"{PersonRepository.SEARCH_VECTOR} @@ to_tsquery('simple', %s)", ["example:*"], BooleanField())
+        )
+
+        self.assertIndexed(queryset)
+        self.assertEqual([person.email for person in queryset], ["jdoe@example.org"])
+
+    def test_unindexed_query_is_detected(self):
+        self.assertEqual(get_sequential_scans(Person.objects.filter(first_name="John")), ["persons_person"])
@@ -1,9 +1,11 @@
 from django.urls import path
 
-from .views import ApiPersonListView, ApiPersonDetailView, ApiLeaveTeamView
+from .views import ApiPersonListView, ApiPersonBulkCreateView, ApiPersonExportView, ApiPersonDetailView, ApiLeaveTeamView
 
 urlpatterns = [
     path("", ApiPersonListView.as_view(), name="api-person-list"),
+    path("bulk/", ApiPersonBulkCreateView.as_view(), name="api-person-bulk-create"),
+    path("export/", ApiPersonExportView.as_view(), name="api-person-export"),
     path("<int:id>/", ApiPersonDetailView.as_view(), name="api-person-detail"),
     path("<int:id>/leave-team", ApiLeaveTeamView.as_view(), name="api-leave-team")
 ]
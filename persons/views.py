@@ -1,14 +1,31 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from drf_spectacular.types import OpenApiTypes
 
+from core.conditional import get_not_modified_response, set_version_headers
 from core.containers import ServiceContainer
-from core.exceptions import InstanceDoesNotExistError
+from core.dto import FieldsDTO, PageRequestDTO
+from core.exceptions import InstanceAlreadyExistsError, InstanceDoesNotExistError
+from core.ndjson import iter_ndjson
+from core.pagination import encode_cursor
 from core.serializers import ResponseWithErrorSerializer, ValidationErrorResponseSerializer
 from .dto import NewPersonDTO
-from .serializers import PersonCreateSerializer, PersonSerializer
+from .serializers import (
+    PersonBulkCreateQuerySerializer,
+    PersonBulkCreateResponseSerializer,
+    PersonCreateSerializer,
+    PersonExportSerializer,
+    PersonFieldsQuerySerializer,
+    PersonListQuerySerializer,
+    PersonPageSerializer,
+    PersonSerializer,
+    get_person_dto_serializer,
+    serialize_person,
+)
 
 
 class ApiPersonListView(APIView):
@@ -22,7 +39,8 @@ class ApiPersonListView(APIView):
         request=PersonCreateSerializer,
         responses={
             200: PersonSerializer,
-            400: ValidationErrorResponseSerializer
+            400: ValidationErrorResponseSerializer,
+            409: ResponseWithErrorSerializer,
         },
         tags=["Persons"],
     )
@@ -38,17 +56,24 @@ class ApiPersonListView(APIView):
 
         new_person_dto = NewPersonDTO(**person_serializer.validated_data)
 
-        person_dto = person_service.create_person(new_person_dto)
-
-        person = PersonSerializer(person_dto)
+        try:
+            person_dto = person_service.create_person(new_person_dto)
+        except InstanceAlreadyExistsError as exception:
+            return Response({"error": str(exception)}, status=status.HTTP_409_CONFLICT)
 
         return Response(
-            data=person.data,
+            data=serialize_person(person_dto),
             status=status.HTTP_201_CREATED,
         )
 
     @extend_schema(
         summary="Retrieve information about all persons",
+        description=(
+            "Lists persons by id, or with q the persons matching the search, best matches first. "
+            "Responds with an ETag header; a request with a matching "
+            "If-None-Match header gets 304 Not Modified without a body."
+        ),
+        operation_id="api_person_list",
         parameters=[
             OpenApiParameter(
                 name="is_without_team",
@@ -56,15 +81,30 @@ class ApiPersonListView(APIView):
                 location=OpenApiParameter.QUERY,
                 description="Filter products by 'offer of the month' status (True/False).",
             ),
+            PersonListQuerySerializer,
         ],
         responses={
-            200: PersonSerializer(many=True),
+            200: PersonPageSerializer,
+            400: ValidationErrorResponseSerializer,
             404: ResponseWithErrorSerializer,
         },
         tags=["Persons"],
     )
     def get(self, request):
-        """Handle GET request to retrieve all persons data."""
+        """Handle GET request to retrieve a page of persons data."""
+
+        query_serializer = PersonListQuerySerializer(data=request.query_params)
+
+        if not query_serializer.is_valid():
+            return Response(query_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        fields_dto = FieldsDTO(
+            fields=query_serializer.validated_data.pop("fields", None),
+            expand=query_serializer.validated_data.pop("expand", ()),
+        )
+        search_query = query_serializer.validated_data.pop("q", None)
+
+        page_dto = PageRequestDTO(**query_serializer.validated_data)
 
         is_without_team = request.query_params.get('is_without_team', None)
 
@@ -75,26 +115,157 @@ class ApiPersonListView(APIView):
 
         person_service = ServiceContainer.person_service()
 
+        persons_version_dto = person_service.get_persons_version()
+
+        not_modified_response = get_not_modified_response(request, persons_version_dto)
+
+        if not_modified_response is not None:
+            return not_modified_response
+
         try:
-            persons_dto = person_service.get_persons(is_without_team)
+            if search_query is not None:
+                persons_page_dto = person_service.search_persons_page(
+                    search_query, page_dto, is_without_team, fields_dto
+                )
+            else:
+                persons_page_dto = person_service.get_persons_page(page_dto, is_without_team, fields_dto)
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
-        persons = PersonSerializer(persons_dto, many=True)
+        serialize = get_person_dto_serializer(fields_dto.fields, fields_dto.expand)
 
-        return Response(
-            data=persons.data,
+        response = Response(
+            data={
+                "results": [serialize(person_dto) for person_dto in persons_page_dto.items],
+                "next": encode_cursor(persons_page_dto.next_after),
+            },
             status=status.HTTP_200_OK,
         )
 
+        return set_version_headers(response, persons_version_dto)
+
+
+class ApiPersonBulkCreateView(APIView):
+    """The ApiPersonBulkCreateView class defines API endpoints for creating many persons at once."""
+
+    @extend_schema(
+        summary="Create several persons",
+        description=(
+            "Validates every row and inserts all persons in one transaction. "
+            "By default any invalid row rejects the whole request, and an email that is taken, "
+            "ignoring case, by an existing person or an earlier row gets 409; with allow_partial=true "
+            "the valid rows are created and the invalid ones and the taken emails are reported by index."
+        ),
+        parameters=[PersonBulkCreateQuerySerializer],
+        request=PersonCreateSerializer(many=True),
+        responses={
+            201: PersonBulkCreateResponseSerializer,
+            400: ValidationErrorResponseSerializer,
+            409: ResponseWithErrorSerializer,
+        },
+        tags=["Persons"],
+    )
+    def post(self, request):
+        """Handle POST request to create several persons."""
+
+        query_serializer = PersonBulkCreateQuerySerializer(data=request.query_params)
+
+        if not query_serializer.is_valid():
+            return Response(query_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        allow_partial = query_serializer.validated_data["allow_partial"]
+        persons_serializer = PersonCreateSerializer(
+            data=request.data, many=True, max_length=settings.PERSON_BULK_CREATE_MAX_ROWS
+        )
+        row_errors = {}
+
+        if persons_serializer.is_valid():
+            valid_rows = list(enumerate(persons_serializer.validated_data))
+        else:
+            errors = persons_serializer.errors
+
+            # A non-list payload or too many rows is reported as a dict, not per row.
+            if not allow_partial or not isinstance(errors, list):
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+            row_errors = {index: error for index, error in enumerate(errors) if error}
+
+            persons_serializer = PersonCreateSerializer(
+                data=[row for row, error in zip(request.data, errors) if not error], many=True
+            )
+
+            persons_serializer.is_valid()
+
+            valid_rows = list(
+                zip((index for index, error in enumerate(errors) if not error), persons_serializer.validated_data)
+            )
+
+        person_service = ServiceContainer.person_service()
+
+        # Emails are unique ignoring case, among the existing persons and within the request.
+        taken_emails = person_service.get_existing_emails([person_data["email"] for _, person_data in valid_rows])
+        new_persons_dto = []
+
+        for index, person_data in valid_rows:
+            email = person_data["email"].lower()
+
+            if email in taken_emails:
+                row_errors[index] = {"email": ["Person with this email already exists."]}
+            else:
+                taken_emails.add(email)
+                new_persons_dto.append(NewPersonDTO(**person_data))
+
+        if row_errors and not allow_partial:
+            return Response({"error": "Person with one of the emails already exists"}, status=status.HTTP_409_CONFLICT)
+
+        row_errors = [{"index": index, "errors": row_errors[index]} for index in sorted(row_errors)]
+
+        if row_errors and not new_persons_dto:
+            return Response({"created": [], "errors": row_errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            persons_dto = person_service.create_persons(new_persons_dto, settings.PERSON_BULK_CREATE_BATCH_SIZE)
+        except InstanceAlreadyExistsError as exception:
+            return Response({"error": str(exception)}, status=status.HTTP_409_CONFLICT)
+
+        return Response(
+            data={"created": [serialize_person(person_dto) for person_dto in persons_dto], "errors": row_errors},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ApiPersonExportView(APIView):
+    """The ApiPersonExportView class defines API endpoints for exporting all persons."""
+
+    @extend_schema(
+        summary="Export all persons as NDJSON",
+        description="Streams one JSON object per line, ordered by person id.",
+        responses={(200, "application/x-ndjson"): PersonExportSerializer},
+        tags=["Persons"],
+    )
+    def get(self, request):
+        """Handle GET request to stream all persons data."""
+
+        person_service = ServiceContainer.person_service()
+
+        persons = person_service.export_persons(settings.EXPORT_CHUNK_SIZE)
+
+        return StreamingHttpResponse(iter_ndjson(persons), content_type="application/x-ndjson")
+
 
 class ApiPersonDetailView(APIView):
     """The ApiPersonDetailView class defines API endpoints for working with person information."""
 
     @extend_schema(
         summary="Retrieve person data by person id",
+        description=(
+            "Responds with an ETag header; a request with a matching "
+            "If-None-Match header gets 304 Not Modified without a body."
+        ),
+        parameters=[PersonFieldsQuerySerializer],
         responses={
             200: PersonSerializer,
+            400: ValidationErrorResponseSerializer,
             404: ResponseWithErrorSerializer,
         },
         tags=["Persons"],
@@ -102,20 +273,36 @@ class ApiPersonDetailView(APIView):
     def get(self, request, id):
         """Handle GET request to retrieve person data."""
 
+        query_serializer = PersonFieldsQuerySerializer(data=request.query_params)
+
+        if not query_serializer.is_valid():
+            return Response(query_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        fields_dto = FieldsDTO(**query_serializer.validated_data)
+
         person_service = ServiceContainer.person_service()
 
         try:
-            person_dto = person_service.get_person(id)
+            person_version_dto = person_service.get_person_version(id)
+
+            not_modified_response = get_not_modified_response(request, person_version_dto)
+
+            if not_modified_response is not None:
+                return not_modified_response
+
+            person_dto = person_service.get_person(id, fields_dto)
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
-        person = PersonSerializer(person_dto)
+        serialize = get_person_dto_serializer(fields_dto.fields, fields_dto.expand)
 
-        return Response(
-            data=person.data,
+        response = Response(
+            data=serialize(person_dto),
             status=status.HTTP_200_OK,
         )
 
+        return set_version_headers(response, person_version_dto)
+
     @extend_schema(
         summary="Delete person data by person id",
         responses={
@@ -145,6 +332,7 @@ class ApiPersonDetailView(APIView):
             200: PersonSerializer,
             400: ValidationErrorResponseSerializer,
             404: ResponseWithErrorSerializer,
+            409: ResponseWithErrorSerializer,
         },
         tags=["Persons"],
     )
@@ -164,11 +352,11 @@ class ApiPersonDetailView(APIView):
             person_dto = person_service.update_person(id, update_person_dto)
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
-
-        person = PersonSerializer(person_dto)
+        except InstanceAlreadyExistsError as exception:
+            return Response({"error": str(exception)}, status=status.HTTP_409_CONFLICT)
 
         return Response(
-            data=person.data,
+            data=serialize_person(person_dto),
             status=status.HTTP_200_OK,
         )
 
@@ -194,9 +382,7 @@ class ApiLeaveTeamView(APIView):
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
-        person = PersonSerializer(person_dto)
-
         return Response(
-            data=person.data,
+            data=serialize_person(person_dto),
             status=status.HTTP_200_OK,
-        )
\ No newline at end of file
+        )
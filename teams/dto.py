@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MemberDTO:
     id: int
     first_name: str
@@ -9,18 +9,37 @@ class MemberDTO:
     email: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NewTeamDTO:
     name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TeamDTO:
     id: int
     name: str
-    members: list[MemberDTO]
+    member_count: int
+    members: tuple[MemberDTO, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class TeamSummaryDTO:
+    id: int
+    name: str
+    member_count: int
+
+
+@dataclass(frozen=True, slots=True)
 class MemberIdDTO:
     id: int
+
+
+@dataclass(frozen=True, slots=True)
+class MemberIdsDTO:
+    ids: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class TeamMembershipDTO:
+    team: TeamDTO
+    missing_ids: tuple[int, ...]
@@ -1,6 +1,8 @@
 from abc import ABCMeta, abstractmethod
+from collections.abc import Iterator
 
-from .dto import NewTeamDTO, TeamDTO, MemberIdDTO
+from core.dto import PageDTO, PageRequestDTO, ResourceVersionDTO
+from .dto import NewTeamDTO, TeamDTO, TeamSummaryDTO, MemberIdDTO, MemberIdsDTO, TeamMembershipDTO
 
 
 class TeamRepositoryInterface(metaclass=ABCMeta):
@@ -47,6 +49,22 @@ class TeamRepositoryInterface(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def get_team_version(self, team_id: int) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of a team using its unique identifier.
+
+        Args:
+            team_id (int): The unique identifier of the team.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the team.
+
+        Raises:
+            InstanceDoesNotExistError: If no team with this id is found.
+        """
+        pass
+
     @abstractmethod
     def update_team(self, team_id: int, team_dto: NewTeamDTO) -> TeamDTO:
         """
@@ -93,6 +111,71 @@ class TeamRepositoryInterface(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def get_teams_page(self, page: PageRequestDTO) -> PageDTO[TeamDTO]:
+        """
+        Retrieve one page of teams ordered by id.
+
+        Args:
+            page (PageRequestDTO): The page size and the position after which the page starts.
+
+        Returns:
+            PageDTO[TeamDTO] - The teams of the page and the position of the next page.
+
+        Raises:
+            InstanceDoesNotExistError: If no teams is found on the first page.
+        """
+        pass
+
+    @abstractmethod
+    def get_team_summaries_page(self, page: PageRequestDTO) -> PageDTO[TeamSummaryDTO]:
+        """
+        Retrieve one page of teams ordered by id, with the number of members instead of the members.
+
+        Args:
+            page (PageRequestDTO): The page size and the position after which the page starts.
+
+        Returns:
+            PageDTO[TeamSummaryDTO] - The teams of the page and the position of the next page.
+
+        Raises:
+            InstanceDoesNotExistError: If no teams is found on the first page.
+        """
+        pass
+
+    @abstractmethod
+    def get_teams_version(self) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of the teams listing.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the teams listing.
+        """
+        pass
+
+    @abstractmethod
+    def iter_teams(self, chunk_size: int) -> Iterator[dict]:
+        """
+        Iterate over all teams ordered by id without loading them into memory at once.
+
+        Args:
+            chunk_size (int): The number of rows fetched from the database at a time.
+
+        Returns:
+            Iterator[dict] - Rows with the id, name and list of member ids of each team.
+        """
+        pass
+
+    @abstractmethod
+    def reconcile_member_counts(self) -> int:
+        """
+        Recount the members of every team and fix the teams whose member_count drifted.
+
+        Returns:
+            int - The number of fixed teams.
+        """
+        pass
+
     @abstractmethod
     def add_member(self, team_id: int, new_member_dto: MemberIdDTO) -> TeamDTO:
         """
@@ -127,3 +210,39 @@ class TeamRepositoryInterface(metaclass=ABCMeta):
              or the member with the provided ID does not exist.
         """
         pass
+
+    @abstractmethod
+    def add_members(self, team_id: int, members_dto: MemberIdsDTO) -> TeamMembershipDTO:
+        """
+        Adds several persons to the specified team.
+
+        Persons that belong to another team are moved to this one.
+
+        Args:
+            team_id (int): The ID of the team to which the members will be added.
+            members_dto (MemberIdsDTO): Data transfer object representing the ids of the new members.
+
+        Returns:
+            TeamMembershipDTO - The updated team and the ids of persons that do not exist.
+
+        Raises:
+            InstanceDoesNotExistError: If the team with the specified ID does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def remove_members(self, team_id: int, members_dto: MemberIdsDTO) -> TeamMembershipDTO:
+        """
+        Removes several members from the specified team.
+
+        Args:
+            team_id (int): The ID of the team from which the members will be removed.
+            members_dto (MemberIdsDTO): Data transfer object representing the ids of the members.
+
+        Returns:
+            TeamMembershipDTO - The updated team and the ids of persons that are not members of the team.
+
+        Raises:
+            InstanceDoesNotExistError: If the team with the specified ID does not exist.
+        """
+        pass
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.containers import ServiceContainer
+
+
+class Command(BaseCommand):
+    help = "Recount the members of every team and fix the stored member counts that drifted."
+
+    def handle(self, *args, **options):
+        team_service = ServiceContainer.team_service()
+
+        fixed_count = team_service.reconcile_member_counts()
+
+        self.stdout.write(f"Fixed the member count of {fixed_count} team(s).")
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:46
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_members(apps, schema_editor):
+    Person = apps.get_model("persons", "Person")
+    Team = apps.get_model("teams", "Team")
+
+    member_counts = (
+        Person.objects.filter(team=OuterRef("pk")).order_by().values("team").annotate(count=Count("id")).values("count")
+    )
+
+    Team.objects.update(member_count=Coalesce(Subquery(member_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0002_person_updated_at_indexes'),
+        ('teams', '0002_team_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='member_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_members, migrations.RunPython.noop),
+    ]
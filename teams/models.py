@@ -5,3 +5,11 @@ class Team(models.Model):
     """Model for Team object"""
 
     name = models.CharField(max_length=50)
+    # Maintained by PersonQuerySet.move_to_team and PersonRepository, see reconcile_member_counts.
+    member_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="team_name_idx"),
+        ]
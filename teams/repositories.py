@@ -1,9 +1,21 @@
-from annoying.functions import get_object_or_None
-from django.db.models import QuerySet
+from collections.abc import Iterable, Iterator
+from itertools import groupby
+from operator import itemgetter
 
+from annoying.functions import get_object_or_None
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.cache import VersionedCache
+from core.conditional import make_resource_version
+from core.db.routers import can_cache_reads
+from core.dto import PageDTO, PageRequestDTO, ResourceVersionDTO, dtos_from_rows
 from core.exceptions import InstanceDoesNotExistError
-from persons.models import Person
-from .dto import NewTeamDTO, TeamDTO, MemberIdDTO
+from core.pagination import get_keyset_page
+from persons.models import Person, change_member_counts
+from .dto import NewTeamDTO, TeamDTO, TeamSummaryDTO, MemberIdDTO, MemberDTO, MemberIdsDTO, TeamMembershipDTO
 from .models import Team
 from .interfaces import TeamRepositoryInterface
 
@@ -11,6 +23,10 @@ from .interfaces import TeamRepositoryInterface
 class TeamRepository(TeamRepositoryInterface):
     """The TeamRepository class handles the retrieval of team data from the data storage."""
 
+    # Columns of the rows that TeamDTO and TeamSummaryDTO, and the members of TeamDTO, are built from.
+    TEAM_COLUMNS = ("id", "name", "member_count")
+    MEMBER_COLUMNS = ("team_id", "id", "first_name", "last_name", "email")
+
     def create_team(self, new_team_dto: NewTeamDTO) -> TeamDTO:
         """
         Create a new team
@@ -44,6 +60,32 @@ class TeamRepository(TeamRepositoryInterface):
 
         return self._team_to_dto(team)
 
+    def get_team_version(self, team_id: int) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of a team using its unique identifier.
+
+        Args:
+            team_id (int): The unique identifier of the team.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the team.
+
+        Raises:
+            InstanceDoesNotExistError: If no team with this id is found.
+        """
+
+        team = (
+            Team.objects.filter(id=team_id)
+            .annotate(members_count=Count("members"), members_last_modified=Max("members__updated_at"))
+            .values("updated_at", "members_count", "members_last_modified")
+            .first()
+        )
+
+        if team is None:
+            raise InstanceDoesNotExistError(f"Team with id {team_id} not found")
+
+        return make_resource_version("team", *team.values())
+
     def update_team(self, team_id: int, team_dto: NewTeamDTO) -> TeamDTO:
         """
         Update team information
@@ -63,7 +105,8 @@ class TeamRepository(TeamRepositoryInterface):
 
         team.name = team_dto.name
 
-        team.save()
+        # member_count is changed with F() expressions by concurrent requests, so it is not written back.
+        team.save(update_fields=["name", "updated_at"])
 
         return self._team_to_dto(team)
 
@@ -96,12 +139,150 @@ class TeamRepository(TeamRepositoryInterface):
             InstanceDoesNotExistError: If no teams is found.
         """
 
-        teams = Team.objects.all()
+        rows = list(Team.objects.order_by("id").values_list(*self.TEAM_COLUMNS))
 
-        if not teams.exists():
+        if not rows:
             raise InstanceDoesNotExistError("Teams not found")
 
-        return self._teams_to_dto(teams)
+        return self._rows_to_dto(rows)
+
+    def get_teams_page(self, page: PageRequestDTO) -> PageDTO[TeamDTO]:
+        """
+        Retrieve one page of teams ordered by id.
+
+        Teams and their members are read as rows with two queries, without model objects.
+
+        Args:
+            page (PageRequestDTO): The page size and the position after which the page starts.
+
+        Returns:
+            PageDTO[TeamDTO] - The teams of the page and the position of the next page.
+
+        Raises:
+            InstanceDoesNotExistError: If no teams is found on the first page.
+        """
+
+        rows, next_after = get_keyset_page(
+            Team.objects.values_list(*self.TEAM_COLUMNS), page, get_position=itemgetter(0)
+        )
+
+        if not rows and page.after is None:
+            raise InstanceDoesNotExistError("Teams not found")
+
+        return PageDTO(items=self._rows_to_dto(rows), next_after=next_after)
+
+    def get_team_summaries_page(self, page: PageRequestDTO) -> PageDTO[TeamSummaryDTO]:
+        """
+        Retrieve one page of teams ordered by id, with the number of members instead of the members.
+
+        Only the id, name and member_count columns are read, as rows, and
+        members are not loaded, so the page costs one query on the teams table.
+
+        Args:
+            page (PageRequestDTO): The page size and the position after which the page starts.
+
+        Returns:
+            PageDTO[TeamSummaryDTO] - The teams of the page and the position of the next page.
+
+        Raises:
+            InstanceDoesNotExistError: If no teams is found on the first page.
+        """
+
+        rows, next_after = get_keyset_page(
+            Team.objects.values_list(*self.TEAM_COLUMNS), page, get_position=itemgetter(0)
+        )
+
+        if not rows and page.after is None:
+            raise InstanceDoesNotExistError("Teams not found")
+
+        return PageDTO(items=dtos_from_rows(TeamSummaryDTO, rows), next_after=next_after)
+
+    def get_teams_version(self) -> ResourceVersionDTO:
+        """
+        Retrieve the ETag of the teams listing.
+
+        Teams are listed with their members, so the version is built from the
+        row counts and latest modification times of both tables, two aggregate
+        queries that do not load any rows. It has no Last-Modified time: the
+        latest modification time stays the same when a row is deleted.
+
+        Returns:
+            ResourceVersionDTO - The ETag of the teams listing.
+        """
+
+        teams = Team.objects.aggregate(count=Count("id"), last_modified=Max("updated_at"))
+        persons = Person.objects.aggregate(count=Count("id"), last_modified=Max("updated_at"))
+
+        return make_resource_version(
+            "teams",
+            teams["count"],
+            teams["last_modified"],
+            persons["count"],
+            persons["last_modified"],
+        )
+
+    def iter_teams(self, chunk_size: int) -> Iterator[dict]:
+        """
+        Iterate over all teams ordered by id without loading them into memory at once.
+
+        Teams and their member ids are read from two server-side cursors, both
+        ordered by team id, and merged on the fly, so only the members of the
+        current team are held in memory.
+
+        Args:
+            chunk_size (int): The number of rows fetched from the database at a time.
+
+        Returns:
+            Iterator[dict] - Rows with the id, name and list of member ids of each team.
+        """
+
+        teams = Team.objects.order_by("id").values("id", "name").iterator(chunk_size=chunk_size)
+        members = (
+            Person.objects.filter(team__isnull=False)
+            .order_by("team_id", "id")
+            .values_list("team_id", "id")
+            .iterator(chunk_size=chunk_size)
+        )
+        members_by_team = groupby(members, key=itemgetter(0))
+
+        team_id, team_members = next(members_by_team, (None, None))
+
+        for team in teams:
+            while team_id is not None and team_id < team["id"]:
+                team_id, team_members = next(members_by_team, (None, None))
+
+            team["members"] = []
+
+            if team_id == team["id"]:
+                team["members"] = [member_id for _, member_id in team_members]
+                team_id, team_members = next(members_by_team, (None, None))
+
+            yield team
+
+    def reconcile_member_counts(self) -> int:
+        """
+        Recount the members of every team and fix the teams whose member_count drifted.
+
+        The counts are kept in sync by the repositories, they only drift when
+        persons are changed around them, for example in the admin or with raw SQL.
+
+        Returns:
+            int - The number of fixed teams.
+        """
+
+        member_counts = (
+            Person.objects.filter(team=OuterRef("pk"))
+            .order_by()
+            .values("team")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+
+        return (
+            Team.objects.alias(actual_member_count=Coalesce(Subquery(member_counts), 0))
+            .exclude(member_count=F("actual_member_count"))
+            .update(member_count=F("actual_member_count"))
+        )
 
     def add_member(self, team_id: int, new_member_dto: MemberIdDTO) -> TeamDTO:
         """
@@ -120,48 +301,106 @@ class TeamRepository(TeamRepositoryInterface):
 
         team = self._get_team(team_id)
 
-        member = get_object_or_None(Person, id=new_member_dto.id)
-        if not member:
-            raise InstanceDoesNotExistError(f"Person with id {team_id} not found")
+        moved_ids = Person.objects.filter(id=new_member_dto.id).move_to_team(team)
 
-        team.members.add(member)
-        team.save()
+        if not moved_ids:
+            raise InstanceDoesNotExistError(f"Person with id {new_member_dto.id} not found")
+
+        team.refresh_from_db(fields=["member_count"])
 
         return self._team_to_dto(team)
 
+    def add_members(self, team_id: int, members_dto: MemberIdsDTO) -> TeamMembershipDTO:
+        """
+        Adds several persons to the specified team.
+
+        Persons that belong to another team are moved to this one.
+
+        Args:
+            team_id (int): The ID of the team to which the members will be added.
+            members_dto (MemberIdsDTO): Data transfer object representing the ids of the new members.
+
+        Returns:
+            TeamMembershipDTO - The updated team and the ids of persons that do not exist.
+
+        Raises:
+            InstanceDoesNotExistError: If the team with the specified ID does not exist.
+        """
+
+        team = self._get_team(team_id)
+        member_ids = set(members_dto.ids)
+
+        existing_ids = set(Person.objects.filter(id__in=member_ids).move_to_team(team))
+
+        team.refresh_from_db(fields=["member_count"])
+
+        return TeamMembershipDTO(
+            team=self._team_to_dto(team),
+            missing_ids=tuple(sorted(member_ids - existing_ids)),
+        )
+
     def remove_member(self, team_id: int, member_dto: MemberIdDTO) -> TeamDTO:
         """
-        Adds a new member to the specified team.
+        Removes a member from the specified team.
 
         Args:
-            team_id (int): The ID of the team to which the member will be added.
+            team_id (int): The ID of the team from which the member will be removed.
             member_dto (MemberIdDTO): Data transfer object representing the member id.
 
         Returns:
             TeamDTO - An instance of the data transfer object representing the updated team.
 
         Raises:
-            InstanceDoesNotExistError: If the team with the specified ID
-             or the member with the provided ID does not exist.
+            InstanceDoesNotExistError: If the team with the specified ID does not exist
+             or the person with the provided ID is not a member of the team.
         """
 
         team = self._get_team(team_id)
 
-        member = get_object_or_None(Person, id=member_dto.id)
+        # The old team of the person is known, so it is removed with one conditional UPDATE.
+        with transaction.atomic():
+            removed_count = Person.objects.filter(id=member_dto.id, team_id=team_id).update(
+                team=None, updated_at=timezone.now()
+            )
 
-        if not member:
-            raise InstanceDoesNotExistError(f"Person with id {team_id} not found")
+            change_member_counts({team_id: -removed_count})
 
-        if member not in team.members.all():
-            raise InstanceDoesNotExistError(f"Person with an id {team_id} is not a team member")
+        if not removed_count:
+            raise InstanceDoesNotExistError(f"Person with an id {member_dto.id} is not a team member")
 
-        team.members.remove(member)
-        team.save()
+        team.refresh_from_db(fields=["member_count"])
 
         return self._team_to_dto(team)
 
-    @staticmethod
-    def _team_to_dto(team: Team) -> TeamDTO:
+    def remove_members(self, team_id: int, members_dto: MemberIdsDTO) -> TeamMembershipDTO:
+        """
+        Removes several members from the specified team.
+
+        Args:
+            team_id (int): The ID of the team from which the members will be removed.
+            members_dto (MemberIdsDTO): Data transfer object representing the ids of the members.
+
+        Returns:
+            TeamMembershipDTO - The updated team and the ids of persons that are not members of the team.
+
+        Raises:
+            InstanceDoesNotExistError: If the team with the specified ID does not exist.
+        """
+
+        team = self._get_team(team_id)
+        member_ids = set(members_dto.ids)
+
+        existing_ids = set(Person.objects.filter(id__in=member_ids, team=team).move_to_team(None))
+
+        team.refresh_from_db(fields=["member_count"])
+
+        return TeamMembershipDTO(
+            team=self._team_to_dto(team),
+            missing_ids=tuple(sorted(member_ids - existing_ids)),
+        )
+
+    @classmethod
+    def _team_to_dto(cls, team: Team) -> TeamDTO:
         """
         Convert a data model object (Team) into a TeamDTO object.
 
@@ -172,23 +411,69 @@ class TeamRepository(TeamRepositoryInterface):
             TeamDTO - A data transfer object containing the team information.
         """
 
-        return TeamDTO(id=team.pk, name=team.name, members=team.members)
+        members = tuple(cls._member_to_dto(member) for member in team.members.all())
+
+        return TeamDTO(id=team.pk, name=team.name, member_count=team.member_count, members=members)
+
+    @staticmethod
+    def _member_to_dto(member: Person) -> MemberDTO:
+        """
+        Convert a data model object (Person) into a MemberDTO object.
+
+        Args:
+            member (Person): An instance of the Person model class.
+
+        Returns:
+            MemberDTO - A data transfer object containing the team member information.
+        """
+
+        return MemberDTO(
+            id=member.pk,
+            first_name=member.first_name,
+            last_name=member.last_name,
+            email=member.email,
+        )
 
     @classmethod
-    def _teams_to_dto(cls, teams: QuerySet[Team]) -> list[TeamDTO]:
+    def _rows_to_dto(cls, rows: list[tuple]) -> list[TeamDTO]:
         """
-        Converts a QuerySet of Team objects to a list of TeamDTO objects.
+        Convert team rows into TeamDTO objects without instantiating model objects.
+
+        The members of all the teams are read with one query, ordered by id.
 
         Args:
-            teams (QuerySet[Team]): A QuerySet of Team objects to be converted.
+            rows (list[tuple]): Rows with the TEAM_COLUMNS of each team.
 
         Returns:
             list[TeamDTO]: A list of TeamDTO objects containing the converted data.
         """
 
-        teams_dto = [cls._team_to_dto(team) for team in teams]
+        members = cls.get_members_by_team([row[0] for row in rows])
 
-        return teams_dto
+        return [TeamDTO(*row, members=members.get(row[0], ())) for row in rows]
+
+    @classmethod
+    def get_members_by_team(cls, team_ids: Iterable[int]) -> dict[int, tuple[MemberDTO, ...]]:
+        """
+        Read the members of teams, with one query and without instantiating model objects.
+
+        Args:
+            team_ids (Iterable[int]): The ids of the teams.
+
+        Returns:
+            dict[int, tuple[MemberDTO, ...]] - The members of each team ordered by id, teams without members are left out.
+        """
+
+        rows = (
+            Person.objects.filter(team_id__in=team_ids)
+            .order_by("team_id", "id")
+            .values_list(*cls.MEMBER_COLUMNS)
+        )
+
+        return {
+            team_id: tuple(MemberDTO(*row[1:]) for row in team_rows)
+            for team_id, team_rows in groupby(rows, key=itemgetter(0))
+        }
 
     def _get_team(self, team_id: int) -> Team:
         """
@@ -210,3 +495,127 @@ class TeamRepository(TeamRepositoryInterface):
             raise InstanceDoesNotExistError(f"Team with id {team_id} not found")
 
         return team
+
+
+class CachedTeamRepository(TeamRepositoryInterface):
+    """
+    The CachedTeamRepository class serves team details from the cache.
+
+    It wraps another team repository: get_team_by_id is read through the
+    cache, every method that changes teams or their members invalidates it,
+    and the remaining methods are delegated unchanged.
+    """
+
+    def __init__(self, team_repository: TeamRepositoryInterface, cache: VersionedCache):
+        self.team_repository = team_repository
+        self.cache = cache
+
+    def create_team(self, new_team_dto: NewTeamDTO) -> TeamDTO:
+        """Create a new team in the wrapped repository."""
+
+        return self.team_repository.create_team(new_team_dto)
+
+    def get_team_by_id(self, team_id: int) -> TeamDTO:
+        """
+        Retrieve information about a team using its unique identifier, reading through the cache.
+
+        The cache is bypassed when the reads go to replicas.
+
+        Args:
+            team_id (int): The unique identifier of the team.
+
+        Returns:
+            TeamDTO - A data transfer object containing the team information.
+
+        Raises:
+            InstanceDoesNotExistError: If no team with this id is found.
+        """
+
+        if not can_cache_reads():
+            return self.team_repository.get_team_by_id(team_id)
+
+        return self.cache.get_or_set(f"team:{team_id}", lambda: self.team_repository.get_team_by_id(team_id))
+
+    def get_team_version(self, team_id: int) -> ResourceVersionDTO:
+        """Retrieve the ETag of a team from the wrapped repository."""
+
+        return self.team_repository.get_team_version(team_id)
+
+    def update_team(self, team_id: int, team_dto: NewTeamDTO) -> TeamDTO:
+        """Update team information in the wrapped repository and invalidate the cache."""
+
+        team = self.team_repository.update_team(team_id, team_dto)
+        self.cache.invalidate()
+
+        return team
+
+    def delete_team_by_id(self, team_id: int) -> None:
+        """Delete a team in the wrapped repository and invalidate the cache."""
+
+        self.team_repository.delete_team_by_id(team_id)
+        self.cache.invalidate()
+
+    def get_teams(self) -> list[TeamDTO]:
+        """Retrieve a list of teams from the wrapped repository."""
+
+        return self.team_repository.get_teams()
+
+    def get_teams_page(self, page: PageRequestDTO) -> PageDTO[TeamDTO]:
+        """Retrieve one page of teams from the wrapped repository."""
+
+        return self.team_repository.get_teams_page(page)
+
+    def get_team_summaries_page(self, page: PageRequestDTO) -> PageDTO[TeamSummaryDTO]:
+        """Retrieve one page of team summaries from the wrapped repository."""
+
+        return self.team_repository.get_team_summaries_page(page)
+
+    def get_teams_version(self) -> ResourceVersionDTO:
+        """Retrieve the ETag of the teams listing from the wrapped repository."""
+
+        return self.team_repository.get_teams_version()
+
+    def iter_teams(self, chunk_size: int) -> Iterator[dict]:
+        """Iterate over all teams of the wrapped repository."""
+
+        return self.team_repository.iter_teams(chunk_size)
+
+    def reconcile_member_counts(self) -> int:
+        """Fix the member counts in the wrapped repository and invalidate the cache."""
+
+        fixed_count = self.team_repository.reconcile_member_counts()
+        self.cache.invalidate()
+
+        return fixed_count
+
+    def add_member(self, team_id: int, new_member_dto: MemberIdDTO) -> TeamDTO:
+        """Add a member to the team in the wrapped repository and invalidate the cache."""
+
+        team = self.team_repository.add_member(team_id, new_member_dto)
+        self.cache.invalidate()
+
+        return team
+
+    def add_members(self, team_id: int, members_dto: MemberIdsDTO) -> TeamMembershipDTO:
+        """Add several members to the team in the wrapped repository and invalidate the cache."""
+
+        membership = self.team_repository.add_members(team_id, members_dto)
+        self.cache.invalidate()
+
+        return membership
+
+    def remove_member(self, team_id: int, member_dto: MemberIdDTO) -> TeamDTO:
+        """Remove a member from the team in the wrapped repository and invalidate the cache."""
+
+        team = self.team_repository.remove_member(team_id, member_dto)
+        self.cache.invalidate()
+
+        return team
+
+    def remove_members(self, team_id: int, members_dto: MemberIdsDTO) -> TeamMembershipDTO:
+        """Remove several members from the team in the wrapped repository and invalidate the cache."""
+
+        membership = self.team_repository.remove_members(team_id, members_dto)
+        self.cache.invalidate()
+
+        return membership
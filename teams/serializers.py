@@ -1,5 +1,12 @@
+from functools import lru_cache
+
+from django.conf import settings
 from rest_framework import serializers
 
+from core.dto_serializers import DTOSerializer, compile_dto_serializer
+from core.serializers import PageQuerySerializer, SparseFieldsField, SparseFieldsSerializerMixin
+from .dto import MemberDTO, TeamDTO, TeamMembershipDTO, TeamSummaryDTO
+
 
 class MemberSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
@@ -12,11 +19,82 @@ class TeamCreateSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=50)
 
 
-class TeamSerializer(serializers.Serializer):
+class TeamReferenceSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+
+
+class TeamSummarySerializer(TeamReferenceSerializer):
+    member_count = serializers.IntegerField(read_only=True)
+
+
+class TeamSerializer(SparseFieldsSerializerMixin, serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     name = serializers.CharField()
+    member_count = serializers.IntegerField(read_only=True)
     members = MemberSerializer(many=True)
 
 
+class TeamListQuerySerializer(PageQuerySerializer):
+    fields = SparseFieldsField(
+        choices=("id", "name", "member_count", "members"),
+        required=False,
+        help_text=(
+            "Comma-separated fields to return, from: id, name, member_count, members. "
+            "Without members the teams are listed without loading their members."
+        ),
+    )
+
+
+class TeamPageSerializer(serializers.Serializer):
+    results = TeamSerializer(many=True)
+    next = serializers.CharField(allow_null=True)
+
+
+class TeamExportSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    members = serializers.ListField(child=serializers.IntegerField())
+
+
 class MemberIdSerializer(serializers.Serializer):
     id = serializers.IntegerField()
+
+
+class MemberIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.TEAM_MEMBERS_BULK_MAX_IDS,
+    )
+
+
+class TeamMembershipSerializer(serializers.Serializer):
+    team = TeamSerializer()
+    missing_ids = serializers.ListField(child=serializers.IntegerField())
+
+
+# Compiled counterparts of the serializers above, used to render the responses.
+serialize_member = compile_dto_serializer(MemberDTO)
+serialize_team = compile_dto_serializer(TeamDTO, many={"members": serialize_member})
+serialize_team_summary = compile_dto_serializer(TeamSummaryDTO)
+serialize_team_reference = compile_dto_serializer(TeamSummaryDTO, fields=("id", "name"))
+serialize_team_membership = compile_dto_serializer(TeamMembershipDTO, nested={"team": serialize_team})
+
+
+@lru_cache(maxsize=64)
+def get_team_dto_serializer(fields: tuple[str, ...] | None = None) -> DTOSerializer:
+    """
+    Return the compiled serializer of TeamSerializer limited to the fields.
+
+    Args:
+        fields (tuple[str, ...] | None): The fields validated by TeamListQuerySerializer, all fields if None.
+
+    Returns:
+        DTOSerializer - The function that serializes a TeamDTO, or a TeamSummaryDTO without members.
+    """
+
+    if fields is None:
+        return serialize_team
+
+    return compile_dto_serializer(TeamDTO, fields, many={"members": serialize_member})
@@ -1,2 +1,341 @@
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from .dto import MemberDTO, MemberIdDTO, MemberIdsDTO, NewTeamDTO
+from .repositories import CachedTeamRepository, TeamRepository
+from .models import Team
+from core.cache import VersionedCache
+from core.db.explain import get_sequential_scans
+from core.dto import PageRequestDTO
+from core.pagination import encode_cursor
+from core.exceptions import InstanceDoesNotExistError
+from persons.models import Person
+from persons.repositories import PersonRepository
+
+
+class TeamRepositoryTestCase(TestCase):
+
+    def setUp(self):
+        self.repository = TeamRepository()
+
+    def test_update_team_keeps_concurrent_member_count(self):
+        team = Team.objects.create(name="team")
+        person = Person.objects.create(first_name="New", last_name="Member", email="new@gmail.com")
+        stale_team = Team.objects.get(id=team.id)
+        self.repository.add_member(team.id, MemberIdDTO(id=person.id))
+
+        with mock.patch.object(TeamRepository, "_get_team", return_value=stale_team):
+            self.repository.update_team(team.id, NewTeamDTO(name="renamed"))
+
+        team.refresh_from_db()
+        self.assertEqual((team.name, team.member_count), ("renamed", 1))
+
+    def _create_team_with_members(self, name, members_count=2):
+        team = Team.objects.create(name=name, member_count=members_count)
+        for index in range(members_count):
+            Person.objects.create(
+                first_name=f"{name} {index}", last_name="Member", email=f"{index}@{name}.com", team=team
+            )
+        return team
+
+    def test_get_teams_not_found(self):
+        with self.assertRaises(InstanceDoesNotExistError):
+            self.repository.get_teams()
+
+    def test_get_teams_members_are_dto(self):
+        team = self._create_team_with_members("first")
+
+        retrieved_teams = self.repository.get_teams()
+
+        self.assertEqual(len(retrieved_teams), 1)
+        self.assertEqual(retrieved_teams[0].id, team.id)
+        self.assertIsInstance(retrieved_teams[0].members, tuple)
+        self.assertEqual(len(retrieved_teams[0].members), 2)
+        self.assertIsInstance(retrieved_teams[0].members[0], MemberDTO)
+
+    def test_get_teams_query_count_is_constant(self):
+        self._create_team_with_members("first")
+
+        with self.assertNumQueries(2):
+            self.repository.get_teams()
+
+        for index in range(10):
+            self._create_team_with_members(f"team{index}", members_count=3)
+
+        with self.assertNumQueries(2):
+            retrieved_teams = self.repository.get_teams()
+
+        self.assertEqual(len(retrieved_teams), 11)
+
+    def test_get_teams_page(self):
+        for index in range(3):
+            self._create_team_with_members(f"team{index}", members_count=1)
+
+        first_page = self.repository.get_teams_page(PageRequestDTO(limit=2))
+
+        self.assertEqual([team.name for team in first_page.items], ["team0", "team1"])
+        self.assertEqual(first_page.items[0].members[0].first_name, "team0 0")
+
+        last_page = self.repository.get_teams_page(PageRequestDTO(limit=2, after=first_page.next_after))
+
+        self.assertEqual([team.name for team in last_page.items], ["team2"])
+        self.assertIsNone(last_page.next_after)
+
+    def test_get_teams_page_reads_rows(self):
+        team = self._create_team_with_members("team", members_count=2)
+        Team.objects.create(name="empty")
+
+        with self.assertNumQueries(2):
+            page = self.repository.get_teams_page(PageRequestDTO(limit=10))
+
+        member_ids = list(team.members.order_by("id").values_list("id", flat=True))
+
+        self.assertEqual([member.id for member in page.items[0].members], member_ids)
+        self.assertEqual(page.items[0].member_count, 2)
+        self.assertEqual(page.items[1].members, ())
+
+    def test_iter_teams(self):
+        first_team = self._create_team_with_members("first", members_count=2)
+        empty_team = Team.objects.create(name="empty")
+        last_team = self._create_team_with_members("last", members_count=1)
+
+        exported_teams = list(self.repository.iter_teams(chunk_size=1))
+
+        self.assertEqual([team["id"] for team in exported_teams], [first_team.id, empty_team.id, last_team.id])
+        self.assertEqual(
+            exported_teams[0]["members"], list(first_team.members.order_by("id").values_list("id", flat=True))
+        )
+        self.assertEqual(exported_teams[1]["members"], [])
+        self.assertEqual(len(exported_teams[2]["members"]), 1)
+
+    def test_add_member(self):
+        team = Team.objects.create(name="team")
+        person = Person.objects.create(first_name="New", last_name="Member", email="new@gmail.com")
+
+        updated_team = self.repository.add_member(team.id, MemberIdDTO(id=person.id))
+
+        self.assertEqual([member.id for member in updated_team.members], [person.id])
+
+    def test_add_member_not_found(self):
+        team = Team.objects.create(name="team")
+
+        with self.assertRaises(InstanceDoesNotExistError):
+            self.repository.add_member(team.id, MemberIdDTO(id=101))
+
+    def test_add_members(self):
+        other_team = self._create_team_with_members("other", members_count=1)
+        team = Team.objects.create(name="team")
+        person = Person.objects.create(first_name="New", last_name="Member", email="new@gmail.com")
+        moved_person = other_team.members.get()
+
+        membership = self.repository.add_members(team.id, MemberIdsDTO(ids=(person.id, moved_person.id, 101)))
+
+        self.assertEqual({member.id for member in membership.team.members}, {person.id, moved_person.id})
+        self.assertEqual(membership.missing_ids, (101,))
+        self.assertFalse(other_team.members.exists())
+
+    def test_remove_members(self):
+        team = self._create_team_with_members("team", members_count=3)
+        other_team = self._create_team_with_members("other", members_count=1)
+        removed_ids = list(team.members.order_by("id").values_list("id", flat=True)[:2])
+        other_member_id = other_team.members.get().id
+
+        membership = self.repository.remove_members(team.id, MemberIdsDTO(ids=(*removed_ids, other_member_id)))
+
+        self.assertEqual(len(membership.team.members), 1)
+        self.assertEqual(membership.missing_ids, (other_member_id,))
+        self.assertEqual(other_team.members.count(), 1)
+
+    def test_remove_member(self):
+        team = self._create_team_with_members("team", members_count=3)
+        member = team.members.first()
+
+        # The team, one conditional UPDATE per table in a savepoint, then the member count and the members.
+        with self.assertNumQueries(7):
+            updated_team = self.repository.remove_member(team.id, MemberIdDTO(id=member.id))
+
+        self.assertEqual(len(updated_team.members), 2)
+        self.assertIsNone(Person.objects.get(id=member.id).team)
+
+    def test_remove_member_not_a_member(self):
+        team = Team.objects.create(name="team")
+        other_team = self._create_team_with_members("other", members_count=1)
+        member = other_team.members.get()
+
+        with self.assertRaises(InstanceDoesNotExistError):
+            self.repository.remove_member(team.id, MemberIdDTO(id=member.id))
+
+        self.assertEqual(Person.objects.get(id=member.id).team_id, other_team.id)
+
+    def test_remove_member_missing_team(self):
+        member = self._create_team_with_members("team", members_count=1).members.get()
+
+        # Only the team is looked up, nothing is written.
+        with self.assertNumQueries(1), self.assertRaises(InstanceDoesNotExistError):
+            self.repository.remove_member(101, MemberIdDTO(id=member.id))
+
+    def test_member_count_follows_membership_changes(self):
+        team = self._create_team_with_members("team", members_count=3)
+        other_team = self._create_team_with_members("other", members_count=2)
+        team_member_ids = list(team.members.order_by("id").values_list("id", flat=True))
+        other_member_ids = list(other_team.members.order_by("id").values_list("id", flat=True))
+        person_repository = PersonRepository()
+
+        updated_team = self.repository.add_member(team.id, MemberIdDTO(id=other_member_ids[0]))
+
+        self.assertEqual(updated_team.member_count, 4)
+
+        membership = self.repository.add_members(other_team.id, MemberIdsDTO(ids=tuple(team_member_ids[:2])))
+
+        self.assertEqual(membership.team.member_count, 3)
+
+        updated_team = self.repository.remove_member(other_team.id, MemberIdDTO(id=team_member_ids[0]))
+
+        self.assertEqual(updated_team.member_count, 2)
+
+        membership = self.repository.remove_members(other_team.id, MemberIdsDTO(ids=(other_member_ids[1], 101)))
+
+        self.assertEqual(membership.team.member_count, 1)
+
+        person_repository.leave_team(team_member_ids[1])
+        person_repository.delete_person_by_id(team_member_ids[2])
+
+        self.assertEqual(Team.objects.get(id=team.id).member_count, 1)
+        self.assertEqual(Team.objects.get(id=other_team.id).member_count, 0)
+        self.assertEqual(self.repository.reconcile_member_counts(), 0)
+
+    def test_reconcile_member_counts(self):
+        team = self._create_team_with_members("team", members_count=2)
+        empty_team = Team.objects.create(name="empty", member_count=5)
+
+        self.assertEqual(self.repository.reconcile_member_counts(), 1)
+        self.assertEqual(Team.objects.get(id=team.id).member_count, 2)
+        self.assertEqual(Team.objects.get(id=empty_team.id).member_count, 0)
+
+        Team.objects.filter(id=team.id).update(member_count=0)
+        output = StringIO()
+
+        call_command("reconcile_member_counts", stdout=output)
+
+        self.assertEqual(Team.objects.get(id=team.id).member_count, 2)
+        self.assertIn("1 team(s)", output.getvalue())
+
+
+class CachedTeamRepositoryTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.repository = CachedTeamRepository(TeamRepository(), VersionedCache(namespace="test"))
+        self.team = Team.objects.create(name="team")
+
+    def test_get_team_by_id_is_cached(self):
+        self.repository.get_team_by_id(self.team.id)
+
+        with self.assertNumQueries(0):
+            retrieved_team = self.repository.get_team_by_id(self.team.id)
+
+        self.assertEqual(retrieved_team.name, "team")
+
+    def test_add_member_invalidates_cache(self):
+        person = Person.objects.create(first_name="New", last_name="Member", email="new@gmail.com")
+        self.repository.get_team_by_id(self.team.id)
+
+        self.repository.add_member(self.team.id, MemberIdDTO(id=person.id))
+
+        self.assertEqual(len(self.repository.get_team_by_id(self.team.id).members), 1)
+
+    def test_missing_team_is_not_cached(self):
+        with self.assertRaises(InstanceDoesNotExistError):
+            self.repository.get_team_by_id(101)
+
+        Team.objects.create(id=101, name="created")
+
+        self.assertEqual(self.repository.get_team_by_id(101).name, "created")
+
+
+class TeamDetailApiTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.team = Team.objects.create(name="team")
+
+    def test_not_modified(self):
+        etag = self.client.get(reverse("api-team-detail", args=[self.team.id]))["ETag"]
+
+        response = self.client.get(reverse("api-team-detail", args=[self.team.id]), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_add_members_modifies_team(self):
+        person = Person.objects.create(first_name="New", last_name="Member", email="new@gmail.com")
+        etag = self.client.get(reverse("api-team-detail", args=[self.team.id]))["ETag"]
+        list_etag = self.client.get(reverse("api-team-list"))["ETag"]
+
+        self.client.patch(reverse("api-add-members", args=[self.team.id]), {"ids": [person.id]}, format="json")
+
+        response = self.client.get(reverse("api-team-detail", args=[self.team.id]), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["members"]), 1)
+
+        response = self.client.get(reverse("api-team-list"), HTTP_IF_NONE_MATCH=list_etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["member_count"], 1)
+
+    def test_remove_member_modifies_team(self):
+        older_member = Person.objects.create(first_name="Older", last_name="Member", email="older@gmail.com")
+        newer_member = Person.objects.create(first_name="Newer", last_name="Member", email="newer@gmail.com")
+        self.client.patch(
+            reverse("api-add-members", args=[self.team.id]), {"ids": [older_member.id, newer_member.id]}, format="json"
+        )
+
+        response = self.client.get(reverse("api-team-detail", args=[self.team.id]))
+
+        self.assertNotIn("Last-Modified", response)
+
+        self.client.patch(reverse("api-remove-member", args=[self.team.id]), {"id": older_member.id}, format="json")
+
+        response = self.client.get(reverse("api-team-detail", args=[self.team.id]), HTTP_IF_MODIFIED_SINCE=http_date())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([member["id"] for member in response.data["members"]], [newer_member.id])
+
+    def test_list_sparse_fields(self):
+        # Two aggregate queries for the ETag and one for the page, members are not loaded.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("api-team-list"), {"fields": "id,member_count"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], [{"id": self.team.id, "member_count": 0}])
+
+    def test_list_unknown_field(self):
+        response = self.client.get(reverse("api-team-list"), {"fields": "id,size"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_invalid_cursor(self):
+        for position in [(10**30,), (1, 2, 3)]:
+            with self.subTest(position=position):
+                response = self.client.get(reverse("api-team-list"), {"after": encode_cursor(position)})
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("after", response.data)
+
+
+class TeamQueryPlanTestCase(TestCase):
+    """The hot queries on teams are served by indexes."""
+
+    def test_team_by_name(self):
+        self.assertEqual(get_sequential_scans(Team.objects.filter(name="team")), [])
+
+    def test_teams_page(self):
+        self.assertEqual(get_sequential_scans(Team.objects.filter(pk__gt=100).order_by("pk")[:21]), [])
@@ -1,10 +1,21 @@
 from django.urls import path
 
-from .views import ApiTeamListView, ApiTeamDetailView, ApiAddMemberView, ApiRemoveMemberView
+from .views import (
+    ApiTeamListView,
+    ApiTeamExportView,
+    ApiTeamDetailView,
+    ApiAddMemberView,
+    ApiAddMembersView,
+    ApiRemoveMemberView,
+    ApiRemoveMembersView,
+)
 
 urlpatterns = [
     path("", ApiTeamListView.as_view(), name="api-team-list"),
+    path("export/", ApiTeamExportView.as_view(), name="api-team-export"),
     path("<int:id>/", ApiTeamDetailView.as_view(), name="api-team-detail"),
     path("<int:id>/add-member", ApiAddMemberView.as_view(), name="api-add-member"),
+    path("<int:id>/add-members", ApiAddMembersView.as_view(), name="api-add-members"),
     path("<int:id>/remove-member", ApiRemoveMemberView.as_view(), name="api-remove-member"),
+    path("<int:id>/remove-members", ApiRemoveMembersView.as_view(), name="api-remove-members"),
 ]
@@ -1,13 +1,31 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema
 
+from core.conditional import get_not_modified_response, set_version_headers
 from core.containers import ServiceContainer
+from core.dto import PageRequestDTO
 from core.exceptions import InstanceDoesNotExistError
+from core.ndjson import iter_ndjson
+from core.pagination import encode_cursor
 from core.serializers import ResponseWithErrorSerializer, ValidationErrorResponseSerializer
-from .dto import NewTeamDTO, MemberIdDTO
-from .serializers import TeamCreateSerializer, TeamSerializer, MemberIdSerializer
+from .dto import NewTeamDTO, MemberIdDTO, MemberIdsDTO
+from .serializers import (
+    TeamCreateSerializer,
+    TeamExportSerializer,
+    TeamListQuerySerializer,
+    TeamPageSerializer,
+    TeamSerializer,
+    MemberIdSerializer,
+    MemberIdsSerializer,
+    TeamMembershipSerializer,
+    get_team_dto_serializer,
+    serialize_team,
+    serialize_team_membership,
+)
 
 
 class ApiTeamListView(APIView):
@@ -39,44 +57,96 @@ class ApiTeamListView(APIView):
 
         team_dto = team_service.create_team(new_team_dto)
 
-        team = TeamSerializer(team_dto)
-
         return Response(
-            data=team.data,
+            data=serialize_team(team_dto),
             status=status.HTTP_201_CREATED,
         )
 
     @extend_schema(
         summary="Retrieve information about all teams",
+        description=(
+            "Responds with an ETag header; a request with a matching "
+            "If-None-Match header gets 304 Not Modified without a body."
+        ),
+        operation_id="api_team_list",
+        parameters=[TeamListQuerySerializer],
         responses={
-            200: TeamSerializer(many=True),
+            200: TeamPageSerializer,
+            400: ValidationErrorResponseSerializer,
             404: ResponseWithErrorSerializer,
         },
         tags=["Teams"],
     )
     def get(self, request):
-        """Handle GET request to retrieve all teams data."""
+        """Handle GET request to retrieve a page of teams data."""
+
+        query_serializer = TeamListQuerySerializer(data=request.query_params)
+
+        if not query_serializer.is_valid():
+            return Response(query_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        fields = query_serializer.validated_data.pop("fields", None)
+
+        page_dto = PageRequestDTO(**query_serializer.validated_data)
 
         team_service = ServiceContainer.team_service()
 
+        teams_version_dto = team_service.get_teams_version()
+
+        not_modified_response = get_not_modified_response(request, teams_version_dto)
+
+        if not_modified_response is not None:
+            return not_modified_response
+
         try:
-            teams_dto = team_service.get_teams()
+            if fields is not None and "members" not in fields:
+                teams_page_dto = team_service.get_team_summaries_page(page_dto)
+            else:
+                teams_page_dto = team_service.get_teams_page(page_dto)
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
-        teams = TeamSerializer(teams_dto, many=True)
+        serialize = get_team_dto_serializer(fields)
 
-        return Response(
-            data=teams.data,
+        response = Response(
+            data={
+                "results": [serialize(team_dto) for team_dto in teams_page_dto.items],
+                "next": encode_cursor(teams_page_dto.next_after),
+            },
             status=status.HTTP_200_OK,
         )
 
+        return set_version_headers(response, teams_version_dto)
+
+
+class ApiTeamExportView(APIView):
+    """The ApiTeamExportView class defines API endpoints for exporting all teams with their members."""
+
+    @extend_schema(
+        summary="Export all teams as NDJSON",
+        description="Streams one JSON object per line, ordered by team id, with the ids of the team members.",
+        responses={(200, "application/x-ndjson"): TeamExportSerializer},
+        tags=["Teams"],
+    )
+    def get(self, request):
+        """Handle GET request to stream all teams data."""
+
+        team_service = ServiceContainer.team_service()
+
+        teams = team_service.export_teams(settings.EXPORT_CHUNK_SIZE)
+
+        return StreamingHttpResponse(iter_ndjson(teams), content_type="application/x-ndjson")
+
 
 class ApiTeamDetailView(APIView):
     """The ApiTeamDetailView class defines API endpoints for working with team information."""
 
     @extend_schema(
         summary="Retrieve team data by team id",
+        description=(
+            "Responds with an ETag header; a request with a matching "
+            "If-None-Match header gets 304 Not Modified without a body."
+        ),
         responses={
             200: TeamSerializer,
             404: ResponseWithErrorSerializer,
@@ -89,17 +159,24 @@ class ApiTeamDetailView(APIView):
         team_service = ServiceContainer.team_service()
 
         try:
+            team_version_dto = team_service.get_team_version(id)
+
+            not_modified_response = get_not_modified_response(request, team_version_dto)
+
+            if not_modified_response is not None:
+                return not_modified_response
+
             team_dto = team_service.get_team(id)
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
-        team = TeamSerializer(team_dto)
-
-        return Response(
-            data=team.data,
+        response = Response(
+            data=serialize_team(team_dto),
             status=status.HTTP_200_OK,
         )
 
+        return set_version_headers(response, team_version_dto)
+
     @extend_schema(
         summary="Delete team data by team id",
         responses={
@@ -149,10 +226,8 @@ class ApiTeamDetailView(APIView):
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
-        team = TeamSerializer(team_dto)
-
         return Response(
-            data=team.data,
+            data=serialize_team(team_dto),
             status=status.HTTP_200_OK,
         )
 
@@ -187,10 +262,45 @@ class ApiAddMemberView(APIView):
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
-        team = TeamSerializer(team_dto)
+        return Response(
+            data=serialize_team(team_dto),
+            status=status.HTTP_200_OK,
+        )
+
+
+class ApiAddMembersView(APIView):
+    """The ApiAddMembersView class defines API endpoints for adding several members to the team."""
+
+    @extend_schema(
+        summary="Add several team members",
+        description="Moves the persons to the team and reports the ids of persons that do not exist.",
+        request=MemberIdsSerializer,
+        responses={
+            200: TeamMembershipSerializer,
+            400: ValidationErrorResponseSerializer,
+            404: ResponseWithErrorSerializer,
+        },
+        tags=["Teams"],
+    )
+    def patch(self, request, id):
+        """Handle PATCH request to add several team members."""
+
+        members_serializer = MemberIdsSerializer(data=request.data)
+
+        if not members_serializer.is_valid():
+            return Response(members_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        team_service = ServiceContainer.team_service()
+
+        members_dto = MemberIdsDTO(ids=tuple(members_serializer.validated_data["ids"]))
+
+        try:
+            membership_dto = team_service.add_members(id, members_dto)
+        except InstanceDoesNotExistError as exception:
+            return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
         return Response(
-            data=team.data,
+            data=serialize_team_membership(membership_dto),
             status=status.HTTP_200_OK,
         )
 
@@ -225,9 +335,44 @@ class ApiRemoveMemberView(APIView):
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
-        team = TeamSerializer(team_dto)
+        return Response(
+            data=serialize_team(team_dto),
+            status=status.HTTP_200_OK,
+        )
+
+
+class ApiRemoveMembersView(APIView):
+    """The ApiRemoveMembersView class defines API endpoints for removing several members from the team."""
+
+    @extend_schema(
+        summary="Remove several team members",
+        description="Removes the persons from the team and reports the ids that are not members of the team.",
+        request=MemberIdsSerializer,
+        responses={
+            200: TeamMembershipSerializer,
+            400: ValidationErrorResponseSerializer,
+            404: ResponseWithErrorSerializer,
+        },
+        tags=["Teams"],
+    )
+    def patch(self, request, id):
+        """Handle PATCH request to remove several team members."""
+
+        members_serializer = MemberIdsSerializer(data=request.data)
+
+        if not members_serializer.is_valid():
+            return Response(members_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        team_service = ServiceContainer.team_service()
+
+        members_dto = MemberIdsDTO(ids=tuple(members_serializer.validated_data["ids"]))
+
+        try:
+            membership_dto = team_service.remove_members(id, members_dto)
+        except InstanceDoesNotExistError as exception:
+            return Response({"error": str(exception)}, status=status.HTTP_404_NOT_FOUND)
 
         return Response(
-            data=team.data,
+            data=serialize_team_membership(membership_dto),
             status=status.HTTP_200_OK,
         )